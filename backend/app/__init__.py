@@ -5,6 +5,14 @@ import os
 def create_app():
     app = Flask(__name__)
 
+    #stream uploads straight to disk, hashing and sniffing them as they arrive
+    from backend.scripts.upload_stream import UploadRequest
+    app.request_class = UploadRequest
+
+    #orjson-backed JSON with direct NumPy/pandas encoding and NaN as null
+    from backend.scripts.json_provider import FastJSONProvider
+    app.json = FastJSONProvider(app)
+
     #config
     app.config['MAX_CONTENT_LENGTH'] = 50 * 1024 * 1024  #50mb max file size
     app.config['UPLOAD_FOLDER'] = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'uploads')
@@ -17,7 +25,10 @@ def create_app():
     CORS(app, resources={r"/api/*": {"origins": "*"}})
 
     #register blueprints
-    from backend.routes.routes import api_bp
+    from backend.routes.routes import api_bp, session_store
     app.register_blueprint(api_bp, url_prefix='/api')
 
+    #expire idle sessions and delete their files in the background
+    session_store.start_expiry()
+
     return app
@@ -0,0 +1,79 @@
+"""
+Compare the per-upload pandas correlation work with the shared CorrelationMatrix.
+
+Usage (from the project root):
+    python -m backend.benchmarks.correlation_benchmark --rows 20000 --columns 200
+"""
+import argparse
+import time
+import numpy as np
+import pandas as pd
+
+from backend.scripts.correlation import CorrelationMatrix
+
+
+def build_frame(rows, columns, missing=0.05, seed=0):
+    """Numeric columns in correlated groups of four, with scattered gaps"""
+    rng = np.random.default_rng(seed)
+    base = rng.normal(size=(rows, (columns + 3) // 4))
+    values = np.repeat(base, 4, axis=1)[:, :columns] + rng.normal(size=(rows, columns))
+    values[rng.random((rows, columns)) < missing] = np.nan
+    return pd.DataFrame(values, columns=[f'col_{i}' for i in range(columns)])
+
+
+def nested_loops(df):
+    """The matrices and pair scans DataAnalyzer and DataVisualizer used to run independently"""
+    #analysis: matrix and strong pairs
+    corr_matrix = df.corr()
+    strong = []
+    for i in range(len(corr_matrix.columns)):
+        for j in range(i + 1, len(corr_matrix.columns)):
+            if abs(corr_matrix.iloc[i, j]) > 0.7:
+                strong.append((corr_matrix.columns[i], corr_matrix.columns[j]))
+    #heatmap
+    df.corr()
+    #scatter plots: pairs above 0.3, strongest four
+    corr_matrix = df.corr()
+    pairs = []
+    for i in range(len(corr_matrix.columns)):
+        for j in range(i + 1, len(corr_matrix.columns)):
+            if abs(corr_matrix.iloc[i, j]) > 0.3:
+                pairs.append((abs(corr_matrix.iloc[i, j]), i, j))
+    pairs.sort(reverse=True)
+    return strong, pairs[:4]
+
+
+def shared_matrix(df, method='pearson'):
+    """One matrix and vectorized pair extraction"""
+    corr_matrix = CorrelationMatrix(df, method=method)
+    corr_matrix.frame
+    return corr_matrix.pairs(threshold=0.7), corr_matrix.pairs(threshold=0.3, top_k=4)
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=20000)
+    parser.add_argument('--columns', type=int, default=200)
+    args = parser.parse_args()
+
+    df = build_frame(args.rows, args.columns)
+    print(f'Frame: {args.rows} rows x {args.columns} numeric columns, 5% missing')
+
+    before = timed(nested_loops, df)
+    after = timed(shared_matrix, df)
+    spearman = timed(shared_matrix, df, 'spearman')
+
+    print(f'pandas x3 + loops: {before:.2f}s')
+    print(f'shared matrix:     {after:.2f}s')
+    print(f'shared, spearman:  {spearman:.2f}s')
+    print(f'speedup:           {before / after:.1f}x')
+
+
+if __name__ == '__main__':
+    main()
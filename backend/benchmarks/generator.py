@@ -0,0 +1,167 @@
+"""
+Seeded synthetic CSV files in the shapes uploads take.
+
+Usage (from the project root):
+    python -m backend.benchmarks.generator tall out.csv --rows 100000
+"""
+import argparse
+import numpy as np
+import pandas as pd
+
+CITIES = ['Lagos', 'Lima', 'Pune', 'Kyiv', 'Oslo', 'Quito', 'Hanoi', 'Perth', 'Tunis', 'Cork']
+STATUSES = ['active', 'inactive', 'pending', 'closed']
+
+
+def _numeric(rng, rows, missing=0.02):
+    values = rng.lognormal(3, 1, size=rows).round(2)
+    values[rng.random(rows) < missing] = np.nan
+    return values
+
+
+def _category(rng, rows, choices, missing=0.02):
+    values = rng.choice(np.array(choices, dtype=object), size=rows)
+    values[rng.random(rows) < missing] = None
+    return values
+
+
+def _identifiers(rng, rows, prefix):
+    """Mostly unique text keys, e.g. order or customer ids"""
+    return np.char.add(prefix, rng.integers(0, rows * 10, size=rows).astype(str)).astype(object)
+
+
+def _dirty_numeric(rng, rows, missing=0.05):
+    """Amounts written as text with currency signs, thousands separators and the odd typo"""
+    amounts = rng.lognormal(6, 1.5, size=rows).round(2)
+    text = np.array([f'{value:,.2f}' for value in amounts], dtype=object)
+    currency = rng.random(rows) < 0.5
+    text[currency] = '$' + text[currency]
+    text[rng.random(rows) < 0.01] = 'n/a'
+    text[rng.random(rows) < missing] = None
+    return text
+
+
+def _dates(rng, rows, start='2019-01-01', days=1500, missing=0.01):
+    offsets = rng.integers(0, days * 24 * 60, size=rows).astype('timedelta64[m]')
+    text = np.char.replace(np.datetime_as_string(np.datetime64(start) + offsets, unit='m'), 'T', ' ').astype(object)
+    text[rng.random(rows) < missing] = None
+    return text
+
+
+def tall(rng, rows, columns):
+    """A typical transactional export: ids, amounts, categories and timestamps"""
+    data = {'order_id': np.arange(rows)}
+    for i in range(columns - 1):
+        kind = i % 5
+        if kind == 0:
+            data[f'amount_{i}'] = _numeric(rng, rows)
+        elif kind == 1:
+            data[f'city_{i}'] = _category(rng, rows, CITIES)
+        elif kind == 2:
+            data[f'created_at_{i}'] = _dates(rng, rows)
+        elif kind == 3:
+            data[f'quantity_{i}'] = rng.integers(1, 50, size=rows)
+        else:
+            data[f'status_{i}'] = _category(rng, rows, STATUSES)
+    return data
+
+
+def wide(rng, rows, columns):
+    """Many numeric measurements in correlated groups, as from sensors or surveys"""
+    base = rng.normal(size=(rows, (columns + 4) // 5))
+    values = (np.repeat(base, 5, axis=1)[:, :columns] + rng.normal(size=(rows, columns))).round(4)
+    values[rng.random(values.shape) < 0.02] = np.nan
+    return {f'sensor_{i}': values[:, i] for i in range(columns)}
+
+
+def high_cardinality(rng, rows, columns):
+    """Mostly-unique customer keys and many-valued product codes next to a few prices"""
+    data = {}
+    for i in range(columns):
+        kind = i % 3
+        if kind == 0:
+            data[f'customer_{i}'] = _identifiers(rng, rows, 'C')
+        elif kind == 1:
+            data[f'product_{i}'] = _identifiers(rng, rows // 20 + 1, 'SKU-')[rng.integers(0, rows // 20 + 1, size=rows)]
+        else:
+            data[f'price_{i}'] = _numeric(rng, rows)
+    return data
+
+
+def dirty_numeric(rng, rows, columns):
+    """Numbers stored as text with $ and , plus stray placeholders, for type inference to convert"""
+    data = {}
+    for i in range(columns):
+        if i % 4 == 3:
+            data[f'region_{i}'] = _category(rng, rows, CITIES)
+        else:
+            data[f'revenue_{i}'] = _dirty_numeric(rng, rows)
+    return data
+
+
+def dates(rng, rows, columns):
+    """Several timestamp columns with measures, for date parsing and time series charts"""
+    data = {}
+    for i in range(columns):
+        if i % 2 == 0:
+            data[f'date_{i}'] = _dates(rng, rows, start=f'{2015 + i % 8}-01-01')
+        else:
+            data[f'value_{i}'] = _numeric(rng, rows)
+    return data
+
+
+def sparse(rng, rows, columns):
+    """Heavy missingness: columns from 30% to 95% empty"""
+    data = {}
+    for i in range(columns):
+        missing = (0.3, 0.6, 0.8, 0.95)[i % 4]
+        if i % 2 == 0:
+            data[f'metric_{i}'] = _numeric(rng, rows, missing=missing)
+        else:
+            data[f'label_{i}'] = _category(rng, rows, STATUSES, missing=missing)
+    return data
+
+
+#name: (builder, default rows, default columns)
+SHAPES = {
+    'tall': (tall, 200000, 12),
+    'wide': (wide, 5000, 400),
+    'high_cardinality': (high_cardinality, 100000, 9),
+    'dirty_numeric': (dirty_numeric, 50000, 8),
+    'dates': (dates, 100000, 8),
+    'sparse': (sparse, 100000, 16),
+}
+
+
+def generate_frame(shape, rows=None, columns=None, seed=0, duplicates=0.01):
+    """DataFrame of the named shape; the same arguments always give the same data"""
+    builder, default_rows, default_columns = SHAPES[shape]
+    rows = rows or default_rows
+    columns = columns or default_columns
+    rng = np.random.default_rng(seed)
+
+    df = pd.DataFrame(builder(rng, rows, columns))
+    #a few exact duplicate rows, as repeated exports produce
+    repeats = rng.integers(0, rows, size=int(rows * duplicates))
+    return pd.concat([df, df.iloc[repeats]], ignore_index=True)
+
+
+def generate_csv(path, shape, rows=None, columns=None, seed=0):
+    """Write a generated shape as CSV and return its path"""
+    generate_frame(shape, rows, columns, seed).to_csv(path, index=False)
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('shape', choices=sorted(SHAPES))
+    parser.add_argument('path')
+    parser.add_argument('--rows', type=int)
+    parser.add_argument('--columns', type=int)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    generate_csv(args.path, args.shape, args.rows, args.columns, args.seed)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,122 @@
+"""
+Compare JSON serialization of upload and preview responses for a wide file.
+
+Usage (from the project root):
+    python -m backend.benchmarks.json_benchmark --rows 2000 --columns 1000
+"""
+import os
+import math
+import argparse
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+
+from backend.scripts.csv_validator import CSVValidator
+from backend.scripts.data_cleaner import DataCleaner
+from backend.scripts.data_analyzer import DataAnalyzer
+from backend.scripts.data_preview import records_for_json
+from backend.scripts.json_provider import FastJSONProvider, column_values, orjson
+
+
+def build_csv(path, rows, columns, seed=0):
+    """Numeric columns with gaps, text categories and dates, written as CSV"""
+    rng = np.random.default_rng(seed)
+    data = {}
+    for i in range(columns):
+        kind = i % 3
+        if kind == 0:
+            values = rng.normal(size=rows).round(4)
+            values[rng.random(rows) < 0.05] = np.nan
+        elif kind == 1:
+            values = rng.choice(['north', 'south', 'east', 'west', None], size=rows)
+        else:
+            values = pd.date_range('2021-01-01', periods=rows, freq='h').strftime('%Y-%m-%d %H:%M')
+        data[f'date_{i}' if kind == 2 else f'col_{i}'] = values
+    pd.DataFrame(data).to_csv(path, index=False)
+
+
+def recursive_clean(data):
+    """The per-cell walker previously applied to preview rows before jsonify"""
+    if isinstance(data, list):
+        return [recursive_clean(item) for item in data]
+    elif isinstance(data, dict):
+        return {key: recursive_clean(value) for key, value in data.items()}
+    elif isinstance(data, float):
+        if math.isnan(data) or math.isinf(data):
+            return None
+        return data
+    return data
+
+
+def timed(func, repeat=3):
+    """Best of `repeat` runs, in seconds, and the last result"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=2000)
+    parser.add_argument('--columns', type=int, default=1000)
+    parser.add_argument('--page', type=int, default=1000, help='rows in the preview page')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, 'wide.csv')
+        build_csv(path, args.rows, args.columns)
+        print(f'File: {args.rows} rows x {args.columns} columns, {os.path.getsize(path) / 1e6:.1f}MB')
+
+        is_valid, error_message, df = CSVValidator.validate_csv(path)
+        if not is_valid:
+            raise SystemExit(error_message)
+
+    df, cleaning_report = DataCleaner(df).clean()
+    analysis = DataAnalyzer(df).analyze()
+    head = df.head(100)
+    page = df.head(args.page)
+
+    app = Flask(__name__)
+    standard = DefaultJSONProvider(app)
+    fast = FastJSONProvider(app)
+    encoder = 'orjson' if orjson is not None else 'standard library (orjson not installed)'
+    print(f'Fast provider encoder: {encoder}\n')
+
+    cases = (
+        ('upload response', lambda: standard.dumps({
+            'analysis': analysis, 'cleaning_report': cleaning_report,
+            'preview_data': recursive_clean(head.to_dict('records'))
+        }), lambda: fast.dumps({
+            'analysis': analysis, 'cleaning_report': cleaning_report,
+            'preview_data': records_for_json(head)
+        })),
+        (f'preview {args.page} rows', lambda: standard.dumps({
+            'rows': recursive_clean(page.to_dict('records'))
+        }), lambda: fast.dumps({
+            'rows': records_for_json(page)
+        })),
+        (f'preview {args.page} rows, columns layout', lambda: standard.dumps({
+            'rows': recursive_clean(page.to_dict('records'))
+        }), lambda: fast.dumps({
+            'data': [column_values(page.iloc[:, position]) for position in range(page.shape[1])]
+        })),
+    )
+
+    print(f'{"":36} {"before":>9} {"after":>9} {"speedup":>8} {"size":>8}')
+    for name, before, after in cases:
+        before_seconds, before_body = timed(before)
+        after_seconds, after_body = timed(after)
+        print(
+            f'{name:36} {before_seconds * 1000:7.0f}ms {after_seconds * 1000:7.0f}ms '
+            f'{before_seconds / after_seconds:7.1f}x {len(after_body) / len(before_body):7.2f}x'
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+"""
+Compare repeated per-section column scans with the shared DataProfile.
+
+Usage (from the project root):
+    python -m backend.benchmarks.profile_benchmark --rows 1000000 --columns 50
+"""
+import argparse
+import time
+import numpy as np
+import pandas as pd
+
+from backend.scripts.column_profile import DataProfile
+
+
+def build_frame(rows, columns, seed=0):
+    """Half numeric, half low/high cardinality text columns"""
+    rng = np.random.default_rng(seed)
+    data = {}
+    for i in range(columns):
+        if i % 2 == 0:
+            values = rng.normal(size=rows)
+            values[rng.random(rows) < 0.05] = np.nan
+        elif i % 4 == 1:
+            values = rng.choice(['north', 'south', 'east', 'west', None], size=rows)
+        else:
+            values = rng.integers(0, rows // 10 + 1, size=rows).astype(str).astype(object)
+        data[f'col_{i}'] = values
+    return pd.DataFrame(data)
+
+
+def repeated_scans(df):
+    """The column scans DataAnalyzer and DataVisualizer used to run independently"""
+    #data quality
+    df.isnull().sum().sum()
+    df.duplicated().sum()
+    for column in df.columns:
+        df[column].isnull().sum()
+        df[column].nunique()
+        df[column].nunique()
+        df[column].nunique()
+    #statistics
+    for column in df.select_dtypes(exclude=[np.number]).columns:
+        df[column].count()
+        df[column].value_counts().head(10)
+        df[column].nunique()
+        df[column].mode()
+        df[column].mode()
+    #insights
+    df.isnull().sum().sum()
+    df.duplicated().sum()
+    for column in df.columns:
+        df[column].nunique()
+    for column in df.select_dtypes(include=['object']).columns:
+        if df[column].nunique() < 10:
+            df[column].value_counts()
+    #column info
+    for column in df.columns:
+        df[column].count()
+        df[column].isnull().sum()
+        df[column].nunique()
+    #visualizer categorical charts
+    for column in df.select_dtypes(include=['object']).columns[:4]:
+        if df[column].nunique() <= 15:
+            df[column].value_counts().head(10)
+
+
+def shared_profile(df):
+    """The same metrics read from a single DataProfile"""
+    profile = DataProfile(df)
+    profile.missing_cells
+    profile.duplicate_rows
+    for column in df.columns:
+        profile[column].unique_count
+        profile[column].mode
+    return profile
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=1000000)
+    parser.add_argument('--columns', type=int, default=50)
+    args = parser.parse_args()
+
+    df = build_frame(args.rows, args.columns)
+    print(f'Frame: {args.rows} rows x {args.columns} columns')
+
+    before = timed(repeated_scans, df)
+    after = timed(shared_profile, df)
+
+    print(f'repeated scans: {before:.2f}s')
+    print(f'shared profile: {after:.2f}s')
+    print(f'speedup:        {before / after:.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,211 @@
+"""
+Time each upload stage on generated CSV shapes and compare with stored baselines.
+
+Usage (from the project root):
+    python -m backend.benchmarks.stage_benchmark
+    python -m backend.benchmarks.stage_benchmark --shapes tall wide --repeat 5
+    python -m backend.benchmarks.stage_benchmark --save-baseline
+
+Each shape is generated with a fixed seed and run through validate, clean,
+analyze and visualize as UploadPipeline runs them. Wall time is the best of
+--repeat runs after an untimed warm-up run; peak memory is the largest
+tracemalloc total (Python objects and NumPy buffers) above the stage's
+starting point, measured in a separate run. Stages slower than the baseline
+by more than --threshold, or larger by more than --memory-threshold, are
+reported as regressions and the exit status is 1. Peak memory is
+reproducible; wall time is not, and depends on the machine, so save
+baselines on the machine that compares against them.
+"""
+import os
+import sys
+import json
+import argparse
+import platform
+import tempfile
+import time
+import tracemalloc
+import warnings
+import numpy as np
+import pandas as pd
+
+from backend.config.config import Config
+from backend.scripts.csv_validator import CSVValidator
+from backend.scripts.data_cleaner import DataCleaner
+from backend.scripts.memory_optimizer import MemoryOptimizer
+from backend.scripts.data_analyzer import DataAnalyzer
+from backend.scripts.column_profile import DataProfile
+from backend.scripts.visualizer import DataVisualizer
+from backend.scripts.chart_store import ChartStore
+from backend.benchmarks.generator import SHAPES, generate_csv
+
+STAGES = ('validate', 'clean', 'analyze', 'visualize')
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), 'baselines.json')
+
+#changes smaller than these are noise, whatever the ratio
+MIN_SECONDS = 0.05
+MIN_BYTES = 5 * 1024 * 1024
+
+
+class StageRun:
+    """Measures one stage at a time, in seconds or in peak traced bytes"""
+
+    def __init__(self, memory=False):
+        self.memory = memory
+        self.results = {}
+
+    def __call__(self, stage, func, *args):
+        if self.memory:
+            tracemalloc.reset_peak()
+            start = tracemalloc.get_traced_memory()[0]
+            value = func(*args)
+            self.results[stage] = tracemalloc.get_traced_memory()[1] - start
+        else:
+            start = time.perf_counter()
+            value = func(*args)
+            self.results[stage] = time.perf_counter() - start
+        return value
+
+
+def run_stages(path, chart_folder, measure, render=False):
+    """The pipeline's stages on one CSV, each timed (or traced) through `measure`"""
+    is_valid, error_message, df = measure('validate', CSVValidator.validate_csv, path)
+    if not is_valid:
+        raise SystemExit(f'{path}: {error_message}')
+
+    def clean(df):
+        cleaner = DataCleaner(df)
+        cleaned_df, _ = cleaner.clean()
+        if Config.OPTIMIZE_MEMORY:
+            cleaned_df, _ = MemoryOptimizer(cleaned_df).optimize()
+        return cleaned_df, cleaner.duplicate_rows
+
+    cleaned_df, duplicate_rows = measure('clean', clean, df)
+    del df
+
+    def analyze(df):
+        profile = DataProfile(df, mode=Config.PROFILE_MODE, duplicate_rows=duplicate_rows)
+        DataAnalyzer(df, profile=profile).analyze()
+        return profile
+
+    profile = measure('analyze', analyze, cleaned_df)
+
+    def visualize(df):
+        visualizer = DataVisualizer(df, profile=profile, mode=Config.CHART_MODE)
+        #the upload path saves chart specs; --render draws every chart as well
+        chart_store = None if render else ChartStore(chart_folder)
+        return visualizer.generate_visualizations(chart_store=chart_store)
+
+    measure('visualize', visualize, cleaned_df)
+    return measure.results
+
+
+def benchmark_shape(shape, folder, repeat, render=False, rows=None, columns=None):
+    """{stage: {'seconds', 'peak_mb'}} for one generated shape"""
+    path = generate_csv(os.path.join(folder, f'{shape}.csv'), shape, rows, columns)
+    chart_folder = os.path.join(folder, f'{shape}_charts')
+
+    #untimed first run so lazy imports and cold caches don't count against any stage
+    run_stages(path, chart_folder, StageRun(), render)
+
+    seconds = {}
+    for _ in range(repeat):
+        timing = run_stages(path, chart_folder, StageRun(), render)
+        for stage, value in timing.items():
+            seconds[stage] = min(seconds.get(stage, float('inf')), value)
+
+    tracemalloc.start()
+    try:
+        peaks = run_stages(path, chart_folder, StageRun(memory=True), render)
+    finally:
+        tracemalloc.stop()
+
+    return {
+        stage: {'seconds': round(seconds[stage], 4), 'peak_mb': round(peaks[stage] / 1024 / 1024, 1)}
+        for stage in STAGES
+    }
+
+
+def compare(value, baseline, threshold, minimum):
+    """Relative change against the baseline, and whether it is a regression"""
+    if not baseline:
+        return None, False
+    change = value / baseline - 1
+    return change, change > threshold and value - baseline > minimum
+
+
+def format_change(change):
+    return '' if change is None else f'{change * 100:+.0f}%'
+
+
+def environment():
+    return {
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'numpy': np.__version__,
+        'machine': platform.machine(),
+        'cpus': os.cpu_count()
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--shapes', nargs='+', choices=sorted(SHAPES), default=list(SHAPES))
+    parser.add_argument('--repeat', type=int, default=3, help='timed runs per shape; the best is kept')
+    parser.add_argument('--threshold', type=float, default=0.5, help='allowed slowdown, e.g. 0.5 = 50%%')
+    parser.add_argument('--memory-threshold', type=float, default=0.1, help='allowed growth in peak memory')
+    parser.add_argument('--baseline', default=BASELINE_PATH)
+    parser.add_argument('--save-baseline', action='store_true', help='store these results as the new baseline')
+    parser.add_argument('--render', action='store_true', help='render every chart in the visualize stage')
+    args = parser.parse_args()
+
+    #mixed date formats make pandas warn while guessing; not what is measured here
+    warnings.simplefilter('ignore')
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    baseline_shapes = baseline.get('shapes', {})
+    if baseline.get('render', False) != args.render:
+        print('Baseline was recorded with a different --render setting; not comparing.')
+        baseline_shapes = {}
+
+    results = {}
+    regressions = []
+    print(f'{"shape":17} {"stage":10} {"seconds":>9} {"change":>7} {"peak MB":>9} {"change":>7}')
+    with tempfile.TemporaryDirectory() as folder:
+        for shape in args.shapes:
+            results[shape] = benchmark_shape(shape, folder, args.repeat, args.render)
+            for stage, measured in results[shape].items():
+                expected = baseline_shapes.get(shape, {}).get(stage, {})
+                time_change, slower = compare(
+                    measured['seconds'], expected.get('seconds'), args.threshold, MIN_SECONDS
+                )
+                memory_change, larger = compare(
+                    measured['peak_mb'], expected.get('peak_mb'), args.memory_threshold, MIN_BYTES / 1024 / 1024
+                )
+                flag = ''
+                if slower or larger:
+                    flag = 'REGRESSION'
+                    regressions.append(f'{shape}/{stage}')
+                print(
+                    f'{shape:17} {stage:10} {measured["seconds"]:9.3f} {format_change(time_change):>7} '
+                    f'{measured["peak_mb"]:9.1f} {format_change(memory_change):>7} {flag}'
+                )
+
+    if args.save_baseline:
+        #keep shapes that weren't run this time
+        shapes = {**baseline.get('shapes', {}), **results} if baseline.get('render', False) == args.render else results
+        with open(args.baseline, 'w') as f:
+            json.dump({'environment': environment(), 'render': args.render, 'shapes': shapes}, f, indent=2)
+            f.write('\n')
+        print(f'\nBaseline saved to {args.baseline}')
+        return
+
+    if regressions:
+        print(f'\n{len(regressions)} stage(s) regressed: {", ".join(regressions)}')
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
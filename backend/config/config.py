@@ -1,4 +1,5 @@
 import os
+import multiprocessing
 
 class Config:
     """Base configuration"""
@@ -12,6 +13,81 @@ class Config:
     MAX_COLUMNS = 1000  #maximum columns to process
     ALLOWED_MIME_TYPES = ['text/csv', 'application/csv', 'text/plain']
 
+    #chunked loading
+    CHUNK_SIZE = int(os.environ.get('CHUNK_SIZE', 100000))  #rows per chunk
+    MAX_MEMORY_BYTES = int(os.environ.get('MAX_MEMORY_MB', 1024)) * 1024 * 1024  #per-request ceiling
+    SNIFF_BYTES = 64 * 1024  #leading bytes checked for encoding
+    MAX_DECOMPRESSION_RATIO = int(os.environ.get('MAX_DECOMPRESSION_RATIO', 100))  #.gz/.zst uploads expanding further are rejected
+
+    #type inference: rows sampled per text column before converting it
+    TYPE_INFERENCE_SAMPLE_SIZE = int(os.environ.get('TYPE_INFERENCE_SAMPLE_SIZE', 1000))
+
+    #compact dtypes for cleaned data (lossless numeric downcasts, categorical text)
+    OPTIMIZE_MEMORY = os.environ.get('OPTIMIZE_MEMORY', 'true').lower() == 'true'
+    CATEGORY_MAX_RATIO = 0.5  #text columns with at most this share of distinct values become categories
+
+    #data preview (upload response and /api/preview pages)
+    PREVIEW_ROWS = 100  #rows in the upload response and the default page size
+    PREVIEW_MAX_ROWS = int(os.environ.get('PREVIEW_MAX_ROWS', 1000))  #largest page /api/preview returns
+
+    #streaming statistics
+    QUANTILE_SKETCH_K = 2000  #quantiles are exact up to this many values per column, then within 4/k in rank
+
+    #column profiling ('exact' or 'sketch', selectable per request)
+    PROFILE_MODE = os.environ.get('PROFILE_MODE', 'exact')
+    HLL_PRECISION = 14  #2**14 registers, ~0.8% relative error on distinct counts
+    HEAVY_HITTER_CAPACITY = 100  #values tracked per column for most_common
+
+    #charts ('image' renders PNGs, 'data' returns aggregates for the frontend to plot; selectable per request)
+    CHART_MODE = os.environ.get('CHART_MODE', 'image')
+    CHART_DATA_POINTS = int(os.environ.get('CHART_DATA_POINTS', 1000))  #point budget per chart in data mode
+
+    #correlations between numeric columns ('pearson' or 'spearman')
+    CORRELATION_METHOD = os.environ.get('CORRELATION_METHOD', 'pearson')
+
+    #chart rendering
+    CHART_WORKERS = int(os.environ.get('CHART_WORKERS', min(4, os.cpu_count() or 1)))  #1 renders inline
+    CHART_TIMEOUT = int(os.environ.get('CHART_TIMEOUT', 30))  #seconds for one batch of charts
+    #render worker start method; the fork server preloads the plotting libraries for its workers
+    CHART_START_METHOD = os.environ.get(
+        'CHART_START_METHOD', 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+    )
+    CHART_MAX_AGE = int(os.environ.get('CHART_MAX_AGE', 3600))  #seconds browsers may reuse a chart image
+
+    #plot data reduction
+    MAX_PLOT_POINTS = int(os.environ.get('MAX_PLOT_POINTS', 5000))  #point budget per scatter/time series
+    DENSITY_MIN_POINTS = int(os.environ.get('DENSITY_MIN_POINTS', 100000))  #denser scatters are binned into a grid
+    DENSITY_GRID_SIZE = 60  #bins per axis of a scatter density grid
+    TIME_SERIES_REDUCTION = os.environ.get('TIME_SERIES_REDUCTION', 'lttb')  #'lttb' or 'minmax'
+    MAX_MARKERS = 500  #time series with more points are drawn without markers
+    HEATMAP_MAX_COLUMNS = int(os.environ.get('HEATMAP_MAX_COLUMNS', 40))  #wider matrices show the most correlated columns, clustered
+    HEATMAP_ANNOTATE_MAX = 20  #larger heatmaps are drawn as an image without cell annotations
+
+    #result cache for repeated uploads of the same file
+    CACHE_ENABLED = os.environ.get('CACHE_ENABLED', 'true').lower() == 'true'
+    CACHE_FOLDER = os.environ.get('CACHE_FOLDER', 'cache')
+    CACHE_MAX_BYTES = int(os.environ.get('CACHE_MAX_MB', 500)) * 1024 * 1024
+    PIPELINE_VERSION = '11'  #bump when cleaning/analysis/chart output changes
+
+    #processed sessions ('memory' for a single process, 'disk' to share across workers)
+    SESSION_BACKEND = os.environ.get('SESSION_BACKEND', 'memory')
+    SESSION_FOLDER = os.environ.get('SESSION_FOLDER', UPLOAD_FOLDER)  #disk backend session index
+    SESSION_TTL = int(os.environ.get('SESSION_TTL', 3600))  #seconds idle before a session expires
+    SESSION_MAX_COUNT = int(os.environ.get('SESSION_MAX_COUNT', 50))  #memory backend LRU cap
+    SESSION_SWEEP_INTERVAL = 60  #seconds between expiry sweeps
+
+    #import plotting libraries and build the font cache when the app is loaded, before workers fork
+    WARMUP = os.environ.get('WARMUP', 'true').lower() == 'true'
+
+    #instrumentation (/api/metrics, and per-stage timings in the upload response when the header is sent)
+    TIMING_HEADER = 'X-Debug-Timing'
+    TRACE_MEMORY = os.environ.get('TRACE_MEMORY', 'false').lower() == 'true'  #tracemalloc peaks per stage; slows uploads
+
+    #background upload jobs (async mode)
+    JOB_WORKERS = int(os.environ.get('JOB_WORKERS', 2))  #uploads processed at once
+    JOB_QUEUE_SIZE = int(os.environ.get('JOB_QUEUE_SIZE', 8))  #uploads waiting before new ones get 503
+    JOB_TTL = int(os.environ.get('JOB_TTL', 3600))  #seconds a finished job stays pollable
+
 class DevelopmentConfig(Config):
     DEBUG = True
 
@@ -0,0 +1,38 @@
+"""
+Gunicorn settings. The app (and, with WARMUP, the plotting libraries and
+font cache) is loaded once in the master process before the worker forks,
+so a restarted worker boots instantly with them already in memory.
+
+With the default memory session backend, sessions and upload jobs live
+in the worker process, and follow-up requests (job polling, chart images,
+preview, download) must reach the worker that handled the upload, so
+only one worker is run; it serves requests concurrently on its threads
+and charts still render in parallel in the render pool's processes.
+With SESSION_BACKEND=disk both are shared through SQLite and
+WEB_CONCURRENCY workers are started.
+
+Usage (from the project root):
+    gunicorn -c backend/gunicorn.conf.py
+"""
+import os
+
+#the app factory, called once in the master; backend/wsgi.py builds nothing on import
+wsgi_app = 'backend.wsgi:load_app()'
+bind = os.environ.get('BIND', f"0.0.0.0:{os.environ.get('PORT', 5000)}")
+workers = int(os.environ.get('WEB_CONCURRENCY', 1))
+worker_class = 'gthread'
+threads = int(os.environ.get('GUNICORN_THREADS', 8))
+preload_app = True
+
+if workers != 1 and os.environ.get('SESSION_BACKEND', 'memory') != 'disk':
+    print(
+        f'WEB_CONCURRENCY={workers} ignored: sessions and upload jobs are kept in the worker process '
+        'with the memory backend, so one worker is run. Set SESSION_BACKEND=disk to share them.'
+    )
+    workers = 1
+
+
+def post_fork(server, worker):
+    #background threads started in the master don't survive the fork
+    from backend.routes.routes import session_store
+    session_store.start_expiry()
@@ -0,0 +1,263 @@
+import os
+import time
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from contextlib import contextmanager
+import pandas as pd
+from backend.config.config import Config
+from backend.scripts.columnar import DATA_EXTENSION, save_columnar, load_columnar, columnar_columns
+from backend.scripts.compression import compressed_copies
+from backend.scripts.chart_store import ChartStore
+
+
+class SessionStore(ABC):
+    """
+    Interface for processed upload sessions.
+    A session is a dict with 'original_file', 'cleaned_file' and
+    'original_filename', plus either a live 'dataframe' or a 'data_file'
+    reference depending on the backend.
+    """
+
+    #session keys that point at files owned by the session
+    FILE_KEYS = ('original_file', 'cleaned_file', 'data_file')
+
+    def __init__(self, ttl=None):
+        self.ttl = Config.SESSION_TTL if ttl is None else ttl
+        self._expiry_thread = None
+        self._expiry_pid = None
+
+    @abstractmethod
+    def put(self, session_id, session):
+        """Store a session, replacing any with the same id"""
+
+    @abstractmethod
+    def get(self, session_id):
+        """Return the session dict, or None if it doesn't exist or has expired"""
+
+    @abstractmethod
+    def delete(self, session_id):
+        """Remove a session and its files; returns False if it didn't exist"""
+
+    @abstractmethod
+    def expire(self):
+        """Remove sessions idle for longer than the TTL; returns their ids"""
+
+    def __contains__(self, session_id):
+        return self.get(session_id) is not None
+
+    def load_dataframe(self, session, columns=None):
+        """
+        The session's cleaned data, loaded from the best available source.
+        Pass `columns` to load only those columns from the columnar copy.
+        """
+        df = session.get('dataframe')
+        if df is not None:
+            return df[columns] if columns else df
+        if session.get('data_file') and os.path.exists(session['data_file']):
+            return load_columnar(session['data_file'], columns=columns)
+        return pd.read_csv(session['cleaned_file'], usecols=columns)
+
+    def column_names(self, session):
+        """The session's cleaned column names, without loading any data"""
+        df = session.get('dataframe')
+        if df is not None:
+            return df.columns.tolist()
+        if session.get('data_file') and os.path.exists(session['data_file']):
+            return columnar_columns(session['data_file'])
+        return pd.read_csv(session['cleaned_file'], nrows=0).columns.tolist()
+
+    def start_expiry(self, interval=None):
+        """
+        Sweep expired sessions from a background daemon thread. Safe to call
+        again after a fork: threads don't survive it, so a forked worker
+        starts its own sweeper.
+        """
+        if self._expiry_thread is not None and self._expiry_pid == os.getpid():
+            return
+        interval = interval or Config.SESSION_SWEEP_INTERVAL
+
+        def sweep():
+            while True:
+                time.sleep(interval)
+                try:
+                    self.expire()
+                except Exception as e:
+                    print(f"Error expiring sessions: {e}")
+
+        self._expiry_thread = threading.Thread(target=sweep, name='session-expiry', daemon=True)
+        self._expiry_pid = os.getpid()
+        self._expiry_thread.start()
+
+    @classmethod
+    def remove_files(cls, session):
+        """Delete the files a session owns, including compressed download copies and charts"""
+        paths = [session.get(key) for key in cls.FILE_KEYS]
+        if session.get('cleaned_file'):
+            paths += compressed_copies(session['cleaned_file'])
+            ChartStore.for_session(session['cleaned_file']).remove()
+
+        for path in paths:
+            if path and os.path.exists(path):
+                try:
+                    os.remove(path)
+                except OSError as e:
+                    print(f"Error removing {path}: {e}")
+
+
+class MemorySessionStore(SessionStore):
+    """Sessions held in this process, with idle TTL and a least-recently-used size cap"""
+
+    def __init__(self, ttl=None, max_sessions=None):
+        super().__init__(ttl)
+        self.max_sessions = max_sessions or Config.SESSION_MAX_COUNT
+        self._sessions = OrderedDict()
+        self._lock = threading.Lock()
+
+    def put(self, session_id, session):
+        evicted = []
+        with self._lock:
+            self._sessions[session_id] = (time.time(), session)
+            self._sessions.move_to_end(session_id)
+            while len(self._sessions) > self.max_sessions:
+                evicted.append(self._sessions.popitem(last=False)[1][1])
+
+        for old_session in evicted:
+            self.remove_files(old_session)
+
+    def get(self, session_id):
+        with self._lock:
+            entry = self._sessions.get(session_id)
+            if entry is None:
+                return None
+            accessed_at, session = entry
+            if time.time() - accessed_at > self.ttl:
+                return None
+            self._sessions[session_id] = (time.time(), session)
+            self._sessions.move_to_end(session_id)
+            return session
+
+    def delete(self, session_id):
+        with self._lock:
+            entry = self._sessions.pop(session_id, None)
+        if entry is None:
+            return False
+        self.remove_files(entry[1])
+        return True
+
+    def expire(self):
+        cutoff = time.time() - self.ttl
+        with self._lock:
+            expired = [
+                session_id for session_id, (accessed_at, _) in self._sessions.items()
+                if accessed_at < cutoff
+            ]
+            sessions = [self._sessions.pop(session_id)[1] for session_id in expired]
+
+        for session in sessions:
+            self.remove_files(session)
+        return expired
+
+
+class DiskSessionStore(SessionStore):
+    """
+    Sessions indexed in SQLite with cleaned data saved as Arrow files, so every
+    worker process sees the same sessions and none of them hold DataFrames.
+    """
+
+    COLUMNS = ('session_id', 'original_file', 'cleaned_file', 'data_file', 'original_filename', 'accessed_at')
+
+    def __init__(self, folder=None, ttl=None):
+        super().__init__(ttl)
+        self.folder = folder or Config.SESSION_FOLDER
+        os.makedirs(self.folder, exist_ok=True)
+        self.db_path = os.path.join(self.folder, 'sessions.db')
+
+        with self._connect() as conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS sessions ('
+                'session_id TEXT PRIMARY KEY, original_file TEXT, cleaned_file TEXT, '
+                'data_file TEXT, original_filename TEXT, accessed_at REAL)'
+            )
+            conn.execute('CREATE INDEX IF NOT EXISTS sessions_accessed_at ON sessions (accessed_at)')
+
+    @contextmanager
+    def _connect(self):
+        """Connection that commits on success and is always closed"""
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def put(self, session_id, session):
+        session = dict(session)
+        df = session.pop('dataframe', None)
+        if df is not None and not session.get('data_file'):
+            data_file = os.path.join(self.folder, f"{session_id}_cleaned{DATA_EXTENSION}")
+            if save_columnar(df, data_file):
+                session['data_file'] = data_file
+
+        with self._connect() as conn:
+            conn.execute(
+                'INSERT OR REPLACE INTO sessions VALUES (?, ?, ?, ?, ?, ?)',
+                (
+                    session_id,
+                    session.get('original_file'),
+                    session.get('cleaned_file'),
+                    session.get('data_file'),
+                    session.get('original_filename'),
+                    time.time()
+                )
+            )
+
+    def get(self, session_id):
+        now = time.time()
+        with self._connect() as conn:
+            row = conn.execute(
+                f'SELECT {", ".join(self.COLUMNS)} FROM sessions WHERE session_id = ? AND accessed_at >= ?',
+                (session_id, now - self.ttl)
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute('UPDATE sessions SET accessed_at = ? WHERE session_id = ?', (now, session_id))
+
+        session = dict(zip(self.COLUMNS, row))
+        del session['session_id'], session['accessed_at']
+        return session
+
+    def delete(self, session_id):
+        with self._connect() as conn:
+            row = conn.execute(
+                'SELECT original_file, cleaned_file, data_file FROM sessions WHERE session_id = ?',
+                (session_id,)
+            ).fetchone()
+            if row is None:
+                return False
+            conn.execute('DELETE FROM sessions WHERE session_id = ?', (session_id,))
+
+        self.remove_files(dict(zip(self.FILE_KEYS, row)))
+        return True
+
+    def expire(self):
+        cutoff = time.time() - self.ttl
+        with self._connect() as conn:
+            rows = conn.execute(
+                'SELECT session_id, original_file, cleaned_file, data_file FROM sessions WHERE accessed_at < ?',
+                (cutoff,)
+            ).fetchall()
+            conn.executemany('DELETE FROM sessions WHERE session_id = ?', [(row[0],) for row in rows])
+
+        for row in rows:
+            self.remove_files(dict(zip(self.FILE_KEYS, row[1:])))
+        return [row[0] for row in rows]
+
+
+def create_session_store():
+    """Build the session store selected by Config.SESSION_BACKEND"""
+    if Config.SESSION_BACKEND == 'disk':
+        return DiskSessionStore()
+    return MemorySessionStore()
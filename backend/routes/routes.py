@@ -1,19 +1,32 @@
-from flask import Blueprint, request, jsonify, send_file
+from flask import Blueprint, request, jsonify, send_file, current_app, url_for
 import os
 import uuid
 from werkzeug.utils import secure_filename
-import pandas as pd
 
 from backend.scripts.csv_validator import CSVValidator
-from backend.scripts.data_cleaner import DataCleaner
-from backend.scripts.data_analyzer import DataAnalyzer
+from backend.scripts.column_profile import DataProfile
 from backend.scripts.visualizer import DataVisualizer
+from backend.scripts.result_cache import ResultCache
+from backend.scripts.pipeline import UploadPipeline, PipelineError
+from backend.scripts.job_manager import JobManager, JobQueueFull
+from backend.scripts.upload_stream import UploadStream, UploadRejected
+from backend.scripts.data_preview import PreviewQuery, PreviewError
+from backend.scripts.chart_store import ChartStore
+from backend.scripts.metrics import metrics
+from backend.scripts.compression import SUFFIXES, MIMETYPES, available, compressed_copy, split_compression
+from backend.models.session_store import create_session_store
 from backend.config.config import Config
 
 api_bp = Blueprint('api', __name__)
 
-#store processed data temporarily (in production, use Redis or database)
-processed_data_store = {}
+#processed sessions, expired in the background (see Config.SESSION_BACKEND)
+session_store = create_session_store()
+
+#results of previously processed files, keyed by content hash
+result_cache = ResultCache() if Config.CACHE_ENABLED else None
+
+#bounded executor for uploads submitted in async mode
+job_manager = JobManager()
 
 
 @api_bp.route('/health', methods=['GET'])
@@ -22,6 +35,20 @@ def health_check():
     return jsonify({'status': 'healthy', 'service': 'CSVSleuth API'}), 200
 
 
+@api_bp.route('/metrics', methods=['GET'])
+def get_metrics():
+    """Upload, stage and chart metrics of this process in the Prometheus text format"""
+    return current_app.response_class(
+        metrics.render(), content_type='text/plain; version=0.0.4; charset=utf-8'
+    )
+
+
+@api_bp.errorhandler(UploadRejected)
+def upload_rejected(error):
+    """Uploads stopped while streaming in (wrong type, not CSV text, too many columns)"""
+    return jsonify({'error': str(error)}), 400
+
+
 @api_bp.route('/upload', methods=['POST'])
 def upload_file():
     """Handle CSV file upload, validation, cleaning, and analysis"""
@@ -39,7 +66,31 @@ def upload_file():
     if not CSVValidator.allowed_file(file.filename):
         return jsonify({'error': 'Invalid file type. Only CSV files are allowed'}), 400
 
-    try:
+    #exact counts, or sketches for cheap approximate counts on large files
+    profile_mode = request.form.get('profile_mode', Config.PROFILE_MODE)
+    if profile_mode not in DataProfile.MODES:
+        return jsonify({'error': f'Invalid profile_mode. Use one of: {", ".join(DataProfile.MODES)}'}), 400
+
+    #PNG charts, or chart data for the frontend to plot
+    chart_mode = request.form.get('chart_mode', Config.CHART_MODE)
+    if chart_mode not in DataVisualizer.MODES:
+        return jsonify({'error': f'Invalid chart_mode. Use one of: {", ".join(DataVisualizer.MODES)}'}), 400
+
+    #per-stage timing breakdown in the response, for debugging slow uploads
+    include_timings = request.headers.get(Config.TIMING_HEADER, '').lower() in ('1', 'true', 'yes')
+
+    #async mode returns a job id immediately instead of waiting for processing
+    run_async = request.values.get('async', 'false').lower() in ('1', 'true', 'yes')
+
+    upload = file.stream
+    if isinstance(upload, UploadStream):
+        #already streamed to disk, hashed and sniffed while the body was received
+        upload.claim()
+        session_id = upload.upload_id
+        original_filename = upload.filename
+        temp_filepath = upload.path
+        content_hash = upload.content_hash
+    else:
         #create secure filename and save temporarily
         session_id = str(uuid.uuid4())
         original_filename = secure_filename(file.filename)
@@ -50,87 +101,196 @@ def upload_file():
 
         temp_filepath = os.path.join(upload_folder, f"{session_id}_{original_filename}")
         file.save(temp_filepath)
+        content_hash = None
+
+    #background threads have no app context, so take the JSON encoder from this request
+    pipeline = UploadPipeline(
+        session_id, temp_filepath, original_filename, session_store,
+        profile_mode=profile_mode,
+        chart_mode=chart_mode,
+        result_cache=result_cache,
+        content_hash=content_hash,
+        dumps=current_app.json.dumps,
+        include_timings=include_timings
+    )
+
+    if run_async:
+        def run(job):
+            pipeline.on_progress = job.update_stage
+            return pipeline.run()
+
+        try:
+            job = job_manager.submit(run, UploadPipeline.STAGES)
+        except JobQueueFull as e:
+            os.remove(temp_filepath)
+            return jsonify({'error': str(e)}), 503
 
-        #validate and load CSV
-        is_valid, error_message, df = CSVValidator.validate_csv(temp_filepath)
+        return jsonify({
+            'job_id': job.id,
+            'session_id': session_id,
+            'status': job.status,
+            'status_url': url_for('api.job_status', job_id=job.id),
+            'result_url': url_for('api.job_result', job_id=job.id)
+        }), 202
 
-        if not is_valid:
-            os.remove(temp_filepath)  #clean up
-            return jsonify({'error': error_message}), 400
+    try:
+        return jsonify(_with_chart_urls(pipeline.run())), 200
 
-        #clean the data
-        cleaner = DataCleaner(df)
-        cleaned_df, cleaning_report = cleaner.clean()
+    except PipelineError as e:
+        return jsonify({'error': str(e)}), 400
 
-        #analyze the data
-        analyzer = DataAnalyzer(cleaned_df)
-        analysis_results = analyzer.analyze()
+    except Exception as e:
+        return jsonify({'error': f'Error processing file: {str(e)}'}), 500
 
-        #generate visualizations
-        visualizer = DataVisualizer(cleaned_df)
-        visualizations = visualizer.generate_visualizations()
 
-        #save cleaned CSV for download
-        cleaned_filepath = os.path.join(upload_folder, f"{session_id}_cleaned.csv")
-        cleaned_df.to_csv(cleaned_filepath, index=False)
+@api_bp.route('/jobs/<job_id>', methods=['GET'])
+def job_status(job_id):
+    """Report the status and per-stage progress of an upload job"""
 
-        #store data for later retrieval
-        processed_data_store[session_id] = {
-            'original_file': temp_filepath,
-            'cleaned_file': cleaned_filepath,
-            'original_filename': original_filename,
-            'dataframe': cleaned_df
-        }
+    job = job_manager.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found or expired'}), 404
 
-        #prepare preview data (first 100 rows)
-        preview_data = cleaned_df.head(100).to_dict('records')
+    return jsonify(job.to_dict()), 200
 
-        #clean up nan values for json serialization
-        preview_data = _clean_for_json(preview_data)
 
-        #build response
-        response = {
-            'session_id': session_id,
-            'original_filename': original_filename,
-            'cleaning_report': cleaning_report,
-            'analysis': analysis_results,
-            'visualizations': visualizations,
-            'preview_data': preview_data,
-            'preview_columns': cleaned_df.columns.tolist(),
-            'total_rows': len(cleaned_df)
-        }
+@api_bp.route('/jobs/<job_id>/result', methods=['GET'])
+def job_result(job_id):
+    """Return the results of an upload job, including partial results while it runs"""
 
-        return jsonify(response), 200
+    job = job_manager.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found or expired'}), 404
 
-    except Exception as e:
-        #clean up files if they exist
-        if 'temp_filepath' in locals() and os.path.exists(temp_filepath):
-            os.remove(temp_filepath)
+    if job.status == 'failed':
+        message = job.error if job.error_status == 400 else f'Error processing file: {job.error}'
+        return jsonify({'error': message, 'job_id': job.id, 'status': job.status}), job.error_status
 
-        return jsonify({'error': f'Error processing file: {str(e)}'}), 500
+    #202 until every stage has finished; the body holds whatever is ready so far
+    status_code = 200 if job.status == 'completed' else 202
+    return jsonify({**_with_chart_urls(job.result), 'job_id': job.id, 'status': job.status}), status_code
 
 
-@api_bp.route('/download/<session_id>', methods=['GET'])
-def download_cleaned_file(session_id):
-    """Download the cleaned CSV file"""
+@api_bp.route('/chart/<session_id>/<chart_id>', methods=['GET'])
+def get_chart(session_id, chart_id):
+    """Chart image for a processed upload, rendered on its first request and then served from disk"""
 
-    if session_id not in processed_data_store:
+    data = session_store.get(session_id)
+    if data is None:
+        return jsonify({'error': 'Session not found or expired'}), 404
+
+    chart_store = ChartStore.for_session(data['cleaned_file'])
+    etag = chart_store.etag(chart_id)
+    if etag is None:
+        return jsonify({'error': 'Chart not found'}), 404
+
+    #a client holding the current image revalidates without the chart being rendered
+    if request.if_none_match.contains_weak(etag):
+        response = current_app.response_class(status=304)
+    else:
+        image_path = chart_store.image_path(chart_id)
+        if image_path is None:
+            return jsonify({'error': 'Error rendering chart'}), 500
+        response = send_file(os.path.abspath(image_path), mimetype='image/png', etag=False)
+
+    response.set_etag(etag)
+    response.cache_control.no_cache = None
+    response.cache_control.private = True
+    response.cache_control.max_age = Config.CHART_MAX_AGE
+    return response
+
+
+def _with_chart_urls(result):
+    """Copy of an upload result whose charts carry the URL their image is served from"""
+    visualizations = result.get('visualizations')
+    if not visualizations:
+        return result
+
+    def link(chart):
+        if chart is None or 'id' not in chart:
+            return chart
+        return {**chart, 'url': url_for('api.get_chart', session_id=result['session_id'], chart_id=chart['id'])}
+
+    linked = {
+        name: [link(chart) for chart in charts] if isinstance(charts, list) else link(charts)
+        for name, charts in visualizations.items()
+    }
+    return {**result, 'visualizations': linked}
+
+
+@api_bp.route('/preview/<session_id>', methods=['GET'])
+def preview_data(session_id):
+    """
+    Page through a session's cleaned data.
+    Supports offset/limit, columns=a,b, sort=a,-b and repeated filter=column:operator:value;
+    only the columns the query touches are loaded.
+    """
+
+    data = session_store.get(session_id)
+    if data is None:
         return jsonify({'error': 'Session not found or expired'}), 404
 
     try:
-        data = processed_data_store[session_id]
-        cleaned_file = data['cleaned_file']
-        original_filename = data['original_filename']
+        query = PreviewQuery.from_args(request.args, session_store.column_names(data))
+        df = session_store.load_dataframe(data, columns=query.required_columns())
+        return jsonify({'session_id': session_id, **query.apply(df)}), 200
+
+    except PreviewError as e:
+        return jsonify({'error': str(e)}), e.status_code
+    except Exception as e:
+        return jsonify({'error': f'Error loading preview: {str(e)}'}), 500
+
 
-        #create download filename
-        download_filename = f"cleaned_{original_filename}"
+@api_bp.route('/download/<session_id>', methods=['GET'])
+def download_cleaned_file(session_id):
+    """
+    Download the cleaned CSV file.
+    ?compression=gzip|zstd returns a compressed file (cleaned_name.csv.gz);
+    otherwise the CSV is sent with Content-Encoding when Accept-Encoding allows it.
+    """
+
+    data = session_store.get(session_id)
+    if data is None:
+        return jsonify({'error': 'Session not found or expired'}), 404
 
-        return send_file(
-            cleaned_file,
-            mimetype='text/csv',
-            as_attachment=True,
-            download_name=download_filename
-        )
+    compression = request.args.get('compression')
+    if compression and (compression not in SUFFIXES or not available(compression)):
+        supported = [name for name in SUFFIXES if available(name)]
+        return jsonify({'error': f'Unsupported compression. Use one of: {", ".join(supported)}'}), 400
+
+    try:
+        #paths are relative to the working directory, send_file resolves them against the app root
+        cleaned_file = os.path.abspath(data['cleaned_file'])
+
+        #create download filename, without the suffix of a compressed upload
+        download_filename = f"cleaned_{split_compression(data['original_filename'])[0]}"
+
+        if compression:
+            return send_file(
+                compressed_copy(cleaned_file, compression),
+                mimetype=MIMETYPES[compression],
+                as_attachment=True,
+                download_name=download_filename + SUFFIXES[compression]
+            )
+
+        encoding = request.accept_encodings.best_match([name for name in SUFFIXES if available(name)])
+        if encoding:
+            response = send_file(
+                compressed_copy(cleaned_file, encoding),
+                mimetype='text/csv',
+                as_attachment=True,
+                download_name=download_filename
+            )
+            response.headers['Content-Encoding'] = encoding
+        else:
+            response = send_file(
+                cleaned_file,
+                mimetype='text/csv',
+                as_attachment=True,
+                download_name=download_filename
+            )
+        response.vary.add('Accept-Encoding')
+        return response
 
     except Exception as e:
         return jsonify({'error': f'Error downloading file: {str(e)}'}), 500
@@ -140,47 +300,13 @@ def download_cleaned_file(session_id):
 def cleanup_session(session_id):
     """Clean up uploaded and processed files"""
 
-    if session_id not in processed_data_store:
-        return jsonify({'message': 'Session not found'}), 404
-
     try:
-        data = processed_data_store[session_id]
-
-        #remove files
-        if os.path.exists(data['original_file']):
-            os.remove(data['original_file'])
-        if os.path.exists(data['cleaned_file']):
-            os.remove(data['cleaned_file'])
-
-        #remove from store
-        del processed_data_store[session_id]
+        #remove files and the session itself
+        if not session_store.delete(session_id):
+            return jsonify({'message': 'Session not found'}), 404
 
         return jsonify({'message': 'Session cleaned up successfully'}), 200
 
     except Exception as e:
         return jsonify({'error': f'Error cleaning up: {str(e)}'}), 500
 
-
-@api_bp.route('/health', methods=['GET'])
-def health_check():
-    """Health check endpoint"""
-    return jsonify({
-        'status': 'healthy',
-        'message': 'CSV Analyzer API is running'
-    }), 200
-
-
-def _clean_for_json(data):
-    """Clean data for JSON serialization (handle NaN, infinity, etc.)"""
-    import math
-
-    if isinstance(data, list):
-        return [_clean_for_json(item) for item in data]
-    elif isinstance(data, dict):
-        return {key: _clean_for_json(value) for key, value in data.items()}
-    elif isinstance(data, float):
-        if math.isnan(data) or math.isinf(data):
-            return None
-        return data
-    else:
-        return data
@@ -0,0 +1,88 @@
+import numpy as np
+import pandas as pd
+from backend.scripts.json_provider import column_values
+
+#each function takes the same arguments as the chart_renderer function of the
+#same chart and returns the aggregates it draws, for the frontend to plot itself
+
+
+def distribution_data(column, histogram, box_stats):
+    """Histogram bins and the box plot's five-number summary, mean and outliers"""
+    counts, bins = histogram
+    return {
+        'histogram': {'bin_edges': bins, 'counts': counts},
+        'box': {
+            'whisker_low': float(box_stats['whislo']),
+            'q1': float(box_stats['q1']),
+            'median': float(box_stats['med']),
+            'q3': float(box_stats['q3']),
+            'whisker_high': float(box_stats['whishi']),
+            'mean': float(box_stats['mean']),
+            'outliers': np.asarray(box_stats['fliers'], dtype=np.float64)
+        }
+    }
+
+
+def correlation_heatmap_data(corr_matrix):
+    """Column names and the correlation matrix as rows (missing correlations as null)"""
+    return {
+        'columns': corr_matrix.columns.tolist(),
+        'matrix': corr_matrix.to_numpy(dtype=np.float64).round(4)
+    }
+
+
+def categorical_data(column, value_counts):
+    """Top categories and their counts, most common first"""
+    return {
+        'labels': [str(label) for label in value_counts.index],
+        'counts': value_counts.to_numpy()
+    }
+
+
+def time_series_data(date_col, num_col, dates, values):
+    """The already reduced series as ISO 8601 dates and values"""
+    return {
+        'x': column_values(pd.Series(dates)),
+        'y': values
+    }
+
+
+def scatter_data(col1, col2, x, y, corr, trend, x_range, sampling=None, density=None):
+    """
+    Scatter points, or for very many points the non-empty cells of the
+    density grid as [x bin, y bin, count], plus the trend line fitted on
+    all rows.
+    """
+    data = {
+        'correlation': round(corr, 4),
+        'trend': {'slope': float(trend[0]), 'intercept': float(trend[1])},
+        'x_range': [float(value) for value in x_range]
+    }
+
+    if density is not None:
+        counts, x_edges, y_edges = density
+        x_bins, y_bins = np.nonzero(counts)
+        data['density'] = {
+            'x_edges': x_edges,
+            'y_edges': y_edges,
+            'cells': np.column_stack([x_bins, y_bins, counts[x_bins, y_bins]]).astype(np.int64)
+        }
+    else:
+        data['x'] = x
+        data['y'] = y
+
+    return data
+
+
+BUILDERS = {
+    'render_distribution': distribution_data,
+    'render_correlation_heatmap': correlation_heatmap_data,
+    'render_categorical': categorical_data,
+    'render_time_series': time_series_data,
+    'render_scatter': scatter_data
+}
+
+
+def chart_data(func, args):
+    """Aggregates for the chart a render job would draw"""
+    return BUILDERS[func.__name__](*args)
@@ -0,0 +1,436 @@
+import io
+import os
+import time
+import queue
+import base64
+import threading
+import multiprocessing
+from collections import deque
+from multiprocessing import connection
+import numpy as np
+from backend.config.config import Config
+from backend.scripts.metrics import metrics
+
+#chart functions build their own Figure objects (no pyplot state), so they
+#are safe to run in worker processes and in any thread. matplotlib and
+#seaborn are imported on first use so importing this module stays cheap;
+#every chart is drawn inside chart_style(), which loads them
+
+_style = None
+
+
+def chart_style():
+    """
+    Context that applies the plotting style used by every chart, leaving
+    the process-wide matplotlib defaults untouched outside it
+    """
+    global _style
+    import matplotlib
+    matplotlib.use('Agg')  #Non-interactive backend
+    if _style is None:
+        import seaborn as sns
+        _style = {**sns.axes_style('whitegrid'), 'figure.figsize': (10, 6)}
+    return matplotlib.rc_context(_style)
+
+
+def preload():
+    """
+    Import the plotting libraries and build matplotlib's font cache by
+    drawing a tiny chart, so the first real chart doesn't pay for them.
+    Runs in each render worker as it starts and in the server warmup.
+    """
+    from matplotlib.figure import Figure
+    with chart_style():
+        fig = Figure(figsize=(1, 1))
+        fig.subplots().set_title('warmup')
+        fig_to_png(fig)
+
+
+def fig_to_png(fig):
+    """Convert matplotlib figure to PNG bytes"""
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format='png', dpi=100, bbox_inches='tight')
+    return buffer.getvalue()
+
+
+def png_to_base64(png):
+    """Base64 text of PNG bytes, for embedding a chart in a JSON response"""
+    return base64.b64encode(png).decode('utf-8')
+
+
+def render_distribution(column, histogram, box_stats):
+    """Histogram and box plot for a numeric column from precomputed bins and box statistics"""
+    from matplotlib.figure import Figure
+    counts, bins = histogram
+    fig = Figure(figsize=(14, 5))
+    ax1, ax2 = fig.subplots(1, 2)
+
+    #Histogram
+    ax1.hist(bins[:-1], bins=bins, weights=counts, color='skyblue', edgecolor='black', alpha=0.7)
+    ax1.set_xlabel(column)
+    ax1.set_ylabel('Frequency')
+    ax1.set_title(f'Distribution of {column}')
+    ax1.grid(True, alpha=0.3)
+
+    #Box plot
+    ax2.bxp([box_stats], vert=True)
+    ax2.set_ylabel(column)
+    ax2.set_title(f'Box Plot of {column}')
+    ax2.grid(True, alpha=0.3)
+
+    fig.tight_layout()
+
+    return fig_to_png(fig)
+
+
+def render_correlation_heatmap(corr_matrix):
+    """
+    Heatmap of a correlation matrix: annotated cells for small matrices,
+    otherwise the matrix drawn as one image so render time stays bounded
+    """
+    from matplotlib.figure import Figure
+    import seaborn as sns
+    fig = Figure(figsize=(12, 10))
+    ax = fig.subplots()
+
+    size = len(corr_matrix.columns)
+    if size <= Config.HEATMAP_ANNOTATE_MAX:
+        sns.heatmap(
+            corr_matrix,
+            annot=True,
+            fmt='.2f',
+            cmap='coolwarm',
+            center=0,
+            square=True,
+            linewidths=1,
+            cbar_kws={"shrink": 0.8},
+            ax=ax
+        )
+    else:
+        image = ax.imshow(
+            corr_matrix.to_numpy(dtype=np.float64),
+            cmap='coolwarm',
+            vmin=-1,
+            vmax=1,
+            interpolation='nearest'
+        )
+        fig.colorbar(image, ax=ax, shrink=0.8)
+
+        #shrink labels with the matrix so they stay readable without overlapping
+        fontsize = max(4, min(10, 400 // size))
+        ticks = np.arange(size)
+        ax.set_xticks(ticks, [str(column) for column in corr_matrix.columns], rotation=90, fontsize=fontsize)
+        ax.set_yticks(ticks, [str(column) for column in corr_matrix.index], fontsize=fontsize)
+        ax.grid(False)
+
+    ax.set_title('Correlation Heatmap', fontsize=16, fontweight='bold')
+    fig.tight_layout()
+
+    return fig_to_png(fig)
+
+
+def render_categorical(column, value_counts):
+    """Bar chart and pie chart of the top categories"""
+    from matplotlib.figure import Figure
+    import seaborn as sns
+    fig = Figure(figsize=(16, 6))
+    ax1, ax2 = fig.subplots(1, 2)
+
+    #Bar chart
+    value_counts.plot(kind='bar', ax=ax1, color='steelblue', edgecolor='black')
+    ax1.set_xlabel(column)
+    ax1.set_ylabel('Count')
+    ax1.set_title(f'Top Categories in {column}')
+    ax1.tick_params(axis='x', rotation=45)
+    ax1.grid(True, alpha=0.3)
+
+    #Pie chart (top 8 only for readability)
+    top_8 = value_counts.head(8)
+    if len(value_counts) > 8:
+        other_sum = value_counts.iloc[8:].sum()
+        top_8['Other'] = other_sum
+
+    colors = sns.color_palette('pastel')[0:len(top_8)]
+    ax2.pie(
+        top_8.values,
+        labels=top_8.index,
+        autopct='%1.1f%%',
+        startangle=90,
+        colors=colors
+    )
+    ax2.set_title(f'Distribution of {column}')
+
+    fig.tight_layout()
+
+    return fig_to_png(fig)
+
+
+def render_time_series(date_col, num_col, dates, values):
+    """Line chart of a numeric column over a date column (already sorted)"""
+    from matplotlib.figure import Figure
+    fig = Figure(figsize=(14, 6))
+    ax = fig.subplots()
+
+    #markers only help while individual points are distinguishable
+    show_markers = len(values) <= Config.MAX_MARKERS
+    ax.plot(
+        dates,
+        values,
+        marker='o' if show_markers else None,
+        linestyle='-',
+        linewidth=2 if show_markers else 1,
+        markersize=4,
+        color='steelblue'
+    )
+
+    ax.set_xlabel(date_col, fontsize=12)
+    ax.set_ylabel(num_col, fontsize=12)
+    ax.set_title(f'{num_col} over {date_col}', fontsize=14, fontweight='bold')
+    ax.grid(True, alpha=0.3)
+    ax.tick_params(axis='x', labelrotation=45)
+    fig.tight_layout()
+
+    return fig_to_png(fig)
+
+
+def render_scatter(col1, col2, x, y, corr, trend, x_range, sampling=None, density=None):
+    """
+    Scatter plot with a linear trend line; for very many points a
+    precomputed density grid (counts, x edges, y edges) is drawn instead
+    """
+    from matplotlib.figure import Figure
+    fig = Figure(figsize=(10, 8))
+    ax = fig.subplots()
+
+    if density is not None:
+        counts, x_edges, y_edges = density
+        #empty cells are left blank
+        mesh = ax.pcolormesh(x_edges, y_edges, np.ma.masked_equal(counts, 0).T, cmap='Blues')
+        fig.colorbar(mesh, ax=ax, label='Count')
+    else:
+        #Scatter plot; edges only while points are few enough to tell apart
+        ax.scatter(
+            x,
+            y,
+            alpha=0.5,
+            color='steelblue',
+            edgecolors='black' if sampling is None else 'none',
+            linewidth=0.5
+        )
+
+    #Trend line fitted on all rows, drawn across the x range
+    p = np.poly1d(trend)
+    x_range = np.array(x_range)
+    ax.plot(
+        x_range,
+        p(x_range),
+        "r--",
+        alpha=0.8,
+        linewidth=2,
+        label='Trend line'
+    )
+
+    ax.set_xlabel(col1, fontsize=12)
+    ax.set_ylabel(col2, fontsize=12)
+    ax.set_title(
+        f'{col1} vs {col2} (r={corr:.2f})',
+        fontsize=14,
+        fontweight='bold'
+    )
+    ax.legend()
+    ax.grid(True, alpha=0.3)
+    fig.tight_layout()
+
+    return fig_to_png(fig)
+
+
+def _timed(func, args):
+    """Run a chart function in the chart style, returning its PNG and the seconds it took"""
+    start = time.perf_counter()
+    with chart_style():
+        png = func(*args)
+    return png, time.perf_counter() - start
+
+
+def _record(func, seconds):
+    #render_distribution -> distribution
+    metrics.observe('chart_render_seconds', seconds, chart=func.__name__.replace('render_', '', 1))
+
+
+def _serve(conn):
+    """Worker process loop: render (function, args) jobs sent over the pipe until it closes"""
+    preload()
+    conn.send(('ready', None))
+    while True:
+        try:
+            func, args = conn.recv()
+        except EOFError:
+            return
+        try:
+            conn.send(('ok', _timed(func, args)))
+        except Exception as e:
+            conn.send(('error', f'{type(e).__name__}: {e}'))
+
+
+class _Worker:
+    """One render process and the pipe it takes jobs from"""
+
+    def __init__(self, context):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(target=_serve, args=(child_conn,), daemon=True)
+        self.process.start()
+        child_conn.close()
+
+    def wait_ready(self):
+        self.conn.recv()
+
+    def kill(self):
+        self.process.kill()
+        self.process.join()
+        self.conn.close()
+
+
+class _WorkerPool:
+    """
+    Render processes shared by all requests in this process. Requests
+    check workers out while they render; a worker stuck on a chart is
+    killed and replaced on its own, so charts other requests have in
+    flight keep running.
+    """
+
+    def __init__(self, workers):
+        self.context = multiprocessing.get_context(Config.CHART_START_METHOD)
+        if Config.CHART_START_METHOD == 'forkserver':
+            #the fork server imports the plotting libraries once and every worker is forked
+            #from it with them loaded, instead of each spawned worker importing them again
+            self.context.set_forkserver_preload(PRELOAD_MODULES)
+        self.idle = queue.Queue()
+        self.pid = os.getpid()
+
+        #start workers together and wait for them, so their import time doesn't count against chart timeouts
+        started = [_Worker(self.context) for _ in range(workers)]
+        for worker in started:
+            worker.wait_ready()
+            self.idle.put(worker)
+
+    def acquire(self, timeout):
+        """An idle worker, or None if none frees up within the timeout (0 doesn't wait)"""
+        try:
+            if timeout <= 0:
+                return self.idle.get_nowait()
+            return self.idle.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def release(self, worker):
+        self.idle.put(worker)
+
+    def replace(self, worker):
+        """Kill a stuck or broken worker and start a fresh one in the background"""
+        worker.kill()
+        threading.Thread(target=self._start_worker, name='chart-worker-start', daemon=True).start()
+
+    def _start_worker(self):
+        try:
+            worker = _Worker(self.context)
+            worker.wait_ready()
+        except Exception as e:
+            print(f"Error starting chart worker: {e!r}")
+            return
+        self.idle.put(worker)
+
+
+#imported by the fork server before it forks render workers
+PRELOAD_MODULES = ['matplotlib.figure', 'seaborn', 'backend.scripts.chart_renderer']
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool(workers):
+    global _pool
+    with _pool_lock:
+        #a forked process can't use its parent's workers
+        if _pool is None or _pool.pid != os.getpid():
+            _pool = _WorkerPool(workers)
+        return _pool
+
+
+class ChartRenderer:
+    """Render chart jobs in a shared worker process pool, within one deadline per batch"""
+
+    def __init__(self, workers=None, timeout=None):
+        self.workers = Config.CHART_WORKERS if workers is None else workers
+        self.timeout = timeout or Config.CHART_TIMEOUT
+
+    def render(self, jobs):
+        """
+        Render (label, function, args) jobs.
+        Returns the PNG bytes of each chart in job order, with None for
+        charts that failed or weren't done within the timeout.
+        """
+        if self.workers <= 1:
+            return [self._render_inline(label, func, args) for label, func, args in jobs]
+
+        pool = _get_pool(self.workers)
+        deadline = time.monotonic() + self.timeout
+        waiting = deque(enumerate(jobs))
+        running = {}  #pipe -> (worker, job index)
+        results = [None] * len(jobs)
+
+        while waiting or running:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+
+            #hand out jobs to idle workers; block for one only when nothing of ours is running
+            while waiting:
+                worker = pool.acquire(0 if running else remaining)
+                if worker is None:
+                    break
+                index, (label, func, args) = waiting.popleft()
+                try:
+                    worker.conn.send((func, args))
+                except (OSError, ValueError) as e:
+                    print(f"Error sending {label} to a chart worker: {e}")
+                    pool.replace(worker)
+                    continue
+                running[worker.conn] = (worker, index)
+
+            if not running:
+                continue
+
+            for conn in connection.wait(list(running), timeout=max(deadline - time.monotonic(), 0)):
+                worker, index = running.pop(conn)
+                label, func, _ = jobs[index]
+                try:
+                    status, value = conn.recv()
+                except (EOFError, OSError):
+                    print(f"Chart worker exited while rendering {label}")
+                    pool.replace(worker)
+                    continue
+
+                pool.release(worker)
+                if status == 'ok':
+                    png, seconds = value
+                    _record(func, seconds)
+                    results[index] = png
+                else:
+                    print(f"Error creating {label}: {value}")
+
+        for worker, index in running.values():
+            print(f"Timed out rendering {jobs[index][0]} after {self.timeout}s")
+            pool.replace(worker)
+        for index, (label, _, _) in waiting:
+            print(f"Skipped {label}: chart timeout of {self.timeout}s reached")
+
+        return results
+
+    def _render_inline(self, label, func, args):
+        try:
+            png, seconds = _timed(func, args)
+            _record(func, seconds)
+            return png
+        except Exception as e:
+            print(f"Error creating {label}: {e}")
+            return None
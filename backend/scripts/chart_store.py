@@ -0,0 +1,98 @@
+import os
+import re
+import uuid
+import pickle
+import shutil
+import hashlib
+from backend.config.config import Config
+from backend.scripts.result_cache import ResultCache
+
+
+class ChartStore:
+    """
+    One session's charts, saved as render specs (the chart function and
+    the summarized data it draws) when the upload is processed. Each PNG
+    is rendered on its first request and then served from disk. The spec
+    hash is the chart's ETag, so revalidating a chart never renders it.
+    """
+
+    SPEC_EXTENSION = '.chart'
+    IMAGE_EXTENSION = '.png'
+    CHART_ID = re.compile(r'[a-z0-9_]+')
+
+    def __init__(self, folder):
+        self.folder = folder
+
+    @classmethod
+    def for_session(cls, cleaned_file):
+        """The store kept next to a session's cleaned CSV"""
+        return cls(os.path.splitext(cleaned_file)[0] + '_charts')
+
+    def save(self, chart_id, label, func, args):
+        """Save a chart's render spec and return its ETag"""
+        spec = pickle.dumps((label, func, args), protocol=pickle.HIGHEST_PROTOCOL)
+        etag = hashlib.sha256(Config.PIPELINE_VERSION.encode('utf-8') + spec).hexdigest()[:32]
+
+        os.makedirs(self.folder, exist_ok=True)
+        self._write(self._path(chart_id, self.SPEC_EXTENSION), pickle.dumps((etag, spec)))
+        return etag
+
+    def etag(self, chart_id):
+        """ETag of a saved chart, or None if the session has no such chart"""
+        saved = self._load(chart_id)
+        return saved[0] if saved else None
+
+    def image_path(self, chart_id, renderer=None):
+        """
+        Path of the chart's PNG, rendering it first if this is its first
+        request. None if the chart doesn't exist or failed to render.
+        """
+        image_path = self._path(chart_id, self.IMAGE_EXTENSION)
+        if image_path is None or os.path.exists(image_path):
+            return image_path
+
+        saved = self._load(chart_id)
+        if saved is None:
+            return None
+
+        #imported here so session cleanup doesn't load matplotlib
+        from backend.scripts.chart_renderer import ChartRenderer
+
+        label, func, args = pickle.loads(saved[1])
+        png = (renderer or ChartRenderer()).render([(label, func, args)])[0]
+        if png is None:
+            return None
+
+        self._write(image_path, png)
+        return image_path
+
+    def copy_to(self, other):
+        """Hard-link (or copy) every spec and rendered image into another store"""
+        os.makedirs(other.folder, exist_ok=True)
+        for name in os.listdir(self.folder):
+            if name.endswith((self.SPEC_EXTENSION, self.IMAGE_EXTENSION)):
+                ResultCache.link_or_copy(os.path.join(self.folder, name), os.path.join(other.folder, name))
+
+    def remove(self):
+        shutil.rmtree(self.folder, ignore_errors=True)
+
+    def _path(self, chart_id, extension):
+        #chart ids come from URLs; only the ids this class hands out are valid
+        if not self.CHART_ID.fullmatch(chart_id):
+            return None
+        return os.path.join(self.folder, chart_id + extension)
+
+    def _load(self, chart_id):
+        path = self._path(chart_id, self.SPEC_EXTENSION)
+        if path is None or not os.path.exists(path):
+            return None
+        with open(path, 'rb') as f:
+            return pickle.load(f)
+
+    @staticmethod
+    def _write(path, data):
+        #unique temporary name so concurrent first requests never share a partial file
+        temp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        with open(temp_path, 'wb') as f:
+            f.write(data)
+        os.replace(temp_path, path)
@@ -0,0 +1,162 @@
+import numpy as np
+import pandas as pd
+from functools import cached_property
+from backend.config.config import Config
+from backend.scripts.sketches import ColumnSketch
+from backend.scripts.duplicate_detector import DuplicateDetector
+from backend.scripts.correlation import CorrelationMatrix
+
+
+class ColumnProfile:
+    """Cached metrics for a single column"""
+
+    def __init__(self, name, dtype, row_count, null_count, unique_count, value_counts=None,
+                 unique_error=0.0, value_counts_error=0):
+        self.name = name
+        self.dtype = dtype
+        self.row_count = row_count
+        self.null_count = null_count
+        self.non_null_count = row_count - null_count
+        self.unique_count = unique_count
+        self.value_counts = value_counts
+
+        #error bounds when the counts come from sketches
+        self.unique_error = unique_error  #relative standard error
+        self.value_counts_error = value_counts_error  #max overcount per value
+
+    @property
+    def approximate(self):
+        return self.unique_error > 0 or self.value_counts_error > 0
+
+    @property
+    def missing_percentage(self):
+        return (self.null_count / self.row_count) * 100 if self.row_count > 0 else 0
+
+    @property
+    def uniqueness_ratio(self):
+        return self.unique_count / self.row_count if self.row_count > 0 else 0
+
+    @property
+    def all_unique(self):
+        """Every row holds a distinct value (within the sketch error when approximate)"""
+        if self.row_count == 0:
+            return False
+        if not self.unique_error:
+            return self.unique_count == self.row_count
+        return self.unique_count >= self.row_count * (1 - 3 * self.unique_error)
+
+    @property
+    def mode(self):
+        """Most frequent value, smallest first on ties (as Series.mode)"""
+        if self.value_counts is None or self.value_counts.empty:
+            return None
+        top = self.value_counts.index[self.value_counts.values == self.value_counts.iloc[0]]
+        try:
+            return min(top)
+        except TypeError:
+            return top[0]
+
+
+class DataProfile:
+    """
+    Column metrics computed once per DataFrame.
+    Null counts and unique counts are computed for all columns together and
+    value counts once per categorical column, then shared by every
+    DataAnalyzer section and by DataVisualizer. In 'sketch' mode unique
+    counts and most common values come from mergeable sketches instead.
+    """
+
+    MODES = ('exact', 'sketch')
+
+    def __init__(self, df, mode='exact', duplicate_rows=None):
+        self.df = df
+        self.mode = mode
+        if duplicate_rows is not None:
+            #already found by DataCleaner, so duplicate_rows never rehashes the frame
+            self.__dict__['duplicate_rows'] = duplicate_rows
+        self.row_count = len(df)
+        self.numeric_columns = df.select_dtypes(include=[np.number]).columns
+        self.categorical_columns = df.select_dtypes(include=['object', 'category']).columns
+        self.datetime_columns = df.select_dtypes(include=['datetime64']).columns
+
+        null_counts = df.isnull().sum()
+
+        if mode == 'sketch':
+            self._build_from_sketches(null_counts)
+            return
+
+        #value counts double as the unique count for categorical columns
+        value_counts = {column: self._count_values(df[column]) for column in self.categorical_columns}
+        other_columns = df.columns.difference(self.categorical_columns, sort=False)
+        unique_counts = df[other_columns].nunique() if len(other_columns) else pd.Series(dtype='int64')
+
+        self.columns = {}
+        for column in df.columns:
+            counts = value_counts.get(column)
+            self.columns[column] = ColumnProfile(
+                name=column,
+                dtype=df[column].dtype,
+                row_count=self.row_count,
+                null_count=int(null_counts[column]),
+                unique_count=len(counts) if counts is not None else int(unique_counts[column]),
+                value_counts=counts
+            )
+
+    def _build_from_sketches(self, null_counts):
+        """Feed each column to a ColumnSketch chunk by chunk"""
+        self.columns = {}
+        for column in self.df.columns:
+            sketch = ColumnSketch()
+            for start in range(0, self.row_count, Config.CHUNK_SIZE):
+                sketch.update(self.df[column].iloc[start:start + Config.CHUNK_SIZE])
+
+            self.columns[column] = ColumnProfile(
+                name=column,
+                dtype=self.df[column].dtype,
+                row_count=self.row_count,
+                null_count=int(null_counts[column]),
+                unique_count=min(sketch.distinct_count(), self.row_count - int(null_counts[column])),
+                value_counts=sketch.heavy_hitters.top(),
+                unique_error=sketch.distinct_error,
+                value_counts_error=sketch.heavy_hitters.floor
+            )
+
+    @property
+    def approximate(self):
+        return any(profile.approximate for profile in self.columns.values())
+
+    def __getitem__(self, column):
+        return self.columns[column]
+
+    @property
+    def total_cells(self):
+        return self.df.shape[0] * self.df.shape[1]
+
+    @property
+    def missing_cells(self):
+        return sum(profile.null_count for profile in self.columns.values())
+
+    @cached_property
+    def duplicate_rows(self):
+        _, detector = DuplicateDetector.find(self.df)
+        return detector.duplicate_count
+
+    @cached_property
+    def correlations(self):
+        """Correlation matrix of the numeric columns, computed on first use"""
+        return CorrelationMatrix(self.df[self.numeric_columns], method=Config.CORRELATION_METHOD)
+
+    def value_counts(self, column):
+        """Value counts for any column, computed on first use"""
+        profile = self.columns[column]
+        if profile.value_counts is None:
+            profile.value_counts = self._count_values(self.df[column])
+        return profile.value_counts
+
+    @staticmethod
+    def _count_values(values):
+        """value_counts without the zero counts categorical columns report for unused categories"""
+        counts = values.value_counts()
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            counts = counts[counts > 0]
+        return counts
@@ -0,0 +1,53 @@
+import os
+import pandas as pd
+import pyarrow as pa
+
+
+#cleaned data is kept as uncompressed Arrow IPC so it can be memory-mapped
+DATA_EXTENSION = '.arrow'
+
+
+def save_columnar(df, path):
+    """
+    Write a DataFrame as an Arrow IPC file.
+    Returns False (and writes nothing) if a column can't be represented in
+    Arrow, e.g. an object column mixing strings and numbers; callers then
+    fall back to the CSV copy.
+    """
+    try:
+        table = pa.Table.from_pandas(df, preserve_index=False)
+    except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError) as e:
+        print(f"Skipping columnar copy of {path}: {e}")
+        return False
+
+    temp_path = f"{path}.tmp"
+    with pa.OSFile(temp_path, 'wb') as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    os.replace(temp_path, path)
+    return True
+
+
+def load_columnar(path, columns=None):
+    """
+    Load a columnar data file, reading only the requested columns.
+    Arrow files are memory-mapped so unused columns are never paged in;
+    Parquet files from older sessions are read with column pruning.
+    """
+    if not path.endswith(DATA_EXTENSION):
+        return pd.read_parquet(path, columns=columns)
+
+    #the map stays open while the returned frame may still reference its buffers
+    table = pa.ipc.open_file(pa.memory_map(path, 'r')).read_all()
+    if columns is not None:
+        table = table.select(columns)
+    #split_blocks avoids consolidating columns into one large copy
+    return table.to_pandas(split_blocks=True)
+
+
+def columnar_columns(path):
+    """Column names of a columnar data file, read from its schema alone"""
+    if not path.endswith(DATA_EXTENSION):
+        import pyarrow.parquet as pq
+        return pq.read_schema(path).names
+    return pa.ipc.open_file(pa.memory_map(path, 'r')).schema.names
@@ -0,0 +1,150 @@
+import io
+import os
+import gzip
+import uuid
+import zlib
+import shutil
+from backend.config.config import Config
+
+try:
+    import zstandard
+except ImportError:  #optional; .zst files are refused without it
+    zstandard = None
+
+
+#file suffix for each supported compression, preferred first when negotiating Accept-Encoding
+SUFFIXES = {'zstd': '.zst', 'gzip': '.gz'}
+MIMETYPES = {'zstd': 'application/zstd', 'gzip': 'application/gzip'}
+
+#levels for compressed downloads, chosen for speed over size
+GZIP_LEVEL = 6
+ZSTD_LEVEL = 3
+
+
+class DecompressionError(Exception):
+    """Raised when a compressed file is corrupt, unsupported or expands too far"""
+
+
+def available(compression):
+    """Whether this server can read and write the given compression"""
+    return compression == 'gzip' or (compression == 'zstd' and zstandard is not None)
+
+
+def split_compression(filename):
+    """Split 'data.csv.gz' into ('data.csv', 'gzip'); uncompressed names give (filename, None)"""
+    for compression, suffix in SUFFIXES.items():
+        if filename.lower().endswith(suffix):
+            return filename[:-len(suffix)], compression
+    return filename, None
+
+
+def _read_errors():
+    errors = (OSError, EOFError, zlib.error)
+    if zstandard is not None:
+        errors += (zstandard.ZstdError,)
+    return errors
+
+
+def decompress_head(data, compression, limit):
+    """Up to `limit` leading bytes of a compressed stream that may still be incomplete"""
+    if not available(compression):
+        raise DecompressionError(f"{compression} files are not supported on this server")
+
+    try:
+        if compression == 'gzip':
+            #max_length bounds the output however far the input expands
+            return zlib.decompressobj(wbits=31).decompress(data, limit)
+
+        reader = zstandard.ZstdDecompressor().stream_reader(io.BytesIO(data))
+        head = bytearray()
+        while len(head) < limit:
+            block = reader.read(limit - len(head))
+            if not block:
+                break
+            head += block
+        return bytes(head)
+    except _read_errors():
+        raise DecompressionError("Compressed file is corrupted")
+
+
+class DecompressingReader(io.RawIOBase):
+    """
+    Decompressed view of a .gz or .zst file for the CSV parser. Stops with
+    DecompressionError once the output outgrows max_ratio times the
+    compressed bytes read so far, so a decompression bomb fails after a
+    few megabytes instead of filling memory or disk.
+    """
+
+    def __init__(self, path, compression, max_ratio=None):
+        if not available(compression):
+            raise DecompressionError(f"{compression} files are not supported on this server")
+
+        self.max_ratio = max_ratio or Config.MAX_DECOMPRESSION_RATIO
+        self.output_bytes = 0
+
+        self._raw = open(path, 'rb')
+        if compression == 'gzip':
+            self._reader = gzip.GzipFile(fileobj=self._raw, mode='rb')
+        else:
+            self._reader = zstandard.ZstdDecompressor().stream_reader(self._raw, read_across_frames=True)
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        try:
+            data = self._reader.read(len(buffer))
+        except _read_errors():
+            raise DecompressionError("Compressed file is corrupted or truncated")
+
+        size = len(data)
+        buffer[:size] = data
+        self.output_bytes += size
+
+        #small outputs are exempt; a few bytes of header can legitimately expand a lot
+        if self.output_bytes > Config.SNIFF_BYTES and self.output_bytes > self.max_ratio * self._raw.tell():
+            raise DecompressionError(
+                f"File expands more than {self.max_ratio}x when decompressed"
+            )
+        return size
+
+    def close(self):
+        if not self.closed:
+            self._reader.close()
+            self._raw.close()
+        super().close()
+
+
+def open_decompressed(path, compression, max_ratio=None):
+    """Buffered binary reader over the decompressed contents of path"""
+    return io.BufferedReader(DecompressingReader(path, compression, max_ratio), buffer_size=1024 * 1024)
+
+
+def compressed_copy(path, compression):
+    """
+    Path of a compressed copy of `path`, written next to it on first use
+    and reused until the source changes.
+    """
+    target = path + SUFFIXES[compression]
+    if os.path.exists(target) and os.path.getmtime(target) >= os.path.getmtime(path):
+        return target
+
+    #unique temporary name so concurrent requests never share a partial file
+    temp_path = f"{target}.{uuid.uuid4().hex}.tmp"
+    try:
+        with open(path, 'rb') as source, open(temp_path, 'wb') as raw:
+            if compression == 'gzip':
+                with gzip.GzipFile(fileobj=raw, mode='wb', compresslevel=GZIP_LEVEL) as target_file:
+                    shutil.copyfileobj(source, target_file, 1024 * 1024)
+            else:
+                zstandard.ZstdCompressor(level=ZSTD_LEVEL).copy_stream(source, raw)
+        os.replace(temp_path, target)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+    return target
+
+
+def compressed_copies(path):
+    """Paths compressed_copy may have written for path"""
+    return [path + suffix for suffix in SUFFIXES.values()]
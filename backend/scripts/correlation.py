@@ -0,0 +1,112 @@
+import warnings
+import numpy as np
+import pandas as pd
+
+
+class CorrelationMatrix:
+    """
+    Correlation matrix of a DataFrame's numeric columns, computed once with
+    NumPy matrix products and shared by DataAnalyzer and DataVisualizer.
+    Missing values are handled pairwise (each pair uses the rows where both
+    columns are present), as DataFrame.corr does. 'spearman' correlates
+    ranks; with missing values each column is ranked over its present
+    values rather than re-ranked for every pair.
+    """
+
+    METHODS = ('pearson', 'spearman')
+
+    def __init__(self, df, method='pearson'):
+        self.columns = df.columns
+        self.method = method
+
+        values = df.to_numpy(dtype=np.float64, na_value=np.nan)
+        if method == 'spearman':
+            values = df.rank(method='average').to_numpy(dtype=np.float64, na_value=np.nan)
+        self.matrix = self._correlate(values)
+
+    @property
+    def frame(self):
+        return pd.DataFrame(self.matrix, index=self.columns, columns=self.columns)
+
+    def pairs(self, threshold=0.0, top_k=None):
+        """
+        (column1, column2, correlation) for each pair above the threshold in
+        absolute value, taken from the upper triangle. In matrix order, or
+        with top_k the strongest pairs first (ties in matrix order).
+        """
+        rows, cols = np.triu_indices(len(self.columns), k=1)
+        values = self.matrix[rows, cols]
+        strength = np.abs(values)
+
+        #NaN correlations (constant columns, too few shared rows) never qualify
+        selected = np.flatnonzero(strength > threshold)
+        if top_k is not None:
+            order = np.argsort(-strength[selected], kind='stable')
+            selected = selected[order[:top_k]]
+
+        return [
+            (self.columns[rows[index]], self.columns[cols[index]], float(values[index]))
+            for index in selected
+        ]
+
+    def clustered(self, limit):
+        """
+        Frame of the `limit` columns most strongly correlated with any other
+        column, ordered by average-linkage clustering on 1 - |r| so related
+        columns sit next to each other.
+        """
+        from scipy.cluster.hierarchy import linkage, leaves_list
+        from scipy.spatial.distance import squareform
+
+        strength = np.nan_to_num(np.abs(self.matrix), nan=0.0)
+        np.fill_diagonal(strength, 0.0)
+        keep = np.sort(np.argsort(-strength.max(axis=1), kind='stable')[:limit])
+
+        distance = 1.0 - strength[np.ix_(keep, keep)]
+        np.fill_diagonal(distance, 0.0)
+        keep = keep[leaves_list(linkage(squareform(distance, checks=False), method='average'))]
+
+        columns = self.columns[keep]
+        return pd.DataFrame(self.matrix[np.ix_(keep, keep)], index=columns, columns=columns)
+
+    @staticmethod
+    def _correlate(values):
+        """Pearson correlation of every pair of columns, over pairwise-complete rows"""
+        count = values.shape[1]
+        present = ~np.isnan(values)
+
+        #centring and scaling first keeps the raw-moment sums below well conditioned;
+        #constant (and empty) columns become all zeros so their correlations are NaN
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', RuntimeWarning)
+            low, high = np.nanmin(values, axis=0), np.nanmax(values, axis=0)
+            values = (values - np.nanmean(values, axis=0)) / np.where(high > low, high - low, np.inf)
+        values = np.where(present, values, 0.0)
+
+        if present.all():
+            products = values.T @ values
+            n = float(len(values))
+            sums = np.broadcast_to(values.sum(axis=0), (count, count))
+            squares = np.broadcast_to((values ** 2).sum(axis=0), (count, count))
+            shared = np.full((count, count), n)
+        else:
+            mask = present.astype(np.float64)
+            products = values.T @ values
+            shared = mask.T @ mask
+            #sums[i, j]: sum of column i over the rows where column j is present
+            sums = values.T @ mask
+            squares = (values ** 2).T @ mask
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            covariance = products - sums * sums.T / shared
+            variance = squares - sums ** 2 / shared
+            matrix = covariance / np.sqrt(variance * variance.T)
+        matrix[(variance <= 0) | (variance.T <= 0)] = np.nan
+
+        matrix[shared < 2] = np.nan
+        matrix = np.clip(matrix, -1.0, 1.0)
+
+        #a column correlates perfectly with itself unless it is constant
+        diagonal = np.diagonal(matrix).copy()
+        np.fill_diagonal(matrix, np.where(np.isnan(diagonal), np.nan, 1.0))
+        return matrix
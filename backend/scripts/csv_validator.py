@@ -2,13 +2,16 @@ import pandas as pd
 import os
 from werkzeug.utils import secure_filename
 from backend.config.config import Config
+from backend.scripts.data_loader import DataLoader, DataLoaderError
+from backend.scripts.compression import split_compression
 
 class CSVValidator:
     """Validates and sanitizes CSV files for security"""
 
     @staticmethod
     def allowed_file(filename):
-        """Check if file has allowed extension"""
+        """Check if file has allowed extension, optionally followed by .gz or .zst"""
+        filename = split_compression(filename)[0]
         return '.' in filename and \
                filename.rsplit('.', 1)[1].lower() in Config.ALLOWED_EXTENSIONS
 
@@ -19,18 +22,8 @@ class CSVValidator:
         Returns: (is_valid, error_message, dataframe)
         """
         try:
-            #read csv with security limits
-            df = pd.read_csv(
-                file_path,
-                nrows=Config.MAX_ROWS,
-                on_bad_lines='skip',  #skip malformed lines
-                engine='python',  #more secure than c engine
-                encoding='utf-8'
-            )
-
-            #check column count
-            if len(df.columns) > Config.MAX_COLUMNS:
-                return False, f"Too many columns. Maximum allowed: {Config.MAX_COLUMNS}", None
+            #read csv in bounded chunks with security limits
+            df = DataLoader(file_path).load()
 
             #check for empty dataframe
             if df.empty:
@@ -41,6 +34,8 @@ class CSVValidator:
 
             return True, None, df
 
+        except DataLoaderError as e:
+            return False, str(e), None
         except pd.errors.EmptyDataError:
             return False, "CSV file is empty or corrupted", None
         except pd.errors.ParserError:
@@ -1,13 +1,19 @@
 import pandas as pd
-import numpy as np
-from scipy import stats
 from collections import Counter
+from backend.scripts.column_profile import DataProfile
+from backend.scripts.stats_accumulator import StatsAccumulator
+
+#numeric statistics reported per column, besides count and outliers_count
+STATISTIC_KEYS = ['mean', 'median', 'std', 'min', 'max', 'q25', 'q75', 'skewness', 'kurtosis']
+
 
 class DataAnalyzer:
     """Comprehensive data analysis for CSV files"""
 
-    def __init__(self, df):
+    def __init__(self, df, profile=None):
         self.df = df
+        self.profile = profile or DataProfile(df)
+        self._accumulators = {}
 
     def analyze(self):
         """Perform complete analysis"""
@@ -21,8 +27,8 @@ class DataAnalyzer:
 
     def _analyze_data_quality(self):
         """Analyze data quality metrics"""
-        total_cells = self.df.shape[0] * self.df.shape[1]
-        missing_cells = self.df.isnull().sum().sum()
+        total_cells = self.profile.total_cells
+        missing_cells = self.profile.missing_cells
 
         quality_report = {
             'total_rows': int(self.df.shape[0]),
@@ -30,31 +36,34 @@ class DataAnalyzer:
             'total_cells': int(total_cells),
             'missing_cells': int(missing_cells),
             'completeness_score': round((1 - missing_cells / total_cells) * 100, 2) if total_cells > 0 else 0,
-            'duplicate_rows': int(self.df.duplicated().sum()),
+            'duplicate_rows': self.profile.duplicate_rows,
+            'profile_mode': self.profile.mode,
             'column_quality': []
         }
 
         #Per-column quality metrics
         for column in self.df.columns:
-            col_data = self.df[column]
-            missing_count = col_data.isnull().sum()
-            total_count = len(col_data)
+            col_profile = self.profile[column]
+            missing_count = col_profile.null_count
+            total_count = col_profile.row_count
 
             col_quality = {
                 'column': column,
-                'data_type': str(col_data.dtype),
+                'data_type': str(col_profile.dtype),
                 'missing_count': int(missing_count),
-                'missing_percentage': round((missing_count / total_count) * 100, 2) if total_count > 0 else 0,
-                'unique_values': int(col_data.nunique()),
-                'uniqueness_ratio': round(col_data.nunique() / total_count, 3) if total_count > 0 else 0
+                'missing_percentage': round(col_profile.missing_percentage, 2),
+                'unique_values': int(col_profile.unique_count),
+                'uniqueness_ratio': round(col_profile.uniqueness_ratio, 3)
             }
+            if col_profile.approximate:
+                col_quality['unique_values_error'] = round(col_profile.unique_error, 4)
 
             #Detect potential issues
             if missing_count > total_count * 0.5:
                 col_quality['warning'] = 'High missing value rate'
-            elif col_data.nunique() == 1:
+            elif col_profile.unique_count == 1:
                 col_quality['warning'] = 'All values are identical'
-            elif col_data.nunique() == total_count:
+            elif col_profile.all_unique:
                 col_quality['info'] = 'All values are unique (potential ID column)'
 
             quality_report['column_quality'].append(col_quality)
@@ -72,32 +81,32 @@ class DataAnalyzer:
             col_data = self.df[column]
 
             if pd.api.types.is_numeric_dtype(col_data):
-                #Numeric statistics
-                stats_summary['numeric_columns'].append({
-                    'column': column,
-                    'count': int(col_data.count()),
-                    'mean': float(col_data.mean()) if not col_data.empty else None,
-                    'median': float(col_data.median()) if not col_data.empty else None,
-                    'std': float(col_data.std()) if not col_data.empty else None,
-                    'min': float(col_data.min()) if not col_data.empty else None,
-                    'max': float(col_data.max()) if not col_data.empty else None,
-                    'q25': float(col_data.quantile(0.25)) if not col_data.empty else None,
-                    'q75': float(col_data.quantile(0.75)) if not col_data.empty else None,
-                    'skewness': float(col_data.skew()) if not col_data.empty else None,
-                    'kurtosis': float(col_data.kurtosis()) if not col_data.empty else None,
-                    'outliers_count': int(self._count_outliers(col_data))
-                })
+                #Numeric statistics from a single pass over the column
+                if col_data.empty:
+                    summary = {'count': 0, **dict.fromkeys(STATISTIC_KEYS), 'outliers_count': 0}
+                else:
+                    accumulator = self._numeric_accumulator(column)
+                    summary = accumulator.summary()
+                    if not accumulator.sketch.is_exact:
+                        summary['quantile_rank_error'] = round(accumulator.sketch.rank_error, 4)
+                stats_summary['numeric_columns'].append({'column': column, **summary})
             else:
                 #Categorical statistics
-                value_counts = col_data.value_counts().head(10)
+                col_profile = self.profile[column]
+                value_counts = self.profile.value_counts(column).head(10)
                 stats_summary['categorical_columns'].append({
                     'column': column,
-                    'count': int(col_data.count()),
-                    'unique_values': int(col_data.nunique()),
+                    'count': int(col_profile.non_null_count),
+                    'unique_values': int(col_profile.unique_count),
                     'most_common': value_counts.index.tolist(),
                     'most_common_counts': value_counts.values.tolist(),
-                    'mode': col_data.mode().iloc[0] if not col_data.mode().empty else None
+                    'mode': col_profile.mode
                 })
+                if col_profile.approximate:
+                    stats_summary['categorical_columns'][-1].update({
+                        'unique_values_error': round(col_profile.unique_error, 4),
+                        'most_common_counts_error': int(col_profile.value_counts_error)
+                    })
 
         return stats_summary
 
@@ -109,39 +118,32 @@ class DataAnalyzer:
             'patterns': []
         }
 
-        #Get numeric columns
-        numeric_df = self.df.select_dtypes(include=[np.number])
-
-        if len(numeric_df.columns) >= 2:
-            #Calculate correlation matrix
-            corr_matrix = numeric_df.corr()
+        if len(self.profile.numeric_columns) >= 2:
+            corr_matrix = self.profile.correlations
+            correlations['method'] = corr_matrix.method
 
             #Convert to serializable format
             correlations['correlation_matrix'] = {
                 'columns': corr_matrix.columns.tolist(),
-                'values': corr_matrix.values.tolist()
+                'values': corr_matrix.matrix.tolist()
             }
 
             #Find strong correlations
-            strong_corr = []
-            for i in range(len(corr_matrix.columns)):
-                for j in range(i + 1, len(corr_matrix.columns)):
-                    corr_value = corr_matrix.iloc[i, j]
-                    if abs(corr_value) > 0.7:  #Strong correlation threshold
-                        strong_corr.append({
-                            'column1': corr_matrix.columns[i],
-                            'column2': corr_matrix.columns[j],
-                            'correlation': round(float(corr_value), 3),
-                            'strength': 'strong positive' if corr_value > 0 else 'strong negative'
-                        })
-
-            correlations['strong_correlations'] = strong_corr
+            correlations['strong_correlations'] = [
+                {
+                    'column1': column1,
+                    'column2': column2,
+                    'correlation': round(corr_value, 3),
+                    'strength': 'strong positive' if corr_value > 0 else 'strong negative'
+                }
+                for column1, column2, corr_value in corr_matrix.pairs(threshold=0.7)  #Strong correlation threshold
+            ]
 
         #Detect patterns
         patterns = []
 
         #Check for time series data
-        date_columns = self.df.select_dtypes(include=['datetime64']).columns
+        date_columns = self.profile.datetime_columns
         if len(date_columns) > 0:
             patterns.append({
                 'type': 'time_series',
@@ -150,7 +152,7 @@ class DataAnalyzer:
             })
 
         #Check for categorical relationships
-        categorical_cols = self.df.select_dtypes(include=['object']).columns
+        categorical_cols = self.profile.categorical_columns
         if len(categorical_cols) >= 2:
             patterns.append({
                 'type': 'categorical_data',
@@ -167,7 +169,7 @@ class DataAnalyzer:
         insights = []
 
         #Data completeness insight
-        missing_percentage = (self.df.isnull().sum().sum() / (self.df.shape[0] * self.df.shape[1])) * 100
+        missing_percentage = (self.profile.missing_cells / self.profile.total_cells) * 100
         if missing_percentage < 5:
             insights.append({
                 'category': 'data_quality',
@@ -184,17 +186,17 @@ class DataAnalyzer:
             })
 
         #Duplicate detection
-        duplicate_count = self.df.duplicated().sum()
+        duplicate_count = self.profile.duplicate_rows
         if duplicate_count > 0:
             insights.append({
                 'category': 'data_quality',
                 'severity': 'warning',
                 'message': f'Found {duplicate_count} duplicate rows',
-                'recommendation': 'Review and remove duplicates if they are not intentional'
+                'recommendation': 'Duplicates are removed during cleaning; check the source if they are not intentional'
             })
 
         #Data type insights
-        numeric_cols = self.df.select_dtypes(include=[np.number]).columns
+        numeric_cols = self.profile.numeric_columns
         if len(numeric_cols) > 0:
             insights.append({
                 'category': 'analysis_ready',
@@ -205,7 +207,7 @@ class DataAnalyzer:
 
         #Outlier detection
         for column in numeric_cols:
-            outlier_count = self._count_outliers(self.df[column])
+            outlier_count = self._numeric_accumulator(column).outliers_count()
             if outlier_count > len(self.df) * 0.1:  #More than 10% outliers
                 insights.append({
                     'category': 'outliers',
@@ -216,8 +218,8 @@ class DataAnalyzer:
 
         #Uniqueness insights
         for column in self.df.columns:
-            unique_ratio = self.df[column].nunique() / len(self.df)
-            if unique_ratio == 1:
+            unique_ratio = self.profile[column].uniqueness_ratio
+            if self.profile[column].all_unique:
                 insights.append({
                     'category': 'data_structure',
                     'severity': 'info',
@@ -233,10 +235,10 @@ class DataAnalyzer:
                 })
 
         #Imbalance detection for categorical variables
-        categorical_cols = self.df.select_dtypes(include=['object']).columns
+        categorical_cols = self.profile.categorical_columns
         for column in categorical_cols:
-            if self.df[column].nunique() < 10:  #Only check small categorical variables
-                value_counts = self.df[column].value_counts()
+            if self.profile[column].unique_count < 10:  #Only check small categorical variables
+                value_counts = self.profile.value_counts(column)
                 if len(value_counts) > 0:
                     max_freq = value_counts.iloc[0] / len(self.df)
                     if max_freq > 0.9:
@@ -254,34 +256,32 @@ class DataAnalyzer:
         column_info = []
 
         for column in self.df.columns:
-            col_data = self.df[column]
+            col_profile = self.profile[column]
             info = {
                 'name': column,
-                'dtype': str(col_data.dtype),
-                'non_null_count': int(col_data.count()),
-                'null_count': int(col_data.isnull().sum()),
-                'unique_count': int(col_data.nunique())
+                'dtype': str(col_profile.dtype),
+                'non_null_count': int(col_profile.non_null_count),
+                'null_count': int(col_profile.null_count),
+                'unique_count': int(col_profile.unique_count)
             }
 
             #Add sample values (first 5 unique values)
-            sample_values = col_data.dropna().unique()[:5].tolist()
+            sample_values = self._sample_values(self.df[column])
             info['sample_values'] = [str(v) for v in sample_values]
 
             column_info.append(info)
 
         return column_info
 
-    def _count_outliers(self, series):
-        """Count outliers using IQR method"""
-        if len(series) == 0 or not pd.api.types.is_numeric_dtype(series):
-            return 0
-
-        Q1 = series.quantile(0.25)
-        Q3 = series.quantile(0.75)
-        IQR = Q3 - Q1
-
-        lower_bound = Q1 - 1.5 * IQR
-        upper_bound = Q3 + 1.5 * IQR
-
-        outliers = series[(series < lower_bound) | (series > upper_bound)]
-        return len(outliers)
+    def _sample_values(self, series, count=5):
+        """First unique non-null values, scanning only the head of the column when possible"""
+        head_values = series.head(1000).dropna().unique()
+        if len(head_values) >= count or len(series) <= 1000:
+            return head_values[:count].tolist()
+        return series.dropna().unique()[:count].tolist()
+
+    def _numeric_accumulator(self, column):
+        """Get the cached single-pass accumulator for a numeric column"""
+        if column not in self._accumulators:
+            self._accumulators[column] = StatsAccumulator().update(self.df[column])
+        return self._accumulators[column]
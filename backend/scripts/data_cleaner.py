@@ -1,12 +1,35 @@
 import pandas as pd
 import numpy as np
 from datetime import datetime
+from backend.config.config import Config
+from backend.scripts.duplicate_detector import DuplicateDetector
 
 class DataCleaner:
     """Cleans and preprocesses CSV data"""
 
+    #columns missing more than this percentage are flagged instead of filled
+    MISSING_FLAG_PERCENTAGE = 70
+    #share of values that must parse as numbers (or dates) to convert a text column
+    NUMERIC_THRESHOLD = 0.8
+    DATETIME_KEYWORDS = ['date', 'time', 'timestamp', 'created', 'updated', 'modified']
+    #date-like column names only need half their values to parse as dates
+    DATETIME_KEYWORD_THRESHOLD = 0.5
+    #fixed formats tried on the sample, most common first; ties go to the earlier format
+    DATE_FORMATS = [
+        'ISO8601', '%m/%d/%Y', '%d/%m/%Y', '%m/%d/%Y %H:%M', '%m/%d/%Y %H:%M:%S',
+        '%d/%m/%Y %H:%M', '%d/%m/%Y %H:%M:%S', '%Y/%m/%d', '%m-%d-%Y', '%d-%m-%Y',
+        '%d.%m.%Y', '%b %d, %Y', '%B %d, %Y', '%d %b %Y', '%d %B %Y'
+    ]
+    MISSING_TEXT = 'Unknown'
+    #text left by missing values, not counted when measuring how many values parse as dates
+    MISSING_STRINGS = ['nan', 'None', 'NaT', '', MISSING_TEXT]
+
     def __init__(self, df):
-        self.df = df.copy()
+        #shallow copy: columns are replaced rather than written in place,
+        #so the caller's frame is never modified and no data is copied up front
+        self.df = df.copy(deep=False)
+        #duplicate rows found (and removed) in the upload, known once clean() has run
+        self.duplicate_rows = None
         self.cleaning_report = {
             'original_shape': df.shape,
             'actions_taken': [],
@@ -17,21 +40,21 @@ class DataCleaner:
         """Perform comprehensive data cleaning"""
         self._remove_duplicates()
         self._handle_missing_values()
-        self._detect_and_convert_types()
-        self._remove_empty_columns()
-        self._standardize_text()
+        self._infer_types()
+        self._convert_columns()
 
         self.cleaning_report['final_shape'] = self.df.shape
 
         return self.df, self.cleaning_report
 
     def _remove_duplicates(self):
-        """Remove duplicate rows"""
-        initial_rows = len(self.df)
-        self.df = self.df.drop_duplicates()
-        duplicates_removed = initial_rows - len(self.df)
+        """Remove duplicate rows, hashing the frame in chunks"""
+        duplicated, detector = DuplicateDetector.find(self.df)
+        duplicates_removed = detector.duplicate_count
+        self.duplicate_rows = duplicates_removed
 
         if duplicates_removed > 0:
+            self.df = self.df[~duplicated]
             self.cleaning_report['actions_taken'].append({
                 'action': 'remove_duplicates',
                 'count': duplicates_removed,
@@ -41,39 +64,56 @@ class DataCleaner:
     def _handle_missing_values(self):
         """Handle missing values intelligently"""
         missing_info = []
+        row_count = len(self.df)
+        missing_counts = self.df.isna().sum()
+        self._missing_counts = missing_counts
 
-        for column in self.df.columns:
-            missing_count = self.df[column].isnull().sum()
-            if missing_count > 0:
-                missing_percentage = (missing_count / len(self.df)) * 100
-
-                #if more than 70% missing, consider dropping the column
-                if missing_percentage > 70:
-                    missing_info.append({
-                        'column': column,
-                        'action': 'flagged_for_review',
-                        'missing_percentage': round(missing_percentage, 2),
-                        'message': f'{column}: {missing_percentage:.1f}% missing (consider removing)'
-                    })
-                    self.cleaning_report['warnings'].append(
-                        f'{column} has {missing_percentage:.1f}% missing values'
-                    )
-                else:
-                    #fill missing values based on data type
-                    if pd.api.types.is_numeric_dtype(self.df[column]):
-                        self.df[column].fillna(self.df[column].median(), inplace=True)
-                        missing_info.append({
-                            'column': column,
-                            'action': 'filled_with_median',
-                            'count': missing_count
-                        })
-                    else:
-                        self.df[column].fillna('Unknown', inplace=True)
-                        missing_info.append({
-                            'column': column,
-                            'action': 'filled_with_unknown',
-                            'count': missing_count
-                        })
+        #columns with few enough gaps to fill, and the medians for the numeric ones in one aggregate
+        fillable = [
+            column for column, missing_count in missing_counts.items()
+            if missing_count > 0 and (missing_count / row_count) * 100 <= self.MISSING_FLAG_PERCENTAGE
+        ]
+        numeric_fillable = [column for column in fillable if pd.api.types.is_numeric_dtype(self.df[column])]
+        medians = self.df[numeric_fillable].median() if numeric_fillable else {}
+
+        fill_values = {}
+        for column, missing_count in missing_counts.items():
+            if missing_count == 0:
+                continue
+            missing_count = int(missing_count)
+            missing_percentage = (missing_count / row_count) * 100
+
+            #if more than 70% missing, consider dropping the column
+            if missing_percentage > self.MISSING_FLAG_PERCENTAGE:
+                missing_info.append({
+                    'column': column,
+                    'action': 'flagged_for_review',
+                    'missing_percentage': round(missing_percentage, 2),
+                    'message': f'{column}: {missing_percentage:.1f}% missing (consider removing)'
+                })
+                self.cleaning_report['warnings'].append(
+                    f'{column} has {missing_percentage:.1f}% missing values'
+                )
+            #fill missing values based on data type
+            elif column in medians:
+                fill_values[column] = medians[column]
+                missing_info.append({
+                    'column': column,
+                    'action': 'filled_with_median',
+                    'count': missing_count
+                })
+            else:
+                fill_values[column] = self.MISSING_TEXT
+                missing_info.append({
+                    'column': column,
+                    'action': 'filled_with_unknown',
+                    'count': missing_count
+                })
+
+        if fill_values:
+            #fill every column in one call
+            self.df = self.df.fillna(fill_values)
+            missing_counts[list(fill_values)] = 0
 
         if missing_info:
             self.cleaning_report['actions_taken'].append({
@@ -81,40 +121,62 @@ class DataCleaner:
                 'details': missing_info
             })
 
-    def _detect_and_convert_types(self):
-        """Detect and convert column data types"""
+    def _convert_columns(self):
+        """
+        Convert inferred column types, drop empty columns and strip text,
+        visiting each column once. Text columns are factorized so parsing
+        and stripping run once per distinct value rather than per row.
+        """
         conversions = []
+        empty_cols = []
+        text_standardizations = []
+        replacements = {}
 
         for column in self.df.columns:
-            #try to convert to datetime
-            if self._is_datetime_column(column):
-                try:
-                    self.df[column] = pd.to_datetime(self.df[column], errors='coerce')
-                    conversions.append({
-                        'column': column,
-                        'from': 'object',
-                        'to': 'datetime'
-                    })
-                except:
-                    pass
-
-            #try to convert to numeric
-            elif self.df[column].dtype == 'object':
-                try:
-                    #remove common non-numeric characters
-                    cleaned = self.df[column].astype(str).str.replace('$', '').str.replace(',', '')
-                    numeric_series = pd.to_numeric(cleaned, errors='coerce')
-
-                    #if at least 80% successfully converted, use it
-                    if numeric_series.notna().sum() / len(numeric_series) > 0.8:
-                        self.df[column] = numeric_series
-                        conversions.append({
-                            'column': column,
-                            'from': 'object',
-                            'to': 'numeric'
-                        })
-                except:
-                    pass
+            values = self.df[column]
+            converted = None
+            text = None  #(codes, distinct strings) of an object column
+
+            #convert text columns whose sample passed inference
+            inferred = self._inferred_types.get(column)
+            if inferred is not None:
+                text = self._factorize_text(values)
+                if inferred['to'] == 'numeric':
+                    converted = self._parse_numeric(*text)
+                else:
+                    converted = self._parse_datetime(*text, inferred['format'], self._datetime_threshold(column))
+                    if converted is None:
+                        self.cleaning_report['warnings'].append(
+                            f"{column} kept as text: too few values parse as dates with format {inferred['format']}"
+                        )
+
+                if converted is not None:
+                    converted = pd.Series(converted, index=values.index, name=column)
+                    conversions.append({'column': column, 'from': 'object', **inferred})
+
+            #remove completely empty columns
+            if converted is not None:
+                is_empty = converted.isna().all()
+            else:
+                is_empty = self._missing_counts[column] == len(values)
+            if is_empty:
+                empty_cols.append(column)
+                continue
+
+            if converted is not None:
+                replacements[column] = converted
+            elif values.dtype == 'object':
+                #standardize text by stripping whitespace
+                codes, uniques = text if text is not None else self._factorize_text(values)
+                stripped = pd.Series(uniques.str.strip().to_numpy()[codes], index=values.index, name=column)
+                replacements[column] = stripped
+                if len(values) > 0 and values.iloc[0] != stripped.iloc[0]:
+                    text_standardizations.append(column)
+
+        for column in empty_cols:
+            del self.df[column]
+        for column, new_values in replacements.items():
+            self.df[column] = new_values
 
         if conversions:
             self.cleaning_report['actions_taken'].append({
@@ -122,39 +184,159 @@ class DataCleaner:
                 'details': conversions
             })
 
-    def _is_datetime_column(self, column):
-        """Check if column might contain datetime data"""
-        datetime_keywords = ['date', 'time', 'timestamp', 'created', 'updated', 'modified']
-        return any(keyword in column.lower() for keyword in datetime_keywords)
-
-    def _remove_empty_columns(self):
-        """Remove completely empty columns"""
-        empty_cols = [col for col in self.df.columns if self.df[col].isnull().all()]
-
         if empty_cols:
-            self.df = self.df.drop(columns=empty_cols)
             self.cleaning_report['actions_taken'].append({
                 'action': 'remove_empty_columns',
                 'columns': empty_cols,
                 'count': len(empty_cols)
             })
 
-    def _standardize_text(self):
-        """Standardize text columns"""
-        text_standardizations = []
-
-        for column in self.df.columns:
-            if self.df[column].dtype == 'object':
-                #strip whitespace
-                original_sample = self.df[column].iloc[0] if len(self.df) > 0 else None
-                self.df[column] = self.df[column].astype(str).str.strip()
-
-                if original_sample != self.df[column].iloc[0]:
-                    text_standardizations.append(column)
-
         if text_standardizations:
             self.cleaning_report['actions_taken'].append({
                 'action': 'standardize_text',
                 'columns': text_standardizations,
                 'message': 'Removed leading/trailing whitespace'
             })
+
+    def _is_datetime_column(self, column):
+        """Check if column might contain datetime data"""
+        return any(keyword in column.lower() for keyword in self.DATETIME_KEYWORDS)
+
+    def _datetime_threshold(self, column):
+        """Share of present values that must parse as dates to convert the column"""
+        return self.DATETIME_KEYWORD_THRESHOLD if self._is_datetime_column(column) else self.NUMERIC_THRESHOLD
+
+    @staticmethod
+    def _factorize_text(values):
+        """Codes and distinct strings of a column, converting to strings only if it holds anything else"""
+        if pd.api.types.infer_dtype(values, skipna=False) != 'string':
+            values = values.astype(str)
+        codes, uniques = pd.factorize(values)
+        return codes, pd.Series(uniques, dtype=object)
+
+    def _infer_types(self):
+        """
+        Decide which text columns to convert by parsing a stratified sample of
+        each, so full conversion only runs on columns likely to pass.
+        Dates are matched against fixed formats so the full parse never has
+        to guess per element.
+        """
+        self._inferred_types = {}
+
+        for column in self.df.columns:
+            values = self.df[column]
+            if values.dtype != 'object' or len(values) == 0:
+                continue
+            sample = self._sample_text(values)
+
+            #numbers first, counted over every sampled row like the full-column check
+            confidence = self._to_numeric(sample).notna().mean()
+            if confidence > self.NUMERIC_THRESHOLD:
+                self._inferred_types[column] = {
+                    'to': 'numeric',
+                    'confidence': round(float(confidence), 3),
+                    'sample_size': len(sample)
+                }
+                continue
+
+            #dates, counted over the sampled values that aren't missing
+            is_date_name = self._is_datetime_column(column)
+            present = sample[~sample.isin(self.MISSING_STRINGS)]
+            if len(present) == 0:
+                continue
+            date_format, confidence = self._detect_date_format(present, allow_mixed=is_date_name)
+            if date_format is not None and confidence >= self._datetime_threshold(column):
+                self._inferred_types[column] = {
+                    'to': 'datetime',
+                    'format': date_format,
+                    'confidence': round(float(confidence), 3),
+                    'sample_size': len(sample)
+                }
+
+    @staticmethod
+    def _sample_text(values):
+        """Stripped strings from one random row in each of evenly sized row ranges"""
+        size = Config.TYPE_INFERENCE_SAMPLE_SIZE
+        if len(values) > size:
+            bounds = np.linspace(0, len(values), size + 1).astype(np.int64)
+            positions = np.random.default_rng(0).integers(bounds[:-1], bounds[1:])
+            values = values.iloc[positions]
+        return values.astype(str).str.strip()
+
+    def _detect_date_format(self, sample, allow_mixed=False):
+        """
+        Best fixed date format for the sampled strings and the share it parses.
+        Date-like column names may fall back to per-element parsing ('mixed')
+        when no fixed format fits.
+        """
+        counts = sample.value_counts()
+        uniques = counts.index.to_series()
+        total = counts.sum()
+
+        #plain text never parses as a date, so skip it without trying every format
+        with_digits = counts[uniques.str.contains(r'\d', regex=True).to_numpy()].sum()
+        if with_digits / total < self.DATETIME_KEYWORD_THRESHOLD:
+            return None, 0.0
+
+        formats = self.DATE_FORMATS + (['mixed'] if allow_mixed else [])
+        best_format, best_share = None, 0.0
+        for date_format in formats:
+            if date_format == 'mixed' and best_share >= self.DATETIME_KEYWORD_THRESHOLD:
+                break
+            parsed = self._to_datetime(uniques, date_format)
+            if parsed is None:
+                continue
+            share = counts[parsed.notna().to_numpy()].sum() / total
+            if share > best_share:
+                best_format, best_share = date_format, share
+            if share == 1:
+                break
+
+        return best_format, best_share
+
+    @staticmethod
+    def _to_datetime(strings, date_format):
+        """Parse strings with one format, or None if they don't form a single datetime column"""
+        try:
+            parsed = pd.to_datetime(strings, format=date_format, errors='coerce')
+        except (ValueError, TypeError):
+            return None
+        #mixed time zones come back as objects
+        if not pd.api.types.is_datetime64_any_dtype(parsed):
+            return None
+        return parsed
+
+    @staticmethod
+    def _to_numeric(strings):
+        """Parse strings as numbers once common non-numeric characters are removed"""
+        cleaned = strings.str.replace('$', '', regex=False).str.replace(',', '', regex=False)
+        return pd.to_numeric(cleaned, errors='coerce')
+
+    def _parse_numeric(self, codes, uniques):
+        """Numeric values of a factorized text column, or None if too few values parse"""
+        numeric_uniques = self._to_numeric(uniques).to_numpy()
+
+        #if at least 80% successfully converted, use it
+        parsed_rows = np.bincount(codes, minlength=len(uniques))[~pd.isna(numeric_uniques)].sum()
+        if parsed_rows / len(codes) > self.NUMERIC_THRESHOLD:
+            return numeric_uniques[codes]
+        return None
+
+    def _parse_datetime(self, codes, uniques, date_format, threshold):
+        """
+        Datetime values of a factorized text column using the inferred format,
+        or None if fewer than `threshold` of its present values parse; the
+        sample passing doesn't guarantee the rest of the column does.
+        """
+        stripped = uniques.str.strip()
+        parsed = self._to_datetime(stripped, date_format)
+        if parsed is None:
+            return None
+
+        counts = np.bincount(codes, minlength=len(uniques))
+        present = ~stripped.isin(self.MISSING_STRINGS).to_numpy()
+        present_rows = counts[present].sum()
+        parsed_rows = counts[present & parsed.notna().to_numpy()].sum()
+        if present_rows and parsed_rows / present_rows < threshold:
+            return None
+        return parsed.array.take(codes)
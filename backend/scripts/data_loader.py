@@ -0,0 +1,184 @@
+import csv
+import codecs
+import pandas as pd
+from backend.config.config import Config
+from backend.scripts.compression import DecompressionError, split_compression, open_decompressed
+
+
+class DataLoaderError(Exception):
+    """Raised when a CSV file cannot be loaded within the configured limits"""
+
+
+class DataLoader:
+    """Reads CSV files, plain or .gz/.zst compressed, in bounded chunks instead of one large read"""
+
+    #delimiters recognised besides the default comma
+    ALTERNATE_DELIMITERS = (';', '\t', '|')
+
+    def __init__(self, file_path, chunk_size=None, max_rows=None, max_memory=None, encoding='utf-8'):
+        self.file_path = file_path
+        self.chunk_size = chunk_size or Config.CHUNK_SIZE
+        self.max_rows = max_rows or Config.MAX_ROWS
+        self.max_memory = max_memory or Config.MAX_MEMORY_BYTES
+        self.encoding = encoding
+        self.compression = split_compression(file_path)[1]
+
+        #populated while reading
+        self.delimiter = None
+        self.columns = None
+        self.rows_read = 0
+        self.memory_used = 0
+
+    def iter_chunks(self):
+        """Yield DataFrame chunks, sniffing the file first and validating columns on the first chunk"""
+        self._sniff()
+
+        try:
+            with self._open() as source, self._reader(source) as reader:
+                for chunk in reader:
+                    if self.columns is None:
+                        self._validate_columns(chunk)
+                        self.columns = chunk.columns.tolist()
+
+                    self.rows_read += len(chunk)
+                    yield chunk
+        except DecompressionError as e:
+            raise DataLoaderError(str(e))
+
+    def load(self):
+        """Read all chunks into a single DataFrame, enforcing the memory ceiling"""
+        chunks = []
+
+        for chunk in self.iter_chunks():
+            self.memory_used += int(chunk.memory_usage(index=False, deep=True).sum())
+            if self.memory_used > self.max_memory:
+                raise DataLoaderError(
+                    f"File exceeds the memory limit of {self.max_memory // (1024 * 1024)}MB"
+                )
+            chunks.append(chunk)
+
+        if not chunks:
+            raise pd.errors.EmptyDataError("No rows to read")
+
+        if len(chunks) == 1:
+            return chunks[0]
+
+        mixed = self._mixed_columns(chunks)
+        df = pd.concat(chunks, ignore_index=True)
+        del chunks
+
+        if mixed:
+            text = self._read_text_columns(mixed)
+            for column in mixed:
+                df[column] = text[column]
+
+        return df
+
+    def _reader(self, source, dtype=None):
+        """Chunked C-engine reader over the source, with the loader's limits"""
+        return pd.read_csv(
+            source,
+            sep=self.delimiter,
+            chunksize=self.chunk_size,
+            nrows=self.max_rows,
+            on_bad_lines='skip',  #skip malformed lines, same as the python engine
+            engine='c',
+            encoding=self.encoding,
+            dtype=dtype
+        )
+
+    def _read_text_columns(self, columns):
+        """
+        Re-read the given columns as unparsed text. Same reader settings as
+        the first pass, so the same lines are skipped and rows line up.
+        """
+        parts = []
+        try:
+            with self._open() as source, self._reader(source, dtype={column: str for column in columns}) as reader:
+                for chunk in reader:
+                    parts.append(chunk[columns])
+        except DecompressionError as e:
+            raise DataLoaderError(str(e))
+
+        return pd.concat(parts, ignore_index=True)
+
+    def _open(self):
+        """Binary stream of the CSV text, decompressing (with the ratio guard) when needed"""
+        if self.compression is None:
+            return open(self.file_path, 'rb')
+        return open_decompressed(self.file_path, self.compression)
+
+    def _sniff(self):
+        """Check the start of the (decompressed) file and detect its delimiter"""
+        try:
+            with self._open() as f:
+                head = f.read(Config.SNIFF_BYTES)
+                final = not f.read(1)
+        except DecompressionError as e:
+            raise DataLoaderError(str(e))
+
+        self.delimiter = DataLoader.sniff(head, self.encoding, final=final)
+
+    def _validate_columns(self, chunk):
+        """Check column limits on the first chunk"""
+        if len(chunk.columns) > Config.MAX_COLUMNS:
+            raise DataLoaderError(f"Too many columns. Maximum allowed: {Config.MAX_COLUMNS}")
+
+    @staticmethod
+    def check_encoding(head, encoding='utf-8'):
+        """Decode a leading byte sample, tolerating a multi-byte sequence cut at the end"""
+        decoder = codecs.getincrementaldecoder(encoding)(errors='strict')
+        try:
+            return decoder.decode(head, final=False)
+        except UnicodeDecodeError:
+            raise DataLoaderError(f"File is not valid {encoding} text")
+
+    @staticmethod
+    def sniff(head, encoding='utf-8', final=False):
+        """
+        Validate the leading bytes of a CSV file and return its delimiter.
+        `final` means `head` is the whole file. Used on uploads as they
+        stream in, so bad files are rejected before the rest arrives.
+        """
+        if b'\x00' in head:
+            raise DataLoaderError("File appears to be binary, not CSV text")
+
+        text = DataLoader.check_encoding(head, encoding)
+        lines = [line for line in text.splitlines(keepends=True) if line.strip()]
+        #the last line may be cut off unless this is the whole file
+        complete = lines if final else [line for line in lines if line.endswith(('\n', '\r'))]
+        if not complete:
+            return ','
+
+        delimiter = DataLoader._detect_delimiter(complete[:20])
+        header = next(csv.reader([complete[0]], delimiter=delimiter))
+        if len(header) > Config.MAX_COLUMNS:
+            raise DataLoaderError(f"Too many columns. Maximum allowed: {Config.MAX_COLUMNS}")
+
+        return delimiter
+
+    @staticmethod
+    def _detect_delimiter(lines):
+        """Comma unless the header has none and another delimiter splits every line alike"""
+        if ',' in lines[0]:
+            return ','
+        for delimiter in DataLoader.ALTERNATE_DELIMITERS:
+            counts = {line.count(delimiter) for line in lines}
+            if len(counts) == 1 and counts.pop() > 0:
+                return delimiter
+        return ','
+
+    @staticmethod
+    def _mixed_columns(chunks):
+        """
+        Columns parsed as text in some chunks and as numbers in others.
+        Converting the parsed numbers back to text would lose leading zeros
+        and add '.0' to integers with gaps, so these are re-read as text,
+        which is what a single full-file read with dtype=str gives.
+        """
+        mixed = []
+        for column in chunks[0].columns:
+            dtypes = {chunk[column].dtype for chunk in chunks}
+            if len(dtypes) > 1 and any(dtype == 'object' for dtype in dtypes):
+                mixed.append(column)
+        return mixed
@@ -0,0 +1,229 @@
+import operator
+import numpy as np
+import pandas as pd
+from backend.config.config import Config
+from backend.scripts.json_provider import column_values
+
+
+class PreviewError(Exception):
+    """Raised when preview options name unknown columns or can't be applied"""
+
+    status_code = 400
+
+
+def records_for_json(df):
+    """
+    Rows of a DataFrame as JSON-ready dicts. Missing values and infinities
+    become None through one vectorized mask per column, and rows are
+    zipped from column lists instead of walking every cell.
+    """
+    names = df.columns.tolist()
+    columns = []
+    for _, values in df.items():
+        array = values.to_numpy()
+        if array.dtype.kind in 'iub':
+            columns.append(array.tolist())
+        elif array.dtype.kind == 'f':
+            missing = ~np.isfinite(array)
+            if missing.any():
+                array = array.astype(object)
+                array[missing] = None
+            columns.append(array.tolist())
+        else:
+            columns.append(column_values(values))
+
+    return [dict(zip(names, row)) for row in zip(*columns)]
+
+
+class PreviewQuery:
+    """
+    A page of a session's cleaned data: filter predicates, then sort keys,
+    then offset/limit, then column projection. Built from query-string
+    arguments so only the columns it touches need to be loaded.
+    """
+
+    COMPARISONS = {
+        'eq': operator.eq, 'ne': operator.ne,
+        'lt': operator.lt, 'le': operator.le,
+        'gt': operator.gt, 'ge': operator.ge
+    }
+    OPERATORS = tuple(COMPARISONS) + ('contains', 'isnull', 'notnull')
+    LAYOUTS = ('records', 'columns')
+
+    def __init__(self, columns, offset=0, limit=None, sort=None, filters=None, layout='records'):
+        self.columns = columns
+        self.offset = offset
+        self.limit = limit or Config.PREVIEW_ROWS
+        self.layout = layout
+        self.sort = sort or []        #(column, ascending) pairs
+        self.filters = filters or []  #(column, operator, value) triples
+
+    @classmethod
+    def from_args(cls, args, available_columns):
+        """
+        Parse ?offset=0&limit=100&columns=a,b&sort=a,-b&filter=a:gt:5&layout=columns
+        (filter may repeat; operators are eq, ne, lt, le, gt, ge, contains,
+        isnull and notnull). Raises PreviewError for invalid options.
+        """
+        layout = args.get('layout') or 'records'
+        if layout not in cls.LAYOUTS:
+            raise PreviewError(f"layout must be one of: {', '.join(cls.LAYOUTS)}")
+
+        offset = cls._parse_int(args.get('offset'), 'offset', 0)
+        limit = cls._parse_int(args.get('limit'), 'limit', Config.PREVIEW_ROWS)
+        if offset < 0:
+            raise PreviewError("offset must not be negative")
+        if not 1 <= limit <= Config.PREVIEW_MAX_ROWS:
+            raise PreviewError(f"limit must be between 1 and {Config.PREVIEW_MAX_ROWS}")
+
+        known = set(available_columns)
+
+        def check(column):
+            if column not in known:
+                raise PreviewError(f"Unknown column: {column}")
+            return column
+
+        columns = list(available_columns)
+        if args.get('columns'):
+            columns = [check(name.strip()) for name in args['columns'].split(',') if name.strip()]
+
+        sort = []
+        for key in (args.get('sort') or '').split(','):
+            key = key.strip()
+            if key:
+                descending = key.startswith('-')
+                sort.append((check(key.lstrip('-')), not descending))
+
+        filters = []
+        for predicate in args.getlist('filter'):
+            parts = predicate.split(':', 2)
+            if len(parts) < 2 or parts[1] not in cls.OPERATORS:
+                raise PreviewError(
+                    f"Invalid filter '{predicate}'. Use column:operator:value with one of: {', '.join(cls.OPERATORS)}"
+                )
+            if len(parts) == 2 and parts[1] not in ('isnull', 'notnull'):
+                raise PreviewError(f"Filter '{predicate}' needs a value")
+            filters.append((check(parts[0]), parts[1], parts[2] if len(parts) == 3 else None))
+
+        return cls(columns, offset=offset, limit=limit, sort=sort, filters=filters, layout=layout)
+
+    def required_columns(self):
+        """Every column the query reads, in first-use order"""
+        names = self.columns + [column for column, _ in self.sort] + [column for column, _, _ in self.filters]
+        return list(dict.fromkeys(names))
+
+    def apply(self, df):
+        """
+        The requested page with its position in the filtered result, as
+        'rows' (one dict per row) or, for layout=columns, 'data' (one array
+        per column, which the JSON provider writes without per-cell work).
+        """
+        positions = np.arange(len(df))
+
+        if self.filters:
+            mask = np.ones(len(df), dtype=bool)
+            for column, op, value in self.filters:
+                mask &= self._match(df[column], column, op, value)
+            positions = np.flatnonzero(mask)
+
+        if self.sort:
+            positions = positions[self._sort_order(df, positions)]
+
+        page = positions[self.offset:self.offset + self.limit]
+        rows = df[self.columns].iloc[page]
+
+        if self.layout == 'columns':
+            page_data = {'data': [column_values(rows.iloc[:, position]) for position in range(rows.shape[1])]}
+        else:
+            page_data = {'rows': records_for_json(rows)}
+
+        return {
+            'columns': self.columns,
+            **page_data,
+            'offset': self.offset,
+            'limit': self.limit,
+            'total_rows': len(positions)
+        }
+
+    def _sort_order(self, df, positions):
+        """Positions into `positions` ordering the selected rows by the sort keys, missing values last"""
+        names = [column for column, _ in self.sort]
+        keys = df[names].iloc[positions].reset_index(drop=True)
+
+        #categories are stored in first-appearance order; sort by their values instead
+        for column in names:
+            if isinstance(keys[column].dtype, pd.CategoricalDtype):
+                keys[column] = keys[column].astype(object)
+
+        try:
+            ordered = keys.sort_values(
+                by=names, ascending=[ascending for _, ascending in self.sort],
+                na_position='last', kind='stable'
+            )
+        except TypeError:
+            raise PreviewError(f"Cannot sort by {', '.join(names)}: values of mixed types")
+        return ordered.index.to_numpy()
+
+    def _match(self, values, column, op, raw):
+        """Boolean mask of rows satisfying one predicate; missing values only match isnull"""
+        if op == 'isnull':
+            return values.isna().to_numpy()
+        if op == 'notnull':
+            return values.notna().to_numpy()
+
+        #evaluate once per category and broadcast through the codes
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            matches = self._match(pd.Series(values.cat.categories), column, op, raw)
+            codes = values.cat.codes.to_numpy()
+            return np.where(codes >= 0, matches[codes], False)
+
+        present = values.notna().to_numpy()
+        if op == 'contains':
+            found = values.astype(str).str.contains(raw, case=False, regex=False).to_numpy(dtype=bool)
+            return found & present
+
+        value = self._coerce(values, column, raw)
+        if value is None:
+            values = values.astype(str)
+            value = raw
+
+        try:
+            result = self.COMPARISONS[op](values, value)
+        except TypeError:
+            raise PreviewError(f"Cannot compare column {column} with '{raw}'")
+        return result.to_numpy(dtype=bool, na_value=False) & present
+
+    @staticmethod
+    def _coerce(values, column, raw):
+        """Filter value in the column's type, or None to compare as text"""
+        if pd.api.types.is_bool_dtype(values):
+            return raw.strip().lower() in ('true', '1', 'yes')
+
+        if pd.api.types.is_numeric_dtype(values):
+            try:
+                return float(raw)
+            except ValueError:
+                raise PreviewError(f"Filter value for {column} must be a number")
+
+        if pd.api.types.is_datetime64_any_dtype(values):
+            try:
+                value = pd.Timestamp(raw)
+            except ValueError:
+                raise PreviewError(f"Filter value for {column} must be a date")
+            tz = getattr(values.dt, 'tz', None)
+            if tz is not None and value.tzinfo is None:
+                value = value.tz_localize(tz)
+            elif tz is None and value.tzinfo is not None:
+                value = value.tz_convert(None)
+            return value
+
+        return None
+
+    @staticmethod
+    def _parse_int(raw, name, default):
+        if raw is None or raw == '':
+            return default
+        try:
+            return int(raw)
+        except ValueError:
+            raise PreviewError(f"{name} must be an integer")
@@ -0,0 +1,79 @@
+import numpy as np
+import pandas as pd
+
+#data reduction so chart render time depends on the point budget, not on row count
+
+
+def stratified_sample(x, y, size, strata=20, seed=0):
+    """
+    Indices of a sample of about `size` points, drawn proportionally from
+    x-quantile strata so sparse regions keep their share, plus the rows
+    holding the min/max of each axis so outliers stay visible.
+    """
+    n = len(x)
+    if n <= size:
+        return np.arange(n)
+
+    edges = np.unique(np.quantile(x, np.linspace(0, 1, strata + 1)[1:-1]))
+    codes = np.searchsorted(edges, x, side='right')
+    sample = (
+        pd.Series(np.arange(n))
+        .groupby(codes)
+        .sample(frac=size / n, random_state=seed)
+        .to_numpy()
+    )
+    extremes = [np.argmin(x), np.argmax(x), np.argmin(y), np.argmax(y)]
+    return np.unique(np.concatenate([sample, extremes]))
+
+
+def lttb(x, y, threshold):
+    """Largest-Triangle-Three-Buckets: indices of `threshold` points that keep the visual shape of y over sorted x"""
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    #first and last points are always kept; the rest is split into threshold - 2 buckets
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.intp)
+    selected = np.empty(threshold, dtype=np.intp)
+    selected[0], selected[-1] = 0, n - 1
+
+    previous = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+        next_end = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[end:next_end].mean()
+        avg_y = y[end:next_end].mean()
+
+        #pick the point forming the largest triangle with the previous pick and the next bucket's average
+        area = np.abs(
+            (x[previous] - avg_x) * (y[start:end] - y[previous])
+            - (x[previous] - x[start:end]) * (avg_y - y[previous])
+        )
+        previous = start + int(np.argmax(area))
+        selected[i + 1] = previous
+
+    return selected
+
+
+def minmax_buckets(y, buckets):
+    """Indices of the min and max of y in each of `buckets` equal-width runs, in order"""
+    n = len(y)
+    if 2 * buckets >= n:
+        return np.arange(n)
+
+    edges = np.linspace(0, n, buckets + 1).astype(np.intp)
+    selected = []
+    for start, end in zip(edges[:-1], edges[1:]):
+        window = y[start:end]
+        selected.extend([start + int(np.argmin(window)), start + int(np.argmax(window))])
+
+    return np.unique(selected)
+
+
+def reduce_time_series(x, y, budget, method='lttb'):
+    """Indices of at most about `budget` points of a sorted series"""
+    if len(x) <= budget:
+        return np.arange(len(x))
+    if method == 'minmax':
+        return minmax_buckets(y, budget // 2)
+    return lttb(x, y, budget)
@@ -0,0 +1,62 @@
+import numpy as np
+import pandas as pd
+from backend.config.config import Config
+
+
+class DuplicateDetector:
+    """
+    Finds duplicate rows with 64-bit row hashes, computed chunk by chunk so
+    temporary memory stays bounded. Each column is hashed in its own dtype,
+    and a row is only reported as a duplicate once its values are compared
+    with the first row that has the same hash, so a hash collision never
+    removes a distinct row.
+    """
+
+    def __init__(self):
+        self.row_count = 0
+        self.duplicate_count = 0
+
+    @staticmethod
+    def hash_rows(chunk):
+        """One hash per row, from each column's values in its own dtype"""
+        return pd.util.hash_pandas_object(chunk, index=False).to_numpy()
+
+    @staticmethod
+    def _equal_rows(df, rows, originals):
+        """Which of `rows` hold the same values as the matching `originals` (NaN equals NaN, as pandas)"""
+        equal = np.ones(len(rows), dtype=bool)
+        for position in range(df.shape[1]):
+            values = df.iloc[:, position]
+            left = values.iloc[rows].to_numpy()
+            right = values.iloc[originals].to_numpy()
+            same = np.asarray(left == right, dtype=bool)
+            equal &= same | (pd.isna(left) & pd.isna(right))
+        return equal
+
+    @classmethod
+    def find(cls, df, chunk_size=None):
+        """Duplicate mask for a whole DataFrame (first occurrences are kept), and the detector with its counts"""
+        chunk_size = chunk_size or Config.CHUNK_SIZE
+        detector = cls()
+        detector.row_count = len(df)
+        mask = np.zeros(len(df), dtype=bool)
+        if len(df) == 0:
+            return mask, detector
+
+        hashes = np.concatenate([
+            cls.hash_rows(df.iloc[start:start + chunk_size])
+            for start in range(0, len(df), chunk_size)
+        ])
+
+        #first row with each hash; every later row with that hash is a candidate
+        codes, _ = pd.factorize(hashes)
+        _, first_rows = np.unique(codes, return_index=True)
+        originals = first_rows[codes]
+        candidates = np.flatnonzero(originals != np.arange(len(df)))
+
+        if len(candidates):
+            confirmed = cls._equal_rows(df, candidates, originals[candidates])
+            mask[candidates[confirmed]] = True
+
+        detector.duplicate_count = int(mask.sum())
+        return mask, detector
@@ -0,0 +1,233 @@
+import os
+import json
+import time
+import uuid
+import sqlite3
+import threading
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from backend.config.config import Config
+from backend.scripts.json_provider import to_jsonable
+
+
+class JobQueueFull(Exception):
+    """Raised when the job queue is at capacity"""
+
+
+class Job:
+    """Progress and partial results of one background upload"""
+
+    #stored by DiskJobRegistry, in this order
+    FIELDS = ('id', 'status', 'stages', 'result', 'error', 'error_status', 'created_at', 'finished_at')
+
+    def __init__(self, stages, on_change=None):
+        self.id = str(uuid.uuid4())
+        self.status = 'queued'
+        self.stages = {stage: {'status': 'pending'} for stage in stages}
+        self.result = {}
+        self.error = None
+        self.error_status = None
+        self.created_at = time.time()
+        self.finished_at = None
+        self.on_change = on_change
+
+    @classmethod
+    def from_record(cls, record):
+        """Rebuild a job from its stored fields"""
+        job = cls(())
+        for field, value in zip(cls.FIELDS, record):
+            setattr(job, field, value)
+        return job
+
+    def update_stage(self, stage, status, result):
+        """Progress callback for UploadPipeline"""
+        now = time.time()
+        info = self.stages[stage]
+        info['status'] = status
+        if status == 'running':
+            info['started_at'] = now
+        elif 'started_at' in info:
+            info['duration'] = round(now - info['started_at'], 3)
+        self.result = result
+        self.changed()
+
+    def changed(self):
+        if self.on_change is not None:
+            self.on_change(self)
+
+    @property
+    def progress(self):
+        done = sum(1 for info in self.stages.values() if info['status'] in ('completed', 'cached'))
+        return round(done / len(self.stages), 2)
+
+    def to_dict(self):
+        return {
+            'job_id': self.id,
+            'status': self.status,
+            'progress': self.progress,
+            'stages': self.stages,
+            'ready_results': sorted(self.result.keys()),
+            'error': self.error
+        }
+
+
+class MemoryJobRegistry:
+    """Jobs held in this process; only requests reaching this process can poll them"""
+
+    def __init__(self, ttl=None):
+        self.ttl = ttl or Config.JOB_TTL
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def add(self, job):
+        with self._lock:
+            self._expire()
+            self._jobs[job.id] = job
+
+    def save(self, job):
+        """The live job is already up to date"""
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def _expire(self):
+        """Drop finished jobs older than the TTL (caller holds the lock)"""
+        cutoff = time.time() - self.ttl
+        expired = [
+            job_id for job_id, job in self._jobs.items()
+            if job.finished_at is not None and job.finished_at < cutoff
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+
+class DiskJobRegistry:
+    """
+    Job state written to SQLite at every change, so any worker process can
+    answer polls for a job running in another. Partial results are stored
+    as JSON, as the result cache stores them.
+    """
+
+    def __init__(self, folder=None, ttl=None):
+        self.ttl = ttl or Config.JOB_TTL
+        self.folder = folder or Config.SESSION_FOLDER
+        os.makedirs(self.folder, exist_ok=True)
+        self.db_path = os.path.join(self.folder, 'jobs.db')
+
+        with self._connect() as conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS jobs ('
+                'id TEXT PRIMARY KEY, status TEXT, stages TEXT, result TEXT, '
+                'error TEXT, error_status INTEGER, created_at REAL, finished_at REAL)'
+            )
+            conn.execute('CREATE INDEX IF NOT EXISTS jobs_created_at ON jobs (created_at)')
+
+    @contextmanager
+    def _connect(self):
+        """Connection that commits on success and is always closed"""
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _dumps(value):
+        return json.dumps(value, default=to_jsonable)
+
+    def add(self, job):
+        self._expire()
+        self.save(job)
+
+    def save(self, job):
+        with self._connect() as conn:
+            conn.execute(
+                'INSERT OR REPLACE INTO jobs VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                (
+                    job.id, job.status, self._dumps(job.stages), self._dumps(job.result),
+                    job.error, job.error_status, job.created_at, job.finished_at
+                )
+            )
+
+    def get(self, job_id):
+        with self._connect() as conn:
+            row = conn.execute(
+                f'SELECT {", ".join(Job.FIELDS)} FROM jobs WHERE id = ?', (job_id,)
+            ).fetchone()
+        if row is None:
+            return None
+
+        record = list(row)
+        record[2], record[3] = json.loads(record[2]), json.loads(record[3])
+        return Job.from_record(record)
+
+    def _expire(self):
+        """Drop jobs finished longer than the TTL ago, and ones a worker that exited never finished"""
+        cutoff = time.time() - self.ttl
+        with self._connect() as conn:
+            conn.execute(
+                'DELETE FROM jobs WHERE finished_at < ? OR (finished_at IS NULL AND created_at < ?)',
+                (cutoff, cutoff)
+            )
+
+
+def create_job_registry(ttl=None):
+    """Job registry matching Config.SESSION_BACKEND: shared through SQLite with the disk backend"""
+    if Config.SESSION_BACKEND == 'disk':
+        return DiskJobRegistry(ttl=ttl)
+    return MemoryJobRegistry(ttl)
+
+
+class JobManager:
+    """
+    Runs upload pipelines on a bounded thread pool.
+    At most `max_workers` jobs run at once and at most `max_queued` wait;
+    finished jobs are kept for `ttl` seconds so clients can poll them,
+    in the registry picked by create_job_registry unless one is given.
+    """
+
+    def __init__(self, max_workers=None, max_queued=None, ttl=None, registry=None):
+        self.max_workers = max_workers or Config.JOB_WORKERS
+        self.max_queued = Config.JOB_QUEUE_SIZE if max_queued is None else max_queued
+        self.registry = registry or create_job_registry(ttl)
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='upload-job')
+        self._slots = threading.BoundedSemaphore(self.max_workers + self.max_queued)
+
+    def submit(self, run, stages):
+        """
+        Queue run(job) in the background and return the Job.
+        `run` receives the job so it can report progress; its return value
+        becomes the job result. Raises JobQueueFull if no slot is free.
+        """
+        if not self._slots.acquire(blocking=False):
+            raise JobQueueFull(f'Too many jobs in progress. Maximum queued: {self.max_queued}')
+
+        job = Job(stages, on_change=self.registry.save)
+        self.registry.add(job)
+
+        self._executor.submit(self._execute, job, run)
+        return job
+
+    def get(self, job_id):
+        return self.registry.get(job_id)
+
+    def _execute(self, job, run):
+        job.status = 'running'
+        try:
+            job.changed()
+            job.result = run(job)
+            job.status = 'completed'
+        except Exception as e:
+            job.error = str(e)
+            job.error_status = getattr(e, 'status_code', 500)
+            job.status = 'failed'
+        finally:
+            job.finished_at = time.time()
+            try:
+                job.changed()
+            except Exception as e:
+                print(f"Error saving job {job.id}: {e}")
+            self._slots.release()
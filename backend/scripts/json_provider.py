@@ -0,0 +1,124 @@
+import math
+import datetime
+import numpy as np
+import pandas as pd
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  #optional; the standard library encoder is used without it
+    orjson = None
+
+
+def array_values(array):
+    """A NumPy array as a JSON-ready list, with NaN, infinities and NaT as None"""
+    if array.dtype.kind == 'f':
+        values = array.astype(object)
+        values[~np.isfinite(array)] = None
+        return values.tolist()
+    if array.dtype.kind in 'iub':
+        return array.tolist()
+    return column_values(pd.Series(array))
+
+
+def datetime_values(values):
+    """
+    A datetime Series as ISO 8601 strings (None where missing), formatted in
+    one vectorized call; whole seconds match Timestamp.isoformat().
+    """
+    missing = values.isna().to_numpy()
+    if values.dt.tz is not None:
+        return [None if gap else value.isoformat() for value, gap in zip(values, missing)]
+
+    array = values.to_numpy()
+    present = array[~missing]
+    unit = 's' if (present.astype('datetime64[s]') == present).all() else 'us'
+    strings = np.datetime_as_string(array, unit=unit).astype(object)
+    strings[missing] = None
+    return strings.tolist()
+
+
+def column_values(values):
+    """
+    One column (Series or Index) in JSON-ready form. Numeric columns stay
+    NumPy arrays, which orjson writes natively (NaN and infinities as
+    null); other columns become lists with missing values as None and
+    timestamps as ISO 8601 strings.
+    """
+    if isinstance(values, pd.Index):
+        values = values.to_series()
+
+    array = values.to_numpy()
+    if array.dtype.kind in 'iubf':
+        return array
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return datetime_values(values)
+
+    array = values.to_numpy(dtype=object)
+    array[pd.isna(array)] = None
+    return array.tolist()
+
+
+def to_jsonable(value):
+    """
+    JSON form of NumPy and pandas values, used as the encoder's default hook.
+    DataFrames use the columnar {columns, data} layout.
+    """
+    if isinstance(value, pd.DataFrame):
+        return {
+            'columns': value.columns.tolist(),
+            'data': [column_values(value.iloc[:, position]) for position in range(value.shape[1])]
+        }
+    if isinstance(value, (pd.Series, pd.Index)):
+        return column_values(value)
+    if isinstance(value, np.ndarray):
+        return array_values(value)
+    if value is pd.NaT or value is pd.NA:
+        return None
+    if isinstance(value, np.generic):
+        item = value.item()
+        if isinstance(item, float) and not math.isfinite(item):
+            return None
+        return item
+    if isinstance(value, (datetime.datetime, datetime.date)):
+        return value.isoformat()
+    return DefaultJSONProvider.default(value)
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """
+    Serializes responses with orjson when it is installed, writing NumPy
+    arrays directly and NaN/infinity as null, and with the standard library
+    encoder otherwise. Both paths encode pandas and NumPy values through
+    to_jsonable and keep dict keys in insertion order (column order).
+    """
+
+    default = staticmethod(to_jsonable)
+    sort_keys = False
+
+    if orjson is not None:
+        OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+    def dumps(self, obj, **kwargs):
+        if orjson is None or kwargs:
+            return super().dumps(obj, **kwargs)
+        return orjson.dumps(obj, default=to_jsonable, option=self.OPTIONS).decode()
+
+    def loads(self, s, **kwargs):
+        if orjson is None or kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        if orjson is None:
+            return super().response(*args, **kwargs)
+
+        obj = self._prepare_response_obj(args, kwargs)
+        option = self.OPTIONS
+        #same pretty-printing rule as the default provider
+        if (self.compact is None and self._app.debug) or self.compact is False:
+            option |= orjson.OPT_INDENT_2
+        return self._app.response_class(
+            orjson.dumps(obj, default=to_jsonable, option=option) + b'\n',
+            mimetype=self.mimetype
+        )
@@ -0,0 +1,185 @@
+import sys
+import time
+import bisect
+import threading
+import tracemalloc
+from backend.config.config import Config
+
+try:
+    import resource
+except ImportError:  #not available on Windows; peak RSS is then not reported
+    resource = None
+
+#histogram upper bounds
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+BYTE_BUCKETS = tuple(2 ** power for power in range(20, 34, 2))  #1MB to 8GB
+
+
+class Histogram:
+    """Observation counts per bucket, plus their sum and total count"""
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  #the last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class MetricsRegistry:
+    """
+    Counters and histograms kept in this process, rendered in the
+    Prometheus text format. Each worker process has its own registry, so
+    scrape every worker (or run one) to see all uploads.
+    """
+
+    def __init__(self, prefix='csvsleuth'):
+        self.prefix = prefix
+        self._metrics = {}  #name -> (type, help, buckets, {label values: Histogram or number})
+        self._lock = threading.Lock()
+
+    def counter(self, name, help_text):
+        self._metrics[name] = ('counter', help_text, None, {})
+
+    def histogram(self, name, help_text, buckets=DURATION_BUCKETS):
+        self._metrics[name] = ('histogram', help_text, buckets, {})
+
+    def increment(self, name, amount=1, **labels):
+        _, _, _, series = self._metrics[name]
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series[key] = series.get(key, 0) + amount
+
+    def observe(self, name, value, **labels):
+        _, _, buckets, series = self._metrics[name]
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            if key not in series:
+                series[key] = Histogram(buckets)
+            series[key].observe(value)
+
+    def render(self):
+        """Every metric in the Prometheus text exposition format"""
+        lines = []
+        with self._lock:
+            for name, (kind, help_text, buckets, series) in self._metrics.items():
+                full_name = f'{self.prefix}_{name}'
+                lines.append(f'# HELP {full_name} {help_text}')
+                lines.append(f'# TYPE {full_name} {kind}')
+                for key, value in sorted(series.items()):
+                    if kind == 'counter':
+                        lines.append(f'{full_name}{self._labels(key)} {self._number(value)}')
+                        continue
+
+                    cumulative = 0
+                    for bound, count in zip(buckets + (float('inf'),), value.counts):
+                        cumulative += count
+                        le = '+Inf' if bound == float('inf') else self._number(bound)
+                        lines.append(f'{full_name}_bucket{self._labels(key + (("le", le),))} {cumulative}')
+                    lines.append(f'{full_name}_sum{self._labels(key)} {self._number(value.sum)}')
+                    lines.append(f'{full_name}_count{self._labels(key)} {value.count}')
+        return '\n'.join(lines) + '\n'
+
+    @staticmethod
+    def _labels(key):
+        if not key:
+            return ''
+        escaped = (
+            (name, str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n'))
+            for name, value in key
+        )
+        return '{' + ','.join(f'{name}="{value}"' for name, value in escaped) + '}'
+
+    @staticmethod
+    def _number(value):
+        return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+metrics = MetricsRegistry()
+metrics.counter('uploads_total', 'Uploads processed, by outcome (completed, cached or failed)')
+metrics.histogram('upload_duration_seconds', 'Time to process one upload, all stages')
+metrics.histogram('stage_duration_seconds', 'Time spent in each upload stage')
+metrics.counter('stage_rows_total', 'Rows processed by each upload stage')
+metrics.counter('stage_columns_total', 'Columns processed by each upload stage')
+metrics.histogram(
+    'stage_peak_rss_increase_bytes',
+    'How far each upload stage raised the process peak resident memory', BYTE_BUCKETS
+)
+metrics.histogram(
+    'stage_peak_traced_bytes',
+    'Peak Python and NumPy allocations during each upload stage (TRACE_MEMORY only)', BYTE_BUCKETS
+)
+metrics.histogram('chart_prepare_seconds', 'Time spent summarizing the data for each chart section')
+metrics.histogram('chart_render_seconds', 'Time spent rendering one chart image, by chart type')
+
+
+def peak_rss():
+    """Peak resident memory of this process so far, in bytes (None where unavailable)"""
+    if resource is None:
+        return None
+    #ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    scale = 1 if sys.platform == 'darwin' else 1024
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale
+
+
+class StageRecorder:
+    """
+    Measures the stages of one upload: duration, rows and columns
+    processed, how far the stage raised peak RSS and, with TRACE_MEMORY,
+    its peak tracemalloc allocation. Each finished stage is added to the
+    metrics registry and kept for the upload's timing breakdown.
+    Memory peaks are process-wide, so uploads processed at the same time
+    share them.
+    """
+
+    def __init__(self, registry=None):
+        self.registry = registry or metrics
+        self.stages = {}
+        self._started = {}
+        self._created = time.perf_counter()
+        if Config.TRACE_MEMORY and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def start(self, stage):
+        traced = None
+        if tracemalloc.is_tracing():
+            tracemalloc.reset_peak()
+            traced = tracemalloc.get_traced_memory()[0]
+        self._started[stage] = (time.perf_counter(), peak_rss(), traced)
+
+    def finish(self, stage, shape=None):
+        if stage not in self._started:
+            return
+        started, rss_before, traced_before = self._started.pop(stage)
+        seconds = time.perf_counter() - started
+        timing = {'seconds': round(seconds, 4)}
+        self.registry.observe('stage_duration_seconds', seconds, stage=stage)
+
+        if shape is not None:
+            rows, columns = shape
+            timing.update({'rows': rows, 'columns': columns})
+            self.registry.increment('stage_rows_total', rows, stage=stage)
+            self.registry.increment('stage_columns_total', columns, stage=stage)
+
+        rss_after = peak_rss()
+        if rss_before is not None and rss_after is not None:
+            timing['peak_rss_increase_bytes'] = rss_after - rss_before
+            self.registry.observe('stage_peak_rss_increase_bytes', rss_after - rss_before, stage=stage)
+
+        if traced_before is not None and tracemalloc.is_tracing():
+            traced = max(tracemalloc.get_traced_memory()[1] - traced_before, 0)
+            timing['peak_traced_bytes'] = traced
+            self.registry.observe('stage_peak_traced_bytes', traced, stage=stage)
+
+        self.stages[stage] = timing
+
+    def finish_upload(self, outcome):
+        """Count the upload and return its timing breakdown"""
+        total = time.perf_counter() - self._created
+        self.registry.increment('uploads_total', outcome=outcome)
+        self.registry.observe('upload_duration_seconds', total)
+        return {'total_seconds': round(total, 4), 'stages': self.stages}
@@ -0,0 +1,197 @@
+import os
+import json
+from backend.config.config import Config
+from backend.scripts.csv_validator import CSVValidator
+from backend.scripts.data_cleaner import DataCleaner
+from backend.scripts.memory_optimizer import MemoryOptimizer
+from backend.scripts.data_analyzer import DataAnalyzer
+from backend.scripts.column_profile import DataProfile
+from backend.scripts.visualizer import DataVisualizer
+from backend.scripts.result_cache import ResultCache
+from backend.scripts.chart_store import ChartStore
+from backend.scripts.columnar import DATA_EXTENSION, save_columnar
+from backend.scripts.data_preview import records_for_json
+from backend.scripts.metrics import StageRecorder
+
+
+class PipelineError(Exception):
+    """Raised when an upload is rejected by validation"""
+
+    status_code = 400
+
+
+class UploadPipeline:
+    """
+    Validate, clean, analyze and visualize one saved upload.
+    Each stage adds its part of the response to `result` as soon as it
+    finishes and reports progress through `on_progress(stage, status, result)`,
+    so callers can serve partial results while later stages run.
+    Every stage is measured for /api/metrics; with include_timings the
+    response also carries the breakdown as 'timings'.
+    """
+
+    STAGES = ('validate', 'clean', 'analyze', 'visualize', 'save')
+
+    def __init__(self, session_id, file_path, original_filename, session_store,
+                 profile_mode='exact', chart_mode='image', result_cache=None, content_hash=None, dumps=json.dumps,
+                 on_progress=None, include_timings=False):
+        self.session_id = session_id
+        self.file_path = file_path
+        self.original_filename = original_filename
+        self.session_store = session_store
+        self.profile_mode = profile_mode
+        self.chart_mode = chart_mode
+        self.result_cache = result_cache
+        self.content_hash = content_hash
+        self.dumps = dumps
+        self.on_progress = on_progress
+        self.include_timings = include_timings
+        self.recorder = None
+        self.cleaned_filepath = os.path.join(os.path.dirname(file_path), f"{session_id}_cleaned.csv")
+        self.data_filepath = os.path.join(os.path.dirname(file_path), f"{session_id}_cleaned{DATA_EXTENSION}")
+        self.chart_store = ChartStore.for_session(self.cleaned_filepath)
+
+        self.result = {
+            'session_id': session_id,
+            'original_filename': original_filename
+        }
+
+    def run(self):
+        """Run every stage and return the full response; removes the upload and its charts on failure"""
+        #created here so time spent queued in async mode isn't counted
+        self.recorder = StageRecorder()
+        try:
+            result = self._run()
+        except Exception:
+            self.recorder.finish_upload('failed')
+            if os.path.exists(self.file_path):
+                os.remove(self.file_path)
+            self.chart_store.remove()
+            raise
+
+        timings = self.recorder.finish_upload('cached' if result['cache_hit'] else 'completed')
+        if self.include_timings:
+            result['timings'] = timings
+        return result
+
+    def _run(self):
+        #return the stored result if this exact file was processed with the same options
+        cache_key = None
+        if self.result_cache is not None:
+            cache_key = ResultCache.make_key(
+                self.content_hash or ResultCache.hash_file(self.file_path),
+                {
+                    'profile_mode': self.profile_mode,
+                    'chart_mode': self.chart_mode,
+                    'correlation_method': Config.CORRELATION_METHOD,
+                    'optimize_memory': Config.OPTIMIZE_MEMORY
+                }
+            )
+            cached = self.result_cache.get(cache_key)
+            if cached is not None:
+                return self._use_cached(*cached)
+
+        #validate and load CSV
+        self._progress('validate', 'running')
+        is_valid, error_message, df = CSVValidator.validate_csv(self.file_path)
+        if not is_valid:
+            self._progress('validate', 'failed')
+            raise PipelineError(error_message)
+        self._progress('validate', 'completed', df.shape)
+
+        #clean the data
+        self._progress('clean', 'running')
+        cleaner = DataCleaner(df)
+        cleaned_df, cleaning_report = cleaner.clean()
+        del df
+
+        #compact dtypes keep large sessions cheap to hold and to count
+        if Config.OPTIMIZE_MEMORY:
+            cleaned_df, memory_action = MemoryOptimizer(cleaned_df).optimize()
+            if memory_action is not None:
+                cleaning_report['actions_taken'].append(memory_action)
+
+        #prepare preview data (first rows; /api/preview pages through the rest)
+        self.result.update({
+            'cleaning_report': cleaning_report,
+            'preview_data': records_for_json(cleaned_df.head(Config.PREVIEW_ROWS)),
+            'preview_columns': cleaned_df.columns.tolist(),
+            'total_rows': len(cleaned_df)
+        })
+        self._progress('clean', 'completed', cleaned_df.shape)
+
+        #analyze the data
+        self._progress('analyze', 'running')
+        profile = DataProfile(cleaned_df, mode=self.profile_mode, duplicate_rows=cleaner.duplicate_rows)
+        analyzer = DataAnalyzer(cleaned_df, profile=profile)
+        self.result['analysis'] = analyzer.analyze()
+        self._progress('analyze', 'completed', cleaned_df.shape)
+
+        #describe the charts; images are rendered when first requested from /api/chart,
+        #or in data mode the charts carry their aggregates and are never rendered
+        self._progress('visualize', 'running')
+        visualizer = DataVisualizer(cleaned_df, profile=analyzer.profile, mode=self.chart_mode)
+        self.result['visualizations'] = visualizer.generate_visualizations(chart_store=self.chart_store)
+        self._progress('visualize', 'completed', cleaned_df.shape)
+
+        #save cleaned CSV for download, plus a memory-mappable columnar copy so
+        #follow-up requests load only the columns they need instead of re-parsing CSV
+        self._progress('save', 'running')
+        cleaned_df.to_csv(self.cleaned_filepath, index=False)
+        data_filepath = self.data_filepath if save_columnar(cleaned_df, self.data_filepath) else None
+        self.session_store.put(self.session_id, {
+            'original_file': self.file_path,
+            'cleaned_file': self.cleaned_filepath,
+            'data_file': data_filepath,
+            'original_filename': self.original_filename
+        })
+
+        if cache_key is not None:
+            cached_result = {key: value for key, value in self.result.items() if key != 'session_id'}
+            self.result_cache.put(
+                cache_key, cached_result, self.cleaned_filepath,
+                data_file=data_filepath, chart_folder=self.chart_store.folder, dumps=self.dumps
+            )
+
+        self.result['cache_hit'] = False
+        self._progress('save', 'completed', cleaned_df.shape)
+
+        return self.result
+
+    def _use_cached(self, cached_result, cached_cleaned_file, cached_data_file, cached_chart_folder):
+        """Serve a cached result under this upload's session"""
+        ResultCache.link_or_copy(cached_cleaned_file, self.cleaned_filepath)
+        if cached_chart_folder is not None:
+            ChartStore(cached_chart_folder).copy_to(self.chart_store)
+        data_filepath = None
+        if cached_data_file is not None:
+            ResultCache.link_or_copy(cached_data_file, self.data_filepath)
+            data_filepath = self.data_filepath
+
+        self.session_store.put(self.session_id, {
+            'original_file': self.file_path,
+            'cleaned_file': self.cleaned_filepath,
+            'data_file': data_filepath,
+            'original_filename': self.original_filename
+        })
+
+        self.result.update({
+            **cached_result,
+            'session_id': self.session_id,
+            'original_filename': self.original_filename,
+            'cache_hit': True
+        })
+        for stage in self.STAGES:
+            self._progress(stage, 'cached')
+
+        return self.result
+
+    def _progress(self, stage, status, shape=None):
+        if self.recorder is not None:
+            if status == 'running':
+                self.recorder.start(stage)
+            elif status in ('completed', 'failed'):
+                self.recorder.finish(stage, shape)
+        if self.on_progress is not None:
+            self.on_progress(stage, status, self.result)
+
@@ -0,0 +1,130 @@
+import os
+import json
+import shutil
+import hashlib
+import tempfile
+import threading
+from backend.config.config import Config
+from backend.scripts.columnar import DATA_EXTENSION
+
+
+class ResultCache:
+    """
+    Disk cache of processed uploads keyed by file content and pipeline options.
+    Each entry is a directory holding the response JSON, the cleaned CSV,
+    the chart render specs and, when one was written, the columnar copy of
+    the cleaned data; entries are evicted least-recently-used first once the cache outgrows
+    its size limit.
+    """
+
+    RESULT_FILE = 'result.json'
+    CLEANED_FILE = 'cleaned.csv'
+    DATA_FILE = 'cleaned' + DATA_EXTENSION
+    CHART_FOLDER = 'charts'
+
+    def __init__(self, folder=None, max_bytes=None):
+        self.folder = folder or Config.CACHE_FOLDER
+        self.max_bytes = Config.CACHE_MAX_BYTES if max_bytes is None else max_bytes
+        self._lock = threading.Lock()
+        os.makedirs(self.folder, exist_ok=True)
+
+    @staticmethod
+    def hash_file(file_path, block_size=1024 * 1024):
+        """Hash a file in fixed-size blocks so large uploads aren't read into memory"""
+        digest = hashlib.sha256()
+        with open(file_path, 'rb') as f:
+            for block in iter(lambda: f.read(block_size), b''):
+                digest.update(block)
+        return digest.hexdigest()
+
+    @staticmethod
+    def make_key(content_hash, options=None):
+        """Combine the content hash with the options and pipeline version that shaped the result"""
+        fingerprint = json.dumps({
+            'content': content_hash,
+            'options': options or {},
+            'version': Config.PIPELINE_VERSION
+        }, sort_keys=True)
+        return hashlib.sha256(fingerprint.encode('utf-8')).hexdigest()
+
+    def get(self, key):
+        """
+        Return (result, cleaned_file_path, data_file_path or None, chart_folder or None)
+        for a cached key, or None
+        """
+        entry = os.path.join(self.folder, key)
+        result_path = os.path.join(entry, self.RESULT_FILE)
+
+        try:
+            with open(result_path, 'r', encoding='utf-8') as f:
+                result = json.load(f)
+            #mark as recently used
+            os.utime(entry)
+        except (OSError, ValueError):
+            return None
+
+        data_path = os.path.join(entry, self.DATA_FILE)
+        chart_folder = os.path.join(entry, self.CHART_FOLDER)
+        return (
+            result,
+            os.path.join(entry, self.CLEANED_FILE),
+            data_path if os.path.exists(data_path) else None,
+            chart_folder if os.path.isdir(chart_folder) else None
+        )
+
+    def put(self, key, result, cleaned_file, data_file=None, chart_folder=None, dumps=json.dumps):
+        """Store a result and copies of its cleaned data files and chart specs, then evict old entries"""
+        entry = os.path.join(self.folder, key)
+        if os.path.isdir(entry):
+            return
+
+        #build the entry next to its final location and move it into place in one step
+        staging = tempfile.mkdtemp(dir=self.folder, prefix='.staging-')
+        try:
+            with open(os.path.join(staging, self.RESULT_FILE), 'w', encoding='utf-8') as f:
+                f.write(dumps(result))
+            shutil.copyfile(cleaned_file, os.path.join(staging, self.CLEANED_FILE))
+            if data_file is not None:
+                shutil.copyfile(data_file, os.path.join(staging, self.DATA_FILE))
+            if chart_folder is not None and os.path.isdir(chart_folder):
+                shutil.copytree(chart_folder, os.path.join(staging, self.CHART_FOLDER))
+            os.rename(staging, entry)
+        except OSError:
+            #another worker stored the same key first
+            shutil.rmtree(staging, ignore_errors=True)
+            return
+
+        self.evict()
+
+    @staticmethod
+    def link_or_copy(source, destination):
+        """Hard-link a cached file into place (falling back to a copy) so eviction can't remove it"""
+        try:
+            os.link(source, destination)
+        except OSError:
+            shutil.copyfile(source, destination)
+
+    def evict(self):
+        """Delete least recently used entries until the cache fits its size limit"""
+        with self._lock:
+            entries = []
+            for name in os.listdir(self.folder):
+                path = os.path.join(self.folder, name)
+                if name.startswith('.') or not os.path.isdir(path):
+                    continue
+                try:
+                    size = sum(
+                        os.path.getsize(os.path.join(folder, file_name))
+                        for folder, _, file_names in os.walk(path)
+                        for file_name in file_names
+                    )
+                    entries.append((os.path.getmtime(path), size, path))
+                except OSError:
+                    continue
+
+            total = sum(size for _, size, _ in entries)
+            for _, size, path in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                shutil.rmtree(path, ignore_errors=True)
+                total -= size
@@ -0,0 +1,151 @@
+import math
+import numpy as np
+import pandas as pd
+from backend.config.config import Config
+
+
+def hash_values(values):
+    """64-bit hashes of a Series of non-null values"""
+    return pd.util.hash_pandas_object(values, index=False, categorize=False).to_numpy()
+
+
+class HyperLogLog:
+    """Mergeable distinct-count estimator over 64-bit value hashes"""
+
+    def __init__(self, precision=None):
+        #precision below 11 would leave more than 53 hash bits, which frexp can't rank exactly
+        self.precision = min(max(precision or Config.HLL_PRECISION, 11), 18)
+        self.registers = np.zeros(1 << self.precision, dtype=np.uint8)
+
+    def update(self, hashes):
+        """Add an array of uint64 hashes"""
+        if len(hashes) == 0:
+            return self
+        tail_bits = 64 - self.precision
+        index = (hashes >> np.uint64(tail_bits)).astype(np.intp)
+        tail = (hashes & np.uint64((1 << tail_bits) - 1)).astype(np.float64)
+        #frexp gives the bit length of the tail, so rank = leading zeros + 1
+        _, bit_length = np.frexp(tail)
+        rank = (tail_bits - bit_length + 1).astype(np.uint8)
+        np.maximum.at(self.registers, index, rank)
+        return self
+
+    def merge(self, other):
+        """Fold another sketch with the same precision into this one"""
+        np.maximum(self.registers, other.registers, out=self.registers)
+        return self
+
+    def estimate(self):
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / np.sum(np.ldexp(1.0, -self.registers.astype(np.int64)))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if estimate <= 2.5 * m and zeros > 0:
+            #linear counting is more accurate for small cardinalities
+            estimate = m * math.log(m / zeros)
+        return int(round(estimate))
+
+    @property
+    def relative_error(self):
+        """Standard error of the estimate relative to the true count"""
+        return 1.04 / math.sqrt(len(self.registers))
+
+
+class SpaceSaving:
+    """
+    Mergeable top-k summary keyed by value hash.
+    Counts are upper bounds; any value not kept occurred at most `floor`
+    times, and no kept count is overstated by more than `floor`.
+    """
+
+    def __init__(self, capacity=None):
+        self.capacity = capacity or Config.HEAVY_HITTER_CAPACITY
+        self.counts = {}
+        self.values = {}
+        self.floor = 0
+
+    def update(self, values, hashes=None):
+        """Add a chunk of values (Series); pass hashes of the non-null values if already computed"""
+        if hashes is None:
+            values = values.dropna()
+            hashes = hash_values(values)
+        if len(hashes) == 0:
+            return self
+
+        codes, keys = pd.factorize(hashes)
+        counts = np.bincount(codes)
+        #codes are numbered by first appearance, so a running max marks each first occurrence
+        first_index = np.flatnonzero(np.diff(np.maximum.accumulate(codes), prepend=-1))
+
+        chunk = SpaceSaving(self.capacity)
+        if len(keys) > self.capacity:
+            order = np.argsort(counts, kind='stable')[::-1]
+            chunk.floor = int(counts[order[self.capacity]])
+            order = order[:self.capacity]
+            keys, first_index, counts = keys[order], first_index[order], counts[order]
+        chunk.counts = dict(zip(keys.tolist(), counts.tolist()))
+        chunk.values = dict(zip(keys.tolist(), values.iloc[first_index].tolist()))
+
+        return self.merge(chunk)
+
+    def merge(self, other):
+        """Fold another summary into this one"""
+        counts = {}
+        #dicts keep first-seen order, so ties rank in order of appearance
+        for key in [*self.counts, *other.counts]:
+            counts[key] = self.counts.get(key, self.floor) + other.counts.get(key, other.floor)
+        floor = self.floor + other.floor
+
+        if len(counts) > self.capacity:
+            ranked = sorted(counts, key=counts.get, reverse=True)
+            floor = max(floor, counts[ranked[self.capacity]])
+            counts = {key: counts[key] for key in ranked[:self.capacity]}
+
+        values = {**other.values, **self.values}
+        self.counts = counts
+        self.values = {key: values[key] for key in counts}
+        self.floor = floor
+        return self
+
+    def top(self, n=None):
+        """Most common values as a Series of estimated counts, largest first"""
+        ranked = sorted(self.counts, key=self.counts.get, reverse=True)[:n]
+        return pd.Series(
+            [self.counts[key] for key in ranked],
+            index=[self.values[key] for key in ranked],
+            dtype='int64'
+        )
+
+    @property
+    def is_exact(self):
+        return self.floor == 0
+
+
+class ColumnSketch:
+    """Distinct count and heavy hitters for one column, updated chunk by chunk"""
+
+    def __init__(self):
+        self.distinct = HyperLogLog()
+        self.heavy_hitters = SpaceSaving()
+
+    def update(self, values):
+        values = values.dropna()
+        hashes = hash_values(values)
+        self.distinct.update(hashes)
+        self.heavy_hitters.update(values, hashes)
+        return self
+
+    def merge(self, other):
+        self.distinct.merge(other.distinct)
+        self.heavy_hitters.merge(other.heavy_hitters)
+        return self
+
+    def distinct_count(self):
+        """Exact when every value fit in the heavy-hitter summary, else the HLL estimate"""
+        if self.heavy_hitters.is_exact:
+            return len(self.heavy_hitters.counts)
+        return self.distinct.estimate()
+
+    @property
+    def distinct_error(self):
+        return 0.0 if self.heavy_hitters.is_exact else self.distinct.relative_error
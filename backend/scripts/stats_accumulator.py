@@ -0,0 +1,227 @@
+import math
+import numpy as np
+import pandas as pd
+from backend.config.config import Config
+
+
+class QuantileSketch:
+    """
+    Mergeable KLL-style quantile sketch.
+    Items on level h stand for 2**h original values; a level that outgrows
+    its capacity is sorted and every other item is promoted, so memory stays
+    around 3k items. Results are exact until the first compaction.
+    """
+
+    def __init__(self, k=None):
+        self.k = k or Config.QUANTILE_SKETCH_K
+        self.levels = [np.empty(0)]
+        self.count = 0
+        self._rng = np.random.default_rng(0)
+
+    def update(self, values):
+        """Add a 1-d float array of non-null values"""
+        if len(values) == 0:
+            return
+        self.count += len(values)
+        self.levels[0] = np.concatenate([self.levels[0], values])
+        self._compress()
+
+    def merge(self, other):
+        """Fold another sketch into this one"""
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0))
+        for height, items in enumerate(other.levels):
+            self.levels[height] = np.concatenate([self.levels[height], items])
+        self.count += other.count
+        self._compress()
+
+    def quantile(self, q):
+        """Estimate the q-th quantile (linear interpolation while still exact)"""
+        if self.count == 0:
+            return float('nan')
+        if self.is_exact:
+            return float(np.quantile(self.levels[0], q))
+
+        items, weights = self._weighted_items()
+        cumulative = np.cumsum(weights)
+        position = np.searchsorted(cumulative, q * cumulative[-1], side='left')
+        return float(items[min(position, len(items) - 1)])
+
+    def rank(self, value, inclusive=False):
+        """Estimate how many values are below (or at, if inclusive) the given value"""
+        total = 0
+        for height, items in enumerate(self.levels):
+            below = items <= value if inclusive else items < value
+            total += int(np.count_nonzero(below)) << height
+        return total
+
+    @property
+    def is_exact(self):
+        return len(self.levels) == 1
+
+    @property
+    def rank_error(self):
+        """
+        Rough bound on the normalized rank error of quantile and rank.
+        Measured errors are typically about half of it.
+        """
+        return 0.0 if self.is_exact else 4 / self.k
+
+    def _capacity(self, height):
+        depth = len(self.levels) - height - 1
+        return max(8, int(math.ceil(self.k * (2 / 3) ** depth)))
+
+    def _compress(self):
+        height = 0
+        while height < len(self.levels):
+            items = self.levels[height]
+            if len(items) > self._capacity(height):
+                if height + 1 == len(self.levels):
+                    self.levels.append(np.empty(0))
+                items = np.sort(items)
+                #an odd item stays behind so total weight is preserved
+                odd = len(items) % 2
+                promoted = items[odd:][self._rng.integers(2)::2]
+                self.levels[height] = items[:odd]
+                self.levels[height + 1] = np.concatenate([self.levels[height + 1], promoted])
+            height += 1
+
+    def _weighted_items(self):
+        items = np.concatenate(self.levels)
+        weights = np.concatenate([
+            np.full(len(level), 1 << height, dtype=np.int64)
+            for height, level in enumerate(self.levels)
+        ])
+        order = np.argsort(items, kind='stable')
+        return items[order], weights[order]
+
+
+class StatsAccumulator:
+    """
+    Single-pass, mergeable summary of a numeric column.
+    Central moments are combined chunk by chunk (Welford/Pebay update), so
+    mean, std, skewness and kurtosis match pandas without a second scan,
+    and quartiles come from a QuantileSketch.
+    """
+
+    def __init__(self, k=None):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.m3 = 0.0
+        self.m4 = 0.0
+        self.min = float('inf')
+        self.max = float('-inf')
+        self.sketch = QuantileSketch(k)
+
+    def update(self, values):
+        """Add a chunk of values (Series or array); nulls are ignored"""
+        if isinstance(values, pd.Series):
+            values = values.to_numpy(dtype=np.float64, na_value=np.nan)
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            return self
+
+        chunk = StatsAccumulator(self.sketch.k)
+        chunk.count = len(values)
+        chunk.mean = float(values.mean())
+        deltas = values - chunk.mean
+        squared = deltas * deltas
+        chunk.m2 = float(squared.sum())
+        chunk.m3 = float((squared * deltas).sum())
+        chunk.m4 = float((squared * squared).sum())
+        chunk.min = float(values.min())
+        chunk.max = float(values.max())
+        chunk.sketch.update(values)
+
+        return self.merge(chunk)
+
+    def merge(self, other):
+        """Fold another accumulator into this one"""
+        if other.count == 0:
+            return self
+        if self.count == 0:
+            self.count, self.mean = other.count, other.mean
+            self.m2, self.m3, self.m4 = other.m2, other.m3, other.m4
+            self.min, self.max = other.min, other.max
+            self.sketch.merge(other.sketch)
+            return self
+
+        n_a, n_b = self.count, other.count
+        n = n_a + n_b
+        delta = other.mean - self.mean
+        delta2 = delta * delta
+
+        m2 = self.m2 + other.m2 + delta2 * n_a * n_b / n
+        m3 = (self.m3 + other.m3
+              + delta * delta2 * n_a * n_b * (n_a - n_b) / (n * n)
+              + 3 * delta * (n_a * other.m2 - n_b * self.m2) / n)
+        m4 = (self.m4 + other.m4
+              + delta2 * delta2 * n_a * n_b * (n_a * n_a - n_a * n_b + n_b * n_b) / (n ** 3)
+              + 6 * delta2 * (n_a * n_a * other.m2 + n_b * n_b * self.m2) / (n * n)
+              + 4 * delta * (n_a * other.m3 - n_b * self.m3) / n)
+
+        self.count = n
+        self.mean += delta * n_b / n
+        self.m2, self.m3, self.m4 = m2, m3, m4
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self.sketch.merge(other.sketch)
+        return self
+
+    def std(self):
+        """Sample standard deviation (ddof=1, as pandas)"""
+        if self.count < 2:
+            return float('nan')
+        return math.sqrt(self.m2 / (self.count - 1))
+
+    def skewness(self):
+        """Bias-corrected sample skewness, as Series.skew"""
+        n = self.count
+        if n < 3:
+            return float('nan')
+        if self.m2 == 0:
+            return 0.0
+        return (n * (n - 1) ** 0.5 / (n - 2)) * (self.m3 / self.m2 ** 1.5)
+
+    def kurtosis(self):
+        """Bias-corrected excess kurtosis, as Series.kurtosis"""
+        n = self.count
+        if n < 4:
+            return float('nan')
+        denominator = (n - 2) * (n - 3) * self.m2 ** 2
+        if denominator == 0:
+            return 0.0
+        adjustment = 3 * (n - 1) ** 2 / ((n - 2) * (n - 3))
+        return n * (n + 1) * (n - 1) * self.m4 / denominator - adjustment
+
+    def quantile(self, q):
+        return self.sketch.quantile(q)
+
+    def outliers_count(self):
+        """Count values outside 1.5 IQR of the sketched quartiles"""
+        if self.count == 0:
+            return 0
+        q1, q3 = self.quantile(0.25), self.quantile(0.75)
+        iqr = q3 - q1
+        below = self.sketch.rank(q1 - 1.5 * iqr)
+        above = self.count - self.sketch.rank(q3 + 1.5 * iqr, inclusive=True)
+        return below + above
+
+    def summary(self):
+        """Return the numeric statistics reported by DataAnalyzer"""
+        empty = self.count == 0
+        return {
+            'count': int(self.count),
+            'mean': float('nan') if empty else self.mean,
+            'median': self.quantile(0.5),
+            'std': self.std(),
+            'min': float('nan') if empty else self.min,
+            'max': float('nan') if empty else self.max,
+            'q25': self.quantile(0.25),
+            'q75': self.quantile(0.75),
+            'skewness': self.skewness(),
+            'kurtosis': self.kurtosis(),
+            'outliers_count': int(self.outliers_count())
+        }
@@ -0,0 +1,118 @@
+import os
+import uuid
+import hashlib
+from flask import Request
+from werkzeug.utils import secure_filename
+from backend.config.config import Config
+from backend.scripts.csv_validator import CSVValidator
+from backend.scripts.data_loader import DataLoader, DataLoaderError
+from backend.scripts.compression import DecompressionError, available, decompress_head, split_compression
+
+
+class UploadRejected(Exception):
+    """Raised while an upload is still being received to stop reading its body"""
+
+
+class UploadStream:
+    """
+    Target for one uploaded file that writes straight to its final path in
+    the upload folder, hashing the bytes as they arrive and sniffing the
+    first Config.SNIFF_BYTES so a bad file is rejected before the rest of
+    the request body is read. Compressed uploads are stored as sent and
+    their decompressed head is sniffed. The file is deleted on close unless claimed.
+    """
+
+    def __init__(self, folder, filename):
+        self.upload_id = str(uuid.uuid4())
+        self.filename = secure_filename(filename)
+        self.path = os.path.join(folder, f"{self.upload_id}_{self.filename}")
+        self.compression = split_compression(self.filename)[1]
+        self.delimiter = None
+        self.size = 0
+        self.claimed = False
+
+        self._file = open(self.path, 'w+b')
+        self._digest = hashlib.sha256()
+        self._head = bytearray()
+
+    @property
+    def content_hash(self):
+        return self._digest.hexdigest()
+
+    def write(self, data):
+        if self._head is not None:
+            self._head += data
+            if len(self._head) >= Config.SNIFF_BYTES:
+                self._sniff(final=False)
+
+        self._digest.update(data)
+        self._file.write(data)
+        self.size += len(data)
+        return len(data)
+
+    def seek(self, offset, whence=0):
+        #the form parser rewinds once the whole part has been written
+        if self._head is not None:
+            self._sniff(final=True)
+        self._file.flush()
+        return self._file.seek(offset, whence)
+
+    def tell(self):
+        return self._file.tell()
+
+    def read(self, size=-1):
+        return self._file.read(size)
+
+    def readline(self, size=-1):
+        return self._file.readline(size)
+
+    def flush(self):
+        self._file.flush()
+
+    def claim(self):
+        """Keep the file after the request ends"""
+        self.claimed = True
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
+        if not self.claimed and os.path.exists(self.path):
+            os.remove(self.path)
+
+    def _sniff(self, final):
+        head, self._head = bytes(self._head), None
+        try:
+            if self.compression:
+                head = decompress_head(head, self.compression, Config.SNIFF_BYTES)
+                final = final and len(head) < Config.SNIFF_BYTES
+            self.delimiter = DataLoader.sniff(head[:Config.SNIFF_BYTES], final=final)
+        except (DataLoaderError, DecompressionError) as e:
+            self.close()
+            raise UploadRejected(str(e))
+
+
+class UploadRequest(Request):
+    """Request that streams uploaded CSV files to the upload folder instead of spooling them"""
+
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        #no file chosen; the upload route reports it
+        if not filename:
+            return super()._get_file_stream(total_content_length, content_type, filename, content_length)
+
+        if not CSVValidator.allowed_file(filename):
+            raise UploadRejected('Invalid file type. Only CSV files are allowed')
+
+        compression = split_compression(filename)[1]
+        if compression and not available(compression):
+            raise UploadRejected(f'{compression} compressed uploads are not supported on this server')
+
+        os.makedirs(Config.UPLOAD_FOLDER, exist_ok=True)
+        stream = UploadStream(Config.UPLOAD_FOLDER, filename)
+        self.__dict__.setdefault('_upload_streams', []).append(stream)
+        return stream
+
+    def close(self):
+        super().close()
+        #also covers streams whose part never finished parsing
+        for stream in self.__dict__.get('_upload_streams', ()):
+            stream.close()
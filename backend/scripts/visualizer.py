@@ -1,306 +1,323 @@
+import time
 import pandas as pd
 import numpy as np
-import matplotlib
-matplotlib.use('Agg')  #Non-interactive backend
-import matplotlib.pyplot as plt
-import seaborn as sns
-import io
-import base64
-from datetime import datetime
+from backend.config.config import Config
+from backend.scripts.column_profile import DataProfile
+from backend.scripts import downsampling
+from backend.scripts import chart_renderer
+from backend.scripts.chart_renderer import ChartRenderer
+from backend.scripts.chart_data import chart_data
+from backend.scripts.metrics import metrics
 
 class DataVisualizer:
-    """Generate visualizations for CSV data"""
+    """
+    Generate visualizations for CSV data.
+    Each _create_* method returns (label, chart description, render function, args)
+    jobs whose args are already reduced to the summaries the chart draws.
+    In 'data' mode nothing is rendered: each chart carries those summaries
+    as 'data' for the frontend to plot.
+    """
 
-    def __init__(self, df):
+    MODES = ('image', 'data')
+
+    def __init__(self, df, profile=None, renderer=None, mode='image'):
         self.df = df
-        #Set style
-        sns.set_style("whitegrid")
-        plt.rcParams['figure.figsize'] = (10, 6)
-
-    def generate_visualizations(self):
-        """Generate all relevant visualizations"""
-        visualizations = {
-            'distribution_charts': self._create_distribution_charts(),
-            'correlation_heatmap': self._create_correlation_heatmap(),
-            'categorical_charts': self._create_categorical_charts(),
-            'time_series_charts': self._create_time_series_charts(),
-            'relationship_charts': self._create_relationship_charts()
+        self.profile = profile or DataProfile(df)
+        self.mode = mode
+        #client-side charts get a smaller point budget to keep the response small
+        self.max_points = Config.CHART_DATA_POINTS if mode == 'data' else Config.MAX_PLOT_POINTS
+        self.renderer = None
+        if mode == 'image':
+            self.renderer = renderer or ChartRenderer()
+
+    def generate_visualizations(self, chart_store=None):
+        """
+        Generate all relevant visualizations.
+        In data mode each chart carries its aggregates as 'data'. Otherwise,
+        with a chart_store, each chart's render spec is saved there and the
+        chart carries an 'id' to fetch its image by, so nothing is rendered
+        now; without one, every chart is rendered here and embedded as base64.
+        """
+        builders = {
+            'distribution_charts': self._create_distribution_charts,
+            'correlation_heatmap': self._create_correlation_heatmap,
+            'categorical_charts': self._create_categorical_charts,
+            'time_series_charts': self._create_time_series_charts,
+            'relationship_charts': self._create_relationship_charts
         }
+        sections = {}
+        for name, build in builders.items():
+            start = time.perf_counter()
+            sections[name] = build()
+            metrics.observe('chart_prepare_seconds', time.perf_counter() - start, section=name)
+
+        if self.mode == 'data':
+            visualizations = self._chart_data(sections)
+        elif chart_store is not None:
+            visualizations = self._save_charts(sections, chart_store)
+        else:
+            visualizations = self._render_charts(sections)
+
+        #single heatmap rather than a list
+        heatmaps = visualizations['correlation_heatmap']
+        visualizations['correlation_heatmap'] = heatmaps[0] if heatmaps else None
 
         return visualizations
 
-    def _create_distribution_charts(self):
-        """Create histograms and box plots for numeric columns"""
-        charts = []
-        numeric_cols = self.df.select_dtypes(include=[np.number]).columns
-
-        for column in numeric_cols[:6]:  #Limit to first 6 numeric columns
-            try:
-                #Histogram
-                fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 5))
-
-                #Histogram
-                ax1.hist(self.df[column].dropna(), bins=30, color='skyblue', edgecolor='black', alpha=0.7)
-                ax1.set_xlabel(column)
-                ax1.set_ylabel('Frequency')
-                ax1.set_title(f'Distribution of {column}')
-                ax1.grid(True, alpha=0.3)
+    def _chart_data(self, sections):
+        """Chart descriptions with the aggregates each chart draws"""
+        return {
+            name: [{**chart, 'data': chart_data(func, args)} for _, chart, func, args in section_jobs]
+            for name, section_jobs in sections.items()
+        }
 
-                #Box plot
-                ax2.boxplot(self.df[column].dropna(), vert=True)
-                ax2.set_ylabel(column)
-                ax2.set_title(f'Box Plot of {column}')
-                ax2.grid(True, alpha=0.3)
+    def _save_charts(self, sections, chart_store):
+        """Chart descriptions with ids, their render specs saved for rendering on request"""
+        visualizations = {}
+        counts = {}
+        for name, section_jobs in sections.items():
+            charts = []
+            for label, chart, func, args in section_jobs:
+                index = counts.get(chart['type'], 0)
+                counts[chart['type']] = index + 1
+                chart_id = f"{chart['type']}_{index}"
+                chart_store.save(chart_id, label, func, args)
+                charts.append({'id': chart_id, **chart})
+            visualizations[name] = charts
+        return visualizations
 
-                plt.tight_layout()
+    def _render_charts(self, sections):
+        """Chart descriptions with base64 images, rendered in one parallel batch"""
+        jobs = [(label, func, args) for section_jobs in sections.values() for label, _, func, args in section_jobs]
+        results = iter(self.renderer.render(jobs))
+
+        visualizations = {}
+        for name, section_jobs in sections.items():
+            charts = []
+            for _, chart, _, _ in section_jobs:
+                png = next(results)
+                if png is not None:
+                    charts.append({**chart, 'image': chart_renderer.png_to_base64(png)})
+            visualizations[name] = charts
+        return visualizations
 
-                charts.append({
-                    'column': column,
-                    'type': 'distribution',
-                    'image': self._fig_to_base64(fig),
-                    'description': f'Distribution and box plot for {column}'
-                })
+    def _create_distribution_charts(self):
+        """Create histograms and box plots for numeric columns"""
+        #box statistics only need matplotlib's cbook, not its plotting machinery
+        from matplotlib import cbook
 
-                plt.close(fig)
+        jobs = []
+        numeric_cols = self.profile.numeric_columns
 
+        for column in numeric_cols[:6]:  #Limit to first 6 numeric columns
+            label = f'distribution chart for {column}'
+            try:
+                values = self.df[column].to_numpy(dtype=np.float64, na_value=np.nan)
+                #infinities have no place on a histogram axis
+                values = values[np.isfinite(values)]
+                if len(values) == 0:
+                    continue
+
+                #bins and box statistics are computed here so only summaries reach the renderer
+                histogram = np.histogram(values, bins=30)
+                box_stats = cbook.boxplot_stats(values)[0]
+                sampling = None
+                fliers = box_stats['fliers']
+                if len(fliers) > self.max_points:
+                    keep = np.random.default_rng(0).choice(len(fliers), self.max_points, replace=False)
+                    box_stats['fliers'] = fliers[np.sort(keep)]
+                    sampling = {'method': 'random_fliers', 'points': self.max_points, 'total_points': len(fliers)}
+
+                jobs.append((
+                    label,
+                    self._describe({
+                        'column': column,
+                        'type': 'distribution',
+                        'description': f'Distribution and box plot for {column}'
+                    }, sampling),
+                    chart_renderer.render_distribution,
+                    (column, histogram, box_stats)
+                ))
             except Exception as e:
-                print(f"Error creating distribution chart for {column}: {e}")
+                print(f"Error creating {label}: {e}")
 
-        return charts
+        return jobs
 
     def _create_correlation_heatmap(self):
         """Create correlation heatmap for numeric columns"""
-        numeric_df = self.df.select_dtypes(include=[np.number])
-
-        if len(numeric_df.columns) < 2:
-            return None
+        if len(self.profile.numeric_columns) < 2:
+            return []
 
         try:
-            fig, ax = plt.subplots(figsize=(12, 10))
-
-            #Calculate correlation matrix
-            corr_matrix = numeric_df.corr()
-
-            #Create heatmap
-            sns.heatmap(
-                corr_matrix,
-                annot=True,
-                fmt='.2f',
-                cmap='coolwarm',
-                center=0,
-                square=True,
-                linewidths=1,
-                cbar_kws={"shrink": 0.8},
-                ax=ax
-            )
-
-            ax.set_title('Correlation Heatmap', fontsize=16, fontweight='bold')
-            plt.tight_layout()
-
-            result = {
-                'type': 'correlation_heatmap',
-                'image': self._fig_to_base64(fig),
-                'description': 'Correlation matrix showing relationships between numeric variables'
-            }
-
-            plt.close(fig)
-            return result
-
+            #shared with the analysis, so the matrix is computed once per upload
+            correlations = self.profile.correlations
+            total_columns = len(correlations.columns)
+
+            #wide tables keep the most correlated columns so the heatmap stays legible and quick to draw
+            sampling = None
+            if total_columns > Config.HEATMAP_MAX_COLUMNS:
+                corr_matrix = correlations.clustered(Config.HEATMAP_MAX_COLUMNS)
+                sampling = {
+                    'method': 'top_correlated_clustered',
+                    'points': Config.HEATMAP_MAX_COLUMNS,
+                    'total_points': total_columns
+                }
+            else:
+                corr_matrix = correlations.frame
         except Exception as e:
             print(f"Error creating correlation heatmap: {e}")
-            return None
+            return []
+
+        return [(
+            'correlation heatmap',
+            self._describe({
+                'type': 'correlation_heatmap',
+                'description': 'Correlation matrix showing relationships between numeric variables'
+            }, sampling),
+            chart_renderer.render_correlation_heatmap,
+            (corr_matrix,)
+        )]
 
     def _create_categorical_charts(self):
         """Create bar charts and pie charts for categorical columns"""
-        charts = []
-        categorical_cols = self.df.select_dtypes(include=['object']).columns
+        jobs = []
+        categorical_cols = self.profile.categorical_columns
 
         for column in categorical_cols[:4]:  #Limit to first 4 categorical columns
-            unique_count = self.df[column].nunique()
-
-            #Only visualize if reasonable number of categories
-            if unique_count <= 15:
-                try:
-                    value_counts = self.df[column].value_counts().head(10)
-
-                    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(16, 6))
-
-                    #Bar chart
-                    value_counts.plot(kind='bar', ax=ax1, color='steelblue', edgecolor='black')
-                    ax1.set_xlabel(column)
-                    ax1.set_ylabel('Count')
-                    ax1.set_title(f'Top Categories in {column}')
-                    ax1.tick_params(axis='x', rotation=45)
-                    ax1.grid(True, alpha=0.3)
-
-                    #Pie chart (top 8 only for readability)
-                    top_8 = value_counts.head(8)
-                    if len(value_counts) > 8:
-                        other_sum = value_counts.iloc[8:].sum()
-                        top_8['Other'] = other_sum
-
-                    colors = sns.color_palette('pastel')[0:len(top_8)]
-                    ax2.pie(
-                        top_8.values,
-                        labels=top_8.index,
-                        autopct='%1.1f%%',
-                        startangle=90,
-                        colors=colors
-                    )
-                    ax2.set_title(f'Distribution of {column}')
-
-                    plt.tight_layout()
-
-                    charts.append({
-                        'column': column,
-                        'type': 'categorical',
-                        'image': self._fig_to_base64(fig),
-                        'description': f'Category distribution for {column}'
-                    })
-
-                    plt.close(fig)
-
-                except Exception as e:
-                    print(f"Error creating categorical chart for {column}: {e}")
+            label = f'categorical chart for {column}'
+            try:
+                unique_count = self.profile[column].unique_count
+
+                #Only visualize if reasonable number of categories
+                if unique_count <= 15:
+                    value_counts = self.profile.value_counts(column).head(10)
+                    jobs.append((
+                        label,
+                        {
+                            'column': column,
+                            'type': 'categorical',
+                            'description': f'Category distribution for {column}'
+                        },
+                        chart_renderer.render_categorical,
+                        (column, value_counts)
+                    ))
+            except Exception as e:
+                print(f"Error creating {label}: {e}")
 
-        return charts
+        return jobs
 
     def _create_time_series_charts(self):
         """Create time series charts if datetime columns exist"""
-        charts = []
-        date_columns = self.df.select_dtypes(include=['datetime64']).columns
+        jobs = []
+        date_columns = self.profile.datetime_columns
 
         if len(date_columns) == 0:
-            return charts
+            return jobs
 
-        numeric_cols = self.df.select_dtypes(include=[np.number]).columns
+        numeric_cols = self.profile.numeric_columns
 
         for date_col in date_columns[:2]:  #Limit to first 2 date columns
+            #Sort the date column once for all numeric columns
+            dates = self.df[date_col].to_numpy()
+            order = np.argsort(dates, kind='stable')
+            dates = dates[order]
+
             for num_col in numeric_cols[:3]:  #Plot first 3 numeric columns
+                label = f'time series chart for {date_col} vs {num_col}'
                 try:
-                    #Sort by date
-                    sorted_df = self.df.sort_values(by=date_col)
-
-                    fig, ax = plt.subplots(figsize=(14, 6))
-
-                    ax.plot(
-                        sorted_df[date_col],
-                        sorted_df[num_col],
-                        marker='o',
-                        linestyle='-',
-                        linewidth=2,
-                        markersize=4,
-                        color='steelblue'
+                    values = self.df[num_col].to_numpy(dtype=np.float64, na_value=np.nan)[order]
+                    present = np.isfinite(values) & ~pd.isna(dates)
+                    x, y = dates[present], values[present]
+                    if len(x) == 0:
+                        continue
+
+                    #reduce to the point budget while keeping the shape of the series
+                    keep = downsampling.reduce_time_series(
+                        x.astype('int64').astype(np.float64), y,
+                        self.max_points, Config.TIME_SERIES_REDUCTION
                     )
-
-                    ax.set_xlabel(date_col, fontsize=12)
-                    ax.set_ylabel(num_col, fontsize=12)
-                    ax.set_title(f'{num_col} over {date_col}', fontsize=14, fontweight='bold')
-                    ax.grid(True, alpha=0.3)
-                    plt.xticks(rotation=45)
-                    plt.tight_layout()
-
-                    charts.append({
-                        'columns': [date_col, num_col],
-                        'type': 'time_series',
-                        'image': self._fig_to_base64(fig),
-                        'description': f'Time series: {num_col} over {date_col}'
-                    })
-
-                    plt.close(fig)
-
+                    sampling = None
+                    if len(keep) < len(x):
+                        sampling = {'method': Config.TIME_SERIES_REDUCTION, 'points': len(keep), 'total_points': len(x)}
+
+                    jobs.append((
+                        label,
+                        self._describe({
+                            'columns': [date_col, num_col],
+                            'type': 'time_series',
+                            'description': f'Time series: {num_col} over {date_col}'
+                        }, sampling),
+                        chart_renderer.render_time_series,
+                        (date_col, num_col, x[keep], y[keep])
+                    ))
                 except Exception as e:
-                    print(f"Error creating time series chart for {date_col} vs {num_col}: {e}")
+                    print(f"Error creating {label}: {e}")
 
-        return charts
+        return jobs
 
     def _create_relationship_charts(self):
         """Create scatter plots showing relationships between numeric variables"""
-        charts = []
-        numeric_cols = self.df.select_dtypes(include=[np.number]).columns
+        jobs = []
+        numeric_cols = self.profile.numeric_columns
 
         if len(numeric_cols) < 2:
-            return charts
-
-        #Calculate correlations to find interesting pairs
-        corr_matrix = self.df[numeric_cols].corr()
-
-        #Find pairs with strong correlations
-        strong_pairs = []
-        for i in range(len(numeric_cols)):
-            for j in range(i + 1, len(numeric_cols)):
-                corr_value = abs(corr_matrix.iloc[i, j])
-                if corr_value > 0.3:  #Moderate to strong correlation
-                    strong_pairs.append({
-                        'col1': numeric_cols[i],
-                        'col2': numeric_cols[j],
-                        'corr': corr_value
-                    })
-
-        #Sort by correlation strength and take top 4
-        strong_pairs.sort(key=lambda x: x['corr'], reverse=True)
-
-        for pair in strong_pairs[:4]:
-            try:
-                fig, ax = plt.subplots(figsize=(10, 8))
-
-                #Scatter plot
-                ax.scatter(
-                    self.df[pair['col1']],
-                    self.df[pair['col2']],
-                    alpha=0.5,
-                    color='steelblue',
-                    edgecolors='black',
-                    linewidth=0.5
-                )
-
-                #Add trend line
-                z = np.polyfit(
-                    self.df[pair['col1']].dropna(),
-                    self.df[pair['col2']].dropna(),
-                    1
-                )
-                p = np.poly1d(z)
-                ax.plot(
-                    self.df[pair['col1']],
-                    p(self.df[pair['col1']]),
-                    "r--",
-                    alpha=0.8,
-                    linewidth=2,
-                    label='Trend line'
-                )
-
-                ax.set_xlabel(pair['col1'], fontsize=12)
-                ax.set_ylabel(pair['col2'], fontsize=12)
-                ax.set_title(
-                    f'{pair["col1"]} vs {pair["col2"]} (r={pair["corr"]:.2f})',
-                    fontsize=14,
-                    fontweight='bold'
-                )
-                ax.legend()
-                ax.grid(True, alpha=0.3)
-                plt.tight_layout()
-
-                charts.append({
-                    'columns': [pair['col1'], pair['col2']],
-                    'type': 'scatter',
-                    'correlation': round(pair['corr'], 3),
-                    'image': self._fig_to_base64(fig),
-                    'description': f'Relationship between {pair["col1"]} and {pair["col2"]}'
-                })
-
-                plt.close(fig)
+            return jobs
 
+        #Strongest moderate-to-strong pairs, found from the shared correlation matrix
+        try:
+            strong_pairs = [
+                {'col1': col1, 'col2': col2, 'corr': abs(corr_value)}
+                for col1, col2, corr_value in self.profile.correlations.pairs(threshold=0.3, top_k=4)
+            ]
+        except Exception as e:
+            print(f"Error finding scatter plot pairs: {e}")
+            return jobs
+
+        for pair in strong_pairs:
+            label = f'scatter plot for {pair["col1"]} vs {pair["col2"]}'
+            try:
+                x = self.df[pair['col1']].to_numpy(dtype=np.float64, na_value=np.nan)
+                y = self.df[pair['col2']].to_numpy(dtype=np.float64, na_value=np.nan)
+                present = np.isfinite(x) & np.isfinite(y)
+                x, y = x[present], y[present]
+                if len(x) < 2:
+                    continue
+
+                #Trend line fitted on all rows before any sampling, drawn across their x range
+                trend = np.polyfit(x, y, 1)
+                x_range = (float(x.min()), float(x.max()))
+
+                sampling = None
+                density = None
+                if len(x) >= Config.DENSITY_MIN_POINTS:
+                    #binned here so the render spec holds grid counts, not every point
+                    density = np.histogram2d(x, y, bins=Config.DENSITY_GRID_SIZE)
+                    sampling = {'method': 'density_grid', 'points': len(x), 'total_points': len(x)}
+                    x = y = None
+                elif len(x) > self.max_points:
+                    keep = downsampling.stratified_sample(x, y, self.max_points)
+                    sampling = {'method': 'stratified', 'points': len(keep), 'total_points': len(x)}
+                    x, y = x[keep], y[keep]
+
+                jobs.append((
+                    label,
+                    self._describe({
+                        'columns': [pair['col1'], pair['col2']],
+                        'type': 'scatter',
+                        'correlation': round(float(pair['corr']), 3),
+                        'description': f'Relationship between {pair["col1"]} and {pair["col2"]}'
+                    }, sampling),
+                    chart_renderer.render_scatter,
+                    (pair['col1'], pair['col2'], x, y, float(pair['corr']), trend, x_range, sampling, density)
+                ))
             except Exception as e:
-                print(f"Error creating scatter plot for {pair['col1']} vs {pair['col2']}: {e}")
-
-        return charts
-
-    def _fig_to_base64(self, fig):
-        """Convert matplotlib figure to base64 encoded string"""
-        buffer = io.BytesIO()
-        fig.savefig(buffer, format='png', dpi=100, bbox_inches='tight')
-        buffer.seek(0)
-        image_base64 = base64.b64encode(buffer.read()).decode('utf-8')
-        buffer.close()
-        return image_base64
+                print(f"Error creating {label}: {e}")
+
+        return jobs
+
+    @staticmethod
+    def _describe(chart, sampling):
+        """Record how the plotted data was reduced, if it was"""
+        if sampling:
+            chart['downsampled'] = sampling
+        return chart
@@ -0,0 +1,25 @@
+import time
+import importlib
+
+#loaded lazily by the upload stages: box statistics, heatmap clustering and chart drawing
+WARMUP_MODULES = ['matplotlib.cbook', 'scipy.cluster.hierarchy', 'scipy.spatial.distance']
+
+
+def warmup():
+    """
+    Import the libraries that upload stages load lazily and build
+    matplotlib's font cache, returning the seconds it took. Called where
+    the app is loaded, so a pre-forking server (gunicorn with preload_app)
+    does this once in the master and its workers inherit it; no request
+    pays for it. Chart render processes don't inherit it: they are forked
+    from a fork server that preloads the plotting libraries itself (see
+    chart_renderer.PRELOAD_MODULES).
+    """
+    start = time.perf_counter()
+
+    for name in WARMUP_MODULES:
+        importlib.import_module(name)
+    from backend.scripts import chart_renderer
+    chart_renderer.preload()
+
+    return time.perf_counter() - start
@@ -0,0 +1,27 @@
+import pandas as pd
+from backend.scripts.data_cleaner import DataCleaner
+
+
+def sample_first_rows(monkeypatch, rows=10):
+    #the sample sees only the top of each column
+    monkeypatch.setattr(DataCleaner, '_sample_text', staticmethod(lambda values: values.iloc[:rows].astype(str).str.strip()))
+
+
+def test_column_stays_text_when_only_its_sample_parses_as_dates(monkeypatch):
+    sample_first_rows(monkeypatch)
+    codes = [f'2024-01-{day:02d}' for day in range(1, 11)] + [f'REF-{i}' for i in range(90)]
+    cleaned, report = DataCleaner(pd.DataFrame({'code': codes, 'n': range(100)})).clean()
+
+    assert cleaned['code'].dtype == object
+    assert cleaned['code'].tolist() == codes
+    assert any(warning.startswith('code kept as text') for warning in report['warnings'])
+
+
+def test_date_column_converts_when_enough_of_the_full_column_parses(monkeypatch):
+    sample_first_rows(monkeypatch)
+    dates = [f'2024-01-{day % 28 + 1:02d}' for day in range(60)] + ['pending'] * 40
+    cleaned, report = DataCleaner(pd.DataFrame({'created': dates, 'n': range(100)})).clean()
+
+    assert pd.api.types.is_datetime64_any_dtype(cleaned['created'])
+    assert cleaned['created'].isna().sum() == 40
+    assert report['warnings'] == []
@@ -0,0 +1,35 @@
+import pandas as pd
+from backend.scripts.data_loader import DataLoader
+
+
+def write_csv(path, rows):
+    path.write_text('\n'.join(rows) + '\n')
+    return str(path)
+
+
+def test_leading_zeros_kept_when_a_later_chunk_holds_text(tmp_path):
+    #the first chunk parses as numbers, the second holds text
+    lines = ['zip,amount'] + [f'{i:05d},{i}' for i in range(10)] + ['AB123,10', '00011,11']
+    df = DataLoader(write_csv(tmp_path / 'zips.csv', lines), chunk_size=5).load()
+
+    assert df['zip'].tolist()[:3] == ['00000', '00001', '00002']
+    assert df['zip'].iloc[10] == 'AB123'
+    assert df['zip'].iloc[11] == '00011'
+    assert pd.api.types.is_integer_dtype(df['amount'])
+
+
+def test_integers_with_gaps_are_not_given_a_decimal_suffix(tmp_path):
+    lines = ['id,flag'] + ['1,a', ',b', '3,c', '4,d'] + ['x,e', '6,f']
+    df = DataLoader(write_csv(tmp_path / 'ids.csv', lines), chunk_size=4).load()
+
+    assert df['id'].iloc[0] == '1'
+    assert pd.isna(df['id'].iloc[1])
+    assert df['id'].tolist()[2:] == ['3', '4', 'x', '6']
+
+
+def test_rows_stay_aligned_when_malformed_lines_are_skipped(tmp_path):
+    lines = ['code,value', '007,1', 'bad,line,extra', '008,2', 'A9,3']
+    df = DataLoader(write_csv(tmp_path / 'bad.csv', lines), chunk_size=2).load()
+
+    assert df['code'].tolist() == ['007', '008', 'A9']
+    assert df['value'].tolist() == [1, 2, 3]
@@ -0,0 +1,52 @@
+import numpy as np
+import pandas as pd
+from backend.scripts.column_profile import DataProfile
+from backend.scripts.data_cleaner import DataCleaner
+from backend.scripts.duplicate_detector import DuplicateDetector
+
+
+def test_large_integer_ids_are_not_merged():
+    #distinct int64 ids above 2**53 round to the same float64
+    ids = [1234567890123456789, 1234567890123456790, 1234567890123456791]
+    df = pd.DataFrame({'id': ids, 'status': ['active'] * 3})
+
+    mask, detector = DuplicateDetector.find(df)
+    assert not mask.any()
+    assert detector.duplicate_count == 0
+
+    cleaned, report = DataCleaner(df).clean()
+    assert cleaned['id'].tolist() == ids
+    assert all(action['action'] != 'remove_duplicates' for action in report['actions_taken'])
+
+
+def test_matches_pandas_across_chunks():
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        'key': rng.integers(0, 40, 3000),
+        'value': rng.choice([1.5, np.nan, 2.5], 3000),
+        'label': rng.choice(np.array(['a', 'b', None], dtype=object), 3000)
+    })
+
+    mask, detector = DuplicateDetector.find(df, chunk_size=250)
+    expected = df.duplicated().to_numpy()
+    assert (mask == expected).all()
+    assert detector.duplicate_count == expected.sum()
+
+
+def test_hash_collisions_are_confirmed_against_row_values(monkeypatch):
+    df = pd.DataFrame({'id': [1, 2, 1, 3], 'status': ['a', 'a', 'a', 'b']})
+    #every row gets the same hash; only the real repeat may be reported
+    monkeypatch.setattr(DuplicateDetector, 'hash_rows', staticmethod(lambda chunk: np.zeros(len(chunk), dtype=np.uint64)))
+
+    mask, detector = DuplicateDetector.find(df)
+    assert mask.tolist() == [False, False, True, False]
+    assert detector.duplicate_count == 1
+
+
+def test_cleaner_count_is_passed_to_the_profile():
+    df = pd.DataFrame({'a': [1, 1, 2], 'b': ['x', 'x', 'y']})
+    cleaner = DataCleaner(df)
+    cleaned, _ = cleaner.clean()
+    assert cleaner.duplicate_rows == 1
+    profile = DataProfile(cleaned, duplicate_rows=cleaner.duplicate_rows)
+    assert profile.duplicate_rows == 1
@@ -0,0 +1,47 @@
+import threading
+import numpy as np
+from backend.scripts.job_manager import JobManager, DiskJobRegistry
+
+
+def test_disk_jobs_can_be_polled_from_another_worker(tmp_path):
+    #two managers on one folder stand in for two gunicorn workers
+    running = JobManager(registry=DiskJobRegistry(folder=str(tmp_path)))
+    polling = JobManager(registry=DiskJobRegistry(folder=str(tmp_path)))
+    cleaned = threading.Event()
+    finish = threading.Event()
+
+    def run(job):
+        job.update_stage('clean', 'running', {'session_id': 's'})
+        job.update_stage('clean', 'completed', {'session_id': 's', 'counts': np.array([1, 2])})
+        cleaned.set()
+        finish.wait(5)
+        return {'session_id': 's', 'counts': np.array([1, 2]), 'mean': np.float64(1.5)}
+
+    job = running.submit(run, ('clean', 'save'))
+    assert cleaned.wait(5)
+
+    seen = polling.get(job.id)
+    assert seen.status == 'running'
+    assert seen.to_dict()['progress'] == 0.5
+    assert seen.result == {'session_id': 's', 'counts': [1, 2]}
+
+    finish.set()
+    running._executor.shutdown(wait=True)
+    seen = polling.get(job.id)
+    assert seen.status == 'completed'
+    assert seen.result == {'session_id': 's', 'counts': [1, 2], 'mean': 1.5}
+    assert polling.get('missing') is None
+
+
+def test_failed_disk_job_keeps_its_error(tmp_path):
+    manager = JobManager(registry=DiskJobRegistry(folder=str(tmp_path)))
+
+    def run(job):
+        raise ValueError('not a CSV')
+
+    job = manager.submit(run, ('validate',))
+    manager._executor.shutdown(wait=True)
+
+    seen = JobManager(registry=DiskJobRegistry(folder=str(tmp_path))).get(job.id)
+    assert seen.status == 'failed'
+    assert (seen.error, seen.error_status) == ('not a CSV', 500)
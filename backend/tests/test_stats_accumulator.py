@@ -0,0 +1,113 @@
+import numpy as np
+import pandas as pd
+import pytest
+from backend.scripts.stats_accumulator import QuantileSketch, StatsAccumulator
+
+QUANTILES = np.linspace(0.01, 0.99, 99)
+
+
+def accumulate(values, pieces):
+    """One accumulator per uneven piece, merged, as chunked reads would give"""
+    bounds = np.sort(np.random.default_rng(1).choice(np.arange(1, len(values)), pieces - 1, replace=False))
+    accumulators = [StatsAccumulator().update(piece) for piece in np.split(values, bounds)]
+    total = accumulators[0]
+    for accumulator in accumulators[1:]:
+        total.merge(accumulator)
+    return total
+
+
+@pytest.mark.parametrize('pieces', [1, 7, 50])
+def test_moments_match_pandas(pieces):
+    rng = np.random.default_rng(0)
+    values = np.concatenate([rng.lognormal(2, 0.8, 6000), rng.normal(-5, 2, 3000)])
+    values[rng.random(len(values)) < 0.05] = np.nan
+    series = pd.Series(values)
+
+    summary = accumulate(values, pieces).summary()
+
+    assert summary['count'] == series.count()
+    assert summary['mean'] == pytest.approx(series.mean(), rel=1e-9)
+    assert summary['std'] == pytest.approx(series.std(), rel=1e-9)
+    assert summary['skewness'] == pytest.approx(series.skew(), rel=1e-7)
+    assert summary['kurtosis'] == pytest.approx(series.kurtosis(), rel=1e-7)
+    assert summary['min'] == series.min()
+    assert summary['max'] == series.max()
+
+
+def test_constant_and_tiny_columns():
+    constant = StatsAccumulator().update(np.full(10, 3.5))
+    assert constant.std() == 0
+    assert constant.skewness() == 0
+    assert constant.kurtosis() == 0
+
+    pair = StatsAccumulator().update(np.array([1.0, 2.0]))
+    assert pair.std() == pytest.approx(pd.Series([1.0, 2.0]).std())
+    assert np.isnan(pair.skewness())
+    assert np.isnan(pair.kurtosis())
+
+
+def test_exact_quantiles_and_outliers_below_capacity():
+    rng = np.random.default_rng(2)
+    values = np.append(rng.normal(size=1500), [15.0, -12.0, 30.0])
+    accumulator = StatsAccumulator(k=2000).update(values)
+    series = pd.Series(values)
+
+    assert accumulator.sketch.is_exact
+    assert accumulator.sketch.rank_error == 0
+    for q in (0.25, 0.5, 0.75):
+        assert accumulator.quantile(q) == pytest.approx(series.quantile(q))
+
+    q1, q3 = series.quantile(0.25), series.quantile(0.75)
+    iqr = q3 - q1
+    expected = ((series < q1 - 1.5 * iqr) | (series > q3 + 1.5 * iqr)).sum()
+    assert accumulator.outliers_count() == expected
+
+
+def rank_errors(sketch, values):
+    """Largest normalized rank error of the sketch's quantiles and ranks"""
+    ordered = np.sort(values)
+    n = len(values)
+    estimates = np.array([sketch.quantile(q) for q in QUANTILES])
+    #any rank the estimate can take among tied values counts as correct
+    low = np.searchsorted(ordered, estimates, side='left') / n
+    high = np.searchsorted(ordered, estimates, side='right') / n
+    quantile_error = np.maximum(np.maximum(low - QUANTILES, QUANTILES - high), 0).max()
+
+    probes = ordered[(QUANTILES * n).astype(int)]
+    rank_error = max(abs(sketch.rank(value) - np.searchsorted(ordered, value)) / n for value in probes)
+    return quantile_error, rank_error
+
+
+@pytest.mark.parametrize('k', [50, 200, 2000])
+def test_kll_rank_error_within_bound(k):
+    rng = np.random.default_rng(k)
+    values = rng.standard_normal(300000) * rng.lognormal(size=300000)
+    sketch = QuantileSketch(k)
+    for piece in np.array_split(values, 23):
+        sketch.update(piece)
+
+    assert not sketch.is_exact
+    assert sketch.count == len(values)
+    assert sum(len(level) for level in sketch.levels) < 3 * k + 8 * len(sketch.levels)
+    quantile_error, rank_error = rank_errors(sketch, values)
+    assert quantile_error <= sketch.rank_error
+    assert rank_error <= sketch.rank_error
+
+
+def test_merged_sketches_stay_within_bound():
+    rng = np.random.default_rng(5)
+    pieces = [rng.exponential(scale, 40000) for scale in (1, 3, 10, 0.5, 2)]
+    sketches = []
+    for piece in pieces:
+        sketch = QuantileSketch(200)
+        sketch.update(piece)
+        sketches.append(sketch)
+    merged = sketches[0]
+    for sketch in sketches[1:]:
+        merged.merge(sketch)
+
+    values = np.concatenate(pieces)
+    assert merged.count == len(values)
+    quantile_error, rank_error = rank_errors(merged, values)
+    assert quantile_error <= merged.rank_error
+    assert rank_error <= merged.rank_error
@@ -0,0 +1,69 @@
+import numpy as np
+import pandas as pd
+from backend.config.config import Config
+from backend.scripts import downsampling
+from backend.scripts.visualizer import DataVisualizer
+
+
+def frame_with_infinities(rows=400):
+    rng = np.random.default_rng(0)
+    a = rng.normal(size=rows)
+    a[[3, 7]] = [np.inf, -np.inf]
+    b = rng.normal(size=rows)
+    return pd.DataFrame({
+        'a': a,
+        'b': b,
+        'c': b * 2 + rng.normal(scale=0.1, size=rows),
+        'when': pd.date_range('2020-01-01', periods=rows, freq='D')
+    })
+
+
+def test_infinite_values_are_left_out_of_charts():
+    charts = DataVisualizer(frame_with_infinities(), mode='data').generate_visualizations()
+
+    distributions = {chart['column']: chart['data']['histogram'] for chart in charts['distribution_charts']}
+    assert set(distributions) == {'a', 'b', 'c'}
+    assert np.isfinite(distributions['a']['bin_edges']).all()
+    assert sum(distributions['a']['counts']) == 398
+
+    assert len(charts['time_series_charts']) == 3
+    assert [chart['columns'] for chart in charts['relationship_charts']] == [['b', 'c']]
+
+
+def test_a_failing_chart_only_skips_itself(monkeypatch):
+    def fail(*args):
+        raise ValueError('bad column')
+
+    monkeypatch.setattr(downsampling, 'reduce_time_series', fail)
+    charts = DataVisualizer(frame_with_infinities(), mode='data').generate_visualizations()
+
+    assert charts['time_series_charts'] == []
+    assert len(charts['distribution_charts']) == 3
+    assert charts['correlation_heatmap'] is not None
+
+
+class SpecStore:
+    def __init__(self):
+        self.specs = {}
+
+    def save(self, chart_id, label, func, args):
+        self.specs[chart_id] = (func, args)
+
+
+def test_dense_scatter_spec_holds_only_grid_counts(monkeypatch):
+    monkeypatch.setattr(Config, 'DENSITY_MIN_POINTS', 300)
+    store = SpecStore()
+    DataVisualizer(frame_with_infinities(), mode='image').generate_visualizations(store)
+
+    func, args = store.specs['scatter_0']
+    col1, col2, x, y, corr, trend, x_range, sampling, density = args
+    assert x is None and y is None
+    counts, x_edges, y_edges = density
+    assert counts.shape == (Config.DENSITY_GRID_SIZE, Config.DENSITY_GRID_SIZE)
+    assert counts.sum() == 400
+    assert sampling['method'] == 'density_grid'
+    assert func(*args)[:8] == b'\x89PNG\r\n\x1a\n'
+
+    charts = DataVisualizer(frame_with_infinities(), mode='data').generate_visualizations()
+    cells = charts['relationship_charts'][0]['data']['density']['cells']
+    assert sum(count for _, _, count in cells) == 400
@@ -0,0 +1,46 @@
+import os
+import runpy
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+#runs backend/wsgi.py as the main script, rendering through the chart pool instead of serving
+RUN_WSGI = '''
+import os
+import runpy
+import runpy
+import flask
+from backend.scripts.chart_renderer import ChartRenderer
+
+def run(app, **kwargs):
+    pids = ChartRenderer(workers=2).render([('pid', os.getpid, ())] * 2)
+    print('rendered', len(pids))
+
+flask.Flask.run = run
+runpy.run_path(os.path.join('backend', 'wsgi.py'), run_name='__main__')
+'''
+
+
+def test_chart_workers_do_not_run_the_app_factory():
+    env = {**os.environ, 'PYTHONPATH': ROOT, 'WARMUP': 'true', 'CHART_START_METHOD': 'forkserver'}
+    result = subprocess.run(
+        [sys.executable, '-c', RUN_WSGI], cwd=ROOT, env=env,
+        capture_output=True, text=True, timeout=120
+    )
+
+    assert result.returncode == 0, result.stderr
+    assert 'rendered 2' in result.stdout
+    #logged by the app factory's warmup: once for the server, never in the workers
+    assert result.stderr.count('Preloaded chart libraries') == 1
+
+
+def gunicorn_workers(monkeypatch, **env):
+    for name, value in env.items():
+        monkeypatch.setenv(name, value)
+    return runpy.run_path(os.path.join(ROOT, 'backend', 'gunicorn.conf.py'))['workers']
+
+
+def test_gunicorn_runs_one_worker_unless_sessions_and_jobs_are_shared(monkeypatch):
+    assert gunicorn_workers(monkeypatch, WEB_CONCURRENCY='4', SESSION_BACKEND='memory') == 1
+    assert gunicorn_workers(monkeypatch, WEB_CONCURRENCY='4', SESSION_BACKEND='disk') == 4
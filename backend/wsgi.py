@@ -1,9 +1,28 @@
-from backend.app import create_app
 import os
+import logging
 
-app = create_app()
 
+def load_app():
+    """Build the app and, with WARMUP, preload the chart libraries"""
+    from backend.app import create_app
+    from backend.config.config import Config
+    from backend.scripts.warmup import warmup
+
+    app = create_app()
+
+    #in a preloading server this runs once in the master, before workers fork
+    if Config.WARMUP:
+        if app.logger.level == logging.NOTSET:
+            app.logger.setLevel(logging.INFO)
+        app.logger.info('Preloaded chart libraries in %.1fs', warmup())
+
+    return app
+
+
+#chart workers (forkserver or spawn) import this file again as __mp_main__, so nothing
+#is built at import time; gunicorn calls load_app() itself (see gunicorn.conf.py)
 if __name__ == '__main__':
+    app = load_app()
     port = int(os.environ.get('PORT', 5000))
     debug = os.environ.get('FLASK_ENV', 'development') == 'development'
     app.run(host='0.0.0.0', port=port, debug=debug)
@@ -13,8 +13,9 @@ export const FileUpload = ({ onFileSelect, isLoading }: FileUploadProps) => {
   const [error, setError] = useState<string | null>(null);
 
   const validateFile = (file: File): string | null => {
-    if (!file.name.toLowerCase().endsWith('.csv')) {
-      return 'Please upload a CSV file only';
+    const name = file.name.toLowerCase();
+    if (!['.csv', '.csv.gz', '.csv.zst'].some((extension) => name.endsWith(extension))) {
+      return 'Please upload a CSV file only (optionally .gz or .zst compressed)';
     }
     if (file.size > MAX_FILE_SIZE) {
       return 'File size must be less than 50MB';
@@ -101,7 +102,7 @@ export const FileUpload = ({ onFileSelect, isLoading }: FileUploadProps) => {
         <input
           id="file-input"
           type="file"
-          accept=".csv"
+          accept=".csv,.gz,.zst"
           onChange={handleInputChange}
           className="hidden"
         />
@@ -13,6 +13,14 @@ interface VisualizationsTabProps {
   };
 }
 
+// Backend origin when the frontend is hosted separately; empty in development, where Vite proxies /api
+const API_URL = import.meta.env.VITE_API_URL || '';
+
+// Charts are served as cacheable images by /api/chart (chart.url is root-relative, so it is
+// resolved against the backend, not the page); older responses embed base64 PNGs
+const chartSrc = (chart: any): string =>
+  chart.url ? `${API_URL}${chart.url}` : `data:image/png;base64,${chart.image}`;
+
 interface VisualizationSectionProps {
   title: string;
   icon: React.ElementType;
@@ -66,7 +74,7 @@ const FullScreenModal = ({ chart, onClose, onNext, onPrev, hasNext, hasPrev, cur
 
   const handleDownload = () => {
     const link = document.createElement('a');
-    link.href = `data:image/png;base64,${chart.image}`;
+    link.href = chartSrc(chart);
     link.download = `${chartTitle.replace(/[^a-z0-9]/gi, '_').toLowerCase()}.png`;
     link.click();
   };
@@ -187,7 +195,7 @@ const FullScreenModal = ({ chart, onClose, onNext, onPrev, hasNext, hasPrev, cur
             )}
 
             <img
-              src={`data:image/png;base64,${chart.image}`}
+              src={chartSrc(chart)}
               alt={chartTitle}
               className="max-w-full max-h-full object-contain"
               style={{
@@ -263,8 +271,9 @@ const VisualizationSection = ({ title, icon: Icon, charts, onChartClick }: Visua
               <div className="p-4 bg-secondary/30 relative overflow-hidden">
                 <div className="absolute inset-0 bg-primary/0 group-hover:bg-primary/5 transition-colors duration-300" />
                 <img
-                  src={`data:image/png;base64,${chart.image}`}
+                  src={chartSrc(chart)}
                   alt={chartTitle}
+                  loading="lazy"
                   className="w-full h-auto rounded relative z-10"
                 />
               </div>